@@ -0,0 +1,281 @@
+from distle_game import *
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+'''
+Benchmark suite for the edit distance kernels, the DistlePlayer's feedback
+filtering, and complete games. Each benchmark reports its throughput (ops/sec),
+p50 / p99 latency and peak memory, and results can be saved as JSON and compared
+against a saved baseline so that performance regressions are caught before
+they ship.
+
+Usage:
+    python distle_benchmarks.py [--quick] [--output results.json] [--baseline baseline.json]
+
+Exits with status 1 if any benchmark's p50 latency regressed past the tolerance.
+'''
+
+# Dictionaries the feedback and full-game benchmarks are run against
+BENCH_DICTIONARIES: tuple[str, ...] = ("../dat/dictionary6.txt", "../dat/dictionary10.txt", "../dat/dictionary14.txt")
+
+# Relative slowdown of a p50 latency over the baseline's tolerated before it is
+# reported as a regression
+DEFAULT_TOLERANCE: float = 0.25
+
+# Seed making the benchmarks' word choices identical from run to run
+BENCH_SEED: int = 2130
+
+# The maximum number of guesses in the benchmarked games
+MAX_BENCH_GUESSES: int = 10
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    '''
+    Returns the given percentile of some sorted values, by the nearest-rank method.
+
+    Parameters:
+        sorted_values (list[float]):
+            The values, in increasing order; must be non-empty
+        fraction (float):
+            The percentile as a fraction in [0, 1], e.g., 0.99 for p99
+
+    Returns:
+        float:
+            The value at that percentile
+    '''
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def benchmark(operation: Callable[[], Any], repeats: int, setup: Optional[Callable[[], Any]] = None) -> dict[str, float]:
+    '''
+    Times repeated calls of the given operation, then makes one more call under
+    tracemalloc (which slows everything down, and so is kept out of the timings)
+    to measure its peak memory.
+
+    Parameters:
+        operation (Callable[[], Any]):
+            The operation to time
+        repeats (int):
+            The number of timed calls
+        setup (Optional[Callable[[], Any]]):
+            Called, untimed, before every call of the operation
+
+    Returns:
+        dict[str, float]:
+            The calls' ops_per_sec, p50_ms, p99_ms, mean_ms and peak_kib
+    '''
+    latencies: list[float] = []
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "ops_per_sec": repeats / total if total > 0 else math.inf,
+        "p50_ms": 1000 * percentile(latencies, 0.50),
+        "p99_ms": 1000 * percentile(latencies, 0.99),
+        "mean_ms": 1000 * total / repeats,
+        "peak_kib": peak / 1024,
+    }
+
+def run_kernel_benchmarks(words: Sequence[str], repeats: int) -> dict[str, dict[str, float]]:
+    '''
+    Benchmarks the edit_dist_utils kernels on seeded pairs of the given words.
+
+    Parameters:
+        words (Sequence[str]):
+            The words to draw the pairs from
+        repeats (int):
+            The number of timed calls per kernel; each call processes every pair
+
+    Returns:
+        dict[str, dict[str, float]]:
+            Map from each kernel's name to its benchmark results
+    '''
+    rng = random.Random(BENCH_SEED)
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(100)]
+    guesses, secrets = [s0 for s0, _ in pairs], [s1 for _, s1 in pairs]
+    tables = [get_edit_dist_table(s0, s1) for s0, s1 in pairs]
+    masks = [get_match_masks(s0) for s0 in guesses]
+    signatures = [feedback_signature(s0, s1) for s0, s1 in pairs]
+    distances, encoded = [dist for dist, _ in signatures], [transforms for _, transforms in signatures]
+    return {
+        "get_edit_dist_table": benchmark(lambda: [get_edit_dist_table(s0, s1) for s0, s1 in pairs], repeats),
+        "edit_distance": benchmark(lambda: [edit_distance(s0, s1) for s0, s1 in pairs], repeats),
+        "get_transformation_list_with_table": benchmark(
+            lambda: [get_transformation_list_with_table(s0, s1, table) for (s0, s1), table in zip(pairs, tables)], repeats),
+        "edit_distance_linear": benchmark(lambda: [edit_distance_linear(s0, s1) for s0, s1 in pairs], repeats),
+        "get_transformation_list_linear": benchmark(lambda: [get_transformation_list_linear(s0, s1) for s0, s1 in pairs], repeats),
+        "bit_parallel_edit_distance": benchmark(
+            lambda: [bit_parallel_edit_distance(s0, s1, mask) for (s0, s1), mask in zip(pairs, masks)], repeats),
+        # Asked, as the player does, whether each pair is within its own feedback's distance
+        "edit_distance_within": benchmark(
+            lambda: [edit_distance_within(s0, s1, dist) for (s0, s1), dist in zip(pairs, distances)], repeats),
+        "feedback_signature": benchmark(lambda: [feedback_signature(s0, s1) for s0, s1 in pairs], repeats),
+        # The batched kernels take every pair at once; edit_distances, having a
+        # single guess, measures the first pair's against every pair's secret
+        "edit_distances": benchmark(lambda: edit_distances(guesses[0], secrets), repeats),
+        "edit_distance_pairs": benchmark(lambda: edit_distance_pairs(guesses, secrets), repeats),
+        "feedback_matches": benchmark(lambda: feedback_matches(guesses, secrets, distances, encoded), repeats),
+    }
+
+def run_feedback_benchmark(dictionary_path: str, repeats: int, auto_parallel: bool = False) -> dict[str, float]:
+    '''
+    Benchmarks one DistlePlayer.get_feedback call against the whole of the given
+    dictionary, i.e., the first and most expensive filtering of a game.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary, relative to the src directory
+        repeats (int):
+            The number of timed calls
+        auto_parallel (bool):
+            Whether the player filters on its dictionary's shared_filter_executor;
+            see DistlePlayer
+
+    Returns:
+        dict[str, float]:
+            The benchmark's results
+    '''
+    game = DistleGame(dictionary_path, False, None)
+    rng = random.Random(BENCH_SEED)
+    guess, secret = rng.choice(game.rand_word_list), rng.choice(game.rand_word_list)
+    distance, transforms = edit_distance(guess, secret), get_transformation_list(guess, secret)
+    player = DistlePlayer(auto_parallel = auto_parallel)
+    return benchmark(lambda: player.get_feedback(guess, distance, transforms), repeats,
+                     setup = lambda: player.start_new_game(game.dictionary, MAX_BENCH_GUESSES))
+
+def run_game_benchmark(dictionary_path: str, repeats: int, auto_parallel: bool = False) -> dict[str, float]:
+    '''
+    Benchmarks complete games on the given dictionary, with secrets and player
+    randomness seeded so every run plays the same games.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary, relative to the src directory
+        repeats (int):
+            The number of timed games
+        auto_parallel (bool):
+            Whether the player filters on its dictionary's shared_filter_executor;
+            see DistlePlayer
+
+    Returns:
+        dict[str, float]:
+            The benchmark's results
+    '''
+    game = DistleGame(dictionary_path, False, DistlePlayer(auto_parallel = auto_parallel))
+    rng = random.Random(BENCH_SEED)
+    secrets = iter([rng.randint(0, game.get_dictionary_size() - 1) for _ in range(repeats + 1)])
+    secret: list[int] = [0]
+
+    def next_game() -> None:
+        secret[0] = next(secrets)
+        random.seed(BENCH_SEED + secret[0])
+
+    return benchmark(lambda: game.new_game(MAX_BENCH_GUESSES, rand_ind = secret[0]), repeats, setup = next_game)
+
+def run_benchmarks(dictionaries: Sequence[str] = BENCH_DICTIONARIES, quick: bool = False,
+                   auto_parallel: bool = False) -> dict[str, dict[str, float]]:
+    '''
+    Runs the whole benchmark suite.
+
+    Parameters:
+        dictionaries (Sequence[str]):
+            Paths of the dictionaries to benchmark feedback and games against
+        quick (bool):
+            Whether to cut the number of repeats for a faster, noisier run
+        auto_parallel (bool):
+            Whether the players filter large candidate sets on all cores
+
+    Returns:
+        dict[str, dict[str, float]]:
+            Map from each benchmark's name to its results
+    '''
+    kernel_repeats, feedback_repeats, game_repeats = (5, 3, 3) if quick else (30, 10, 20)
+    results = run_kernel_benchmarks(DistleGame(dictionaries[0], False, None).rand_word_list, kernel_repeats)
+    for path in dictionaries:
+        name = os.path.splitext(os.path.basename(path))[0]
+        results["get_feedback/" + name] = run_feedback_benchmark(path, feedback_repeats, auto_parallel)
+        results["game/" + name] = run_game_benchmark(path, game_repeats, auto_parallel)
+    return results
+
+def compare_to_baseline(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]],
+                        tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    '''
+    Compares benchmark results against a baseline, reporting every benchmark whose
+    p50 latency is more than the tolerated fraction slower than the baseline's.
+    Benchmarks missing from either side are ignored.
+
+    Parameters:
+        results (dict[str, dict[str, float]]):
+            The current results, as returned by run_benchmarks
+        baseline (dict[str, dict[str, float]]):
+            The baseline results to compare against
+        tolerance (float):
+            Tolerated relative slowdown, e.g., 0.25 for 25%
+
+    Returns:
+        list[str]:
+            A description of each regression; empty if there are none
+    '''
+    regressions: list[str] = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["p50_ms"], result["p50_ms"]
+        if after > before * (1 + tolerance):
+            regressions.append(name + ": p50 " + format(before, ".3f") + " ms => " + format(after, ".3f") + " ms")
+    return regressions
+
+def format_results(results: dict[str, dict[str, float]]) -> str:
+    '''
+    Formats benchmark results as a human-readable table.
+
+    Parameters:
+        results (dict[str, dict[str, float]]):
+            The results, as returned by run_benchmarks
+
+    Returns:
+        str:
+            One line per benchmark
+    '''
+    lines = [format("benchmark", "<40") + format("ops/sec", ">12") + format("p50 ms", ">12") + format("p99 ms", ">12") + format("peak KiB", ">12")]
+    for name, result in results.items():
+        lines.append(format(name, "<40") + format(result["ops_per_sec"], ">12.2f") + format(result["p50_ms"], ">12.3f")
+                     + format(result["p99_ms"], ">12.3f") + format(result["peak_kib"], ">12.1f"))
+    return "\n".join(lines)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmarks the Distle edit distance kernels, feedback filtering and games")
+    parser.add_argument("--quick", action = "store_true", help = "fewer repeats, for a faster but noisier run")
+    parser.add_argument("--dictionaries", nargs = "+", default = list(BENCH_DICTIONARIES))
+    parser.add_argument("--output", help = "path to write the results to as JSON")
+    parser.add_argument("--baseline", help = "path of saved JSON results to compare against")
+    parser.add_argument("--tolerance", type = float, default = DEFAULT_TOLERANCE)
+    parser.add_argument("--parallel", action = "store_true", help = "filter large candidate sets on all cores")
+    args = parser.parse_args()
+
+    bench_results = run_benchmarks(args.dictionaries, args.quick, args.parallel)
+    print(format_results(bench_results))
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(bench_results, file, indent = 1, sort_keys = True)
+    if args.baseline is not None:
+        with open(args.baseline, "r") as file:
+            found_regressions = compare_to_baseline(bench_results, json.load(file), args.tolerance)
+        for regression in found_regressions:
+            print("[X] Regression: " + regression)
+        sys.exit(1 if found_regressions else 0)
@@ -0,0 +1,38 @@
+import unittest
+import pytest
+from distle_benchmarks import *
+
+class DistleBenchmarksTests(unittest.TestCase):
+    """
+    Unit tests for validating the benchmark suite's statistics and regression checks.
+    """
+    
+    def test_percentile_t0(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual(50.0, percentile(values, 0.50))
+        self.assertEqual(99.0, percentile(values, 0.99))
+        self.assertEqual(1.0, percentile([1.0], 0.99))
+        
+    def test_benchmark_t0(self) -> None:
+        result = benchmark(lambda: [0] * 1000, 5)
+        self.assertEqual({"ops_per_sec", "p50_ms", "p99_ms", "mean_ms", "peak_kib"}, set(result))
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+        self.assertGreater(result["peak_kib"], 0)
+        
+    def test_kernel_benchmarks_t0(self) -> None:
+        results = run_kernel_benchmarks(["stone", "store", "tone", "tons", "strobe", "shone"], 1)
+        for kernel in ("edit_distance", "bit_parallel_edit_distance", "edit_distance_within", "edit_distances",
+                       "edit_distance_pairs", "feedback_signature", "feedback_matches", "edit_distance_linear",
+                       "get_transformation_list_linear"):
+            self.assertIn(kernel, results)
+            self.assertGreater(results[kernel]["ops_per_sec"], 0)
+        
+    def test_compare_to_baseline_t0(self) -> None:
+        baseline = {"a": {"p50_ms": 10.0}, "b": {"p50_ms": 10.0}, "c": {"p50_ms": 10.0}}
+        results = {"a": {"p50_ms": 12.0}, "b": {"p50_ms": 13.0}, "d": {"p50_ms": 99.0}}
+        regressions = compare_to_baseline(results, baseline, 0.25)
+        self.assertEqual(1, len(regressions))
+        self.assertTrue(regressions[0].startswith("b:"))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+from edit_dist_utils import *
+import glob
+import json
+import os
+import random
+'''
+BK-tree (metric tree) over a Distle dictionary, answering "which words are at
+edit distance exactly d from this guess?" without scanning the whole dictionary.
+
+The game's edit distance (OSA) breaks the triangle inequality that BK-trees
+rely on, so the tree is instead keyed by the full Damerau-Levenshtein distance
+(DL), which is a true metric, and queried as a conservative prefilter: since
+OSA / 2 <= DL <= OSA, every word at OSA distance d has DL in [ceil(d / 2), d],
+and only the words the tree returns for that range are checked exactly.
+
+Trees are built once per dictionary and saved next to it (e.g.,
+dictionary14.bktree.json), keyed by a hash of the dictionary's contents.
+'''
+
+# Suffix replacing a dictionary file's extension to name its BK-tree
+BK_TREE_SUFFIX: str = ".bktree.json"
+
+# Directory searched for BK-trees by find_bk_tree
+DEFAULT_BK_TREE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dat")
+
+class BKTree:
+    '''
+    Burkhard-Keller tree of words under the Damerau-Levenshtein distance. Nodes
+    are stored in flat lists, node 0 being the root: node i holds words[i], and
+    children[i] maps each distance to the child node at that distance from it.
+    '''
+
+    def __init__(self, words: Iterable[str] = (), seed: int = 0) -> None:
+        '''
+        Constructs a new BKTree holding the given words, inserted in an order
+        shuffled by the given seed to keep the tree from degenerating on sorted
+        input.
+
+        Parameters:
+            words (Iterable[str]):
+                The words to insert
+            seed (int):
+                Seed of the insertion order's shuffle
+        '''
+        self.words: list[str] = []
+        self.children: list[dict[int, int]] = []
+        self.nodes_visited: int = 0
+        shuffled = list(words)
+        random.Random(seed).shuffle(shuffled)
+        for word in shuffled:
+            self.add(word)
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of words in the tree.
+
+        Returns:
+            int:
+                The number of nodes in the tree
+        '''
+        return len(self.words)
+
+    def add(self, word: str) -> None:
+        '''
+        Inserts the given word into the tree, unless already present.
+
+        Parameters:
+            word (str):
+                The word to insert
+        '''
+        if len(self.words) == 0:
+            self.words.append(word)
+            self.children.append({})
+            return
+        node = 0
+        while True:
+            dist = damerau_levenshtein_distance(word, self.words[node])
+            if dist == 0:
+                return
+            child = self.children[node].get(dist)
+            if child is None:
+                self.children[node][dist] = len(self.words)
+                self.words.append(word)
+                self.children.append({})
+                return
+            node = child
+
+    def query(self, word: str, min_dist: int, max_dist: int) -> list[tuple[str, int]]:
+        '''
+        Returns every word in the tree whose Damerau-Levenshtein distance from the
+        given word lies in [min_dist, max_dist]. By the triangle inequality, the
+        subtree of a node at distance x from the word, hanging on an edge of length
+        e, only holds words at distance in [|x - e|, x + e] from the word, so any
+        subtree whose interval misses the query's is pruned. The number of nodes
+        compared against is accumulated in nodes_visited.
+
+        Parameters:
+            word (str):
+                The word to query around
+            min_dist (int):
+                The smallest distance of interest
+            max_dist (int):
+                The largest distance of interest
+
+        Returns:
+            list[tuple[str, int]]:
+                The matching words, each with its distance from the query word
+        '''
+        found: list[tuple[str, int]] = []
+        if len(self.words) == 0:
+            return found
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            self.nodes_visited += 1
+            dist = damerau_levenshtein_distance(word, self.words[node])
+            if min_dist <= dist <= max_dist:
+                found.append((self.words[node], dist))
+            for edge, child in self.children[node].items():
+                if dist - max_dist <= edge <= dist + max_dist and dist + edge >= min_dist:
+                    stack.append(child)
+        return found
+
+    def words_at_distance(self, guess: str, edit_dist: int) -> list[str]:
+        '''
+        Returns every word in the tree at exactly the given (OSA) edit distance
+        from the guess, i.e., [w for w in tree if edit_distance(guess, w) == edit_dist],
+        by checking only the survivors of a Damerau-Levenshtein range query.
+
+        Parameters:
+            guess (str):
+                The word to measure distances from
+            edit_dist (int):
+                The edit distance of the words requested
+
+        Returns:
+            list[str]:
+                The words at that edit distance from the guess
+        '''
+        masks = get_match_masks(guess)
+        return [word for word, _ in self.query(guess, (edit_dist + 1) // 2, edit_dist)
+                if bit_parallel_edit_distance(guess, word, masks) == edit_dist]
+
+    def save(self, path: str, words_hash: str) -> None:
+        '''
+        Writes this tree to the given path: one line of JSON header holding the
+        hash of the dictionary it indexes, followed by one line of JSON nodes.
+
+        Parameters:
+            path (str):
+                Destination of the tree file
+            words_hash (str):
+                The dictionary_hash of the words in the tree
+        '''
+        with open(path, "w") as file:
+            file.write(json.dumps({"hash": words_hash, "size": len(self.words)}) + "\n")
+            file.write(json.dumps([self.words, [sorted(children.items()) for children in self.children]]) + "\n")
+
+    @staticmethod
+    def load(path: str) -> "BKTree":
+        '''
+        Reads a tree previously written by save.
+
+        Parameters:
+            path (str):
+                Location of the tree file
+
+        Returns:
+            BKTree:
+                The loaded tree
+        '''
+        tree = BKTree()
+        with open(path, "r") as file:
+            file.readline()
+            words, children = json.loads(file.readline())
+        tree.words = words
+        tree.children = [{edge: child for edge, child in edges} for edges in children]
+        return tree
+
+def read_bk_tree_hash(path: str) -> str:
+    '''
+    Returns the dictionary hash recorded in the header of a saved tree, without
+    reading the rest of the file.
+
+    Parameters:
+        path (str):
+            Location of the tree file
+
+    Returns:
+        str:
+            The dictionary_hash the tree was built for
+    '''
+    with open(path, "r") as file:
+        header: dict[str, Any] = json.loads(file.readline())
+    return str(header["hash"])
+
+def bk_tree_path_for(dictionary_path: str) -> str:
+    '''
+    Returns the path of the BK-tree belonging to the given dictionary file.
+
+    Parameters:
+        dictionary_path (str):
+            Path to a new-line separated dictionary file
+
+    Returns:
+        str:
+            Path of the dictionary's BK-tree
+    '''
+    return os.path.splitext(dictionary_path)[0] + BK_TREE_SUFFIX
+
+def load_or_build_bk_tree(dictionary_path: str, words: Collection[str], words_hash: str) -> BKTree:
+    '''
+    Returns the BK-tree saved next to the given dictionary if it was built for
+    the same words, and otherwise builds the tree and saves it there.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file the words were read from
+        words (Collection[str]):
+            The dictionary's words
+        words_hash (str):
+            The dictionary_hash of the words
+
+    Returns:
+        BKTree:
+            The dictionary's tree
+    '''
+    path = bk_tree_path_for(dictionary_path)
+    if os.path.exists(path) and read_bk_tree_hash(path) == words_hash:
+        return BKTree.load(path)
+    tree = BKTree(sorted(words))
+    tree.save(path, words_hash)
+    return tree
+
+_bk_trees_by_hash: dict[str, Optional[BKTree]] = {}
+
+def find_bk_tree(words_hash: str, directory: str = DEFAULT_BK_TREE_DIR) -> Optional[BKTree]:
+    '''
+    Returns the BK-tree saved in the given directory for the dictionary with the
+    given hash, if any; trees are only loaded once per process.
+
+    Parameters:
+        words_hash (str):
+            The dictionary_hash of the dictionary being played
+        directory (str):
+            Directory containing tree files
+
+    Returns:
+        Optional[BKTree]:
+            The matching tree, or None if there is none
+    '''
+    if words_hash not in _bk_trees_by_hash:
+        _bk_trees_by_hash[words_hash] = None
+        for path in sorted(glob.glob(os.path.join(directory, "*" + BK_TREE_SUFFIX))):
+            if read_bk_tree_hash(path) == words_hash:
+                _bk_trees_by_hash[words_hash] = BKTree.load(path)
+                break
+    return _bk_trees_by_hash.get(words_hash)
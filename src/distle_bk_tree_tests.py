@@ -0,0 +1,81 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_bk_tree import *
+from distle_game import DistleGame, DistlePlayer
+from distle_dictionary import FrozenDictionary, dictionary_hash
+from edit_dist_utils import edit_distance
+
+class DistleBKTreeTests(unittest.TestCase):
+    """
+    Unit tests for validating the BK-tree over Distle dictionaries.
+    """
+    
+    WORDS: list[str] = ["ca", "abc", "stone", "stoke", "shone", "phone", "score", "strobe", "tone", "atone", "notes", "onset"]
+    
+    def test_damerau_levenshtein_t0(self) -> None:
+        self.assertEqual(0, damerau_levenshtein_distance("", ""))
+        self.assertEqual(1, damerau_levenshtein_distance("ab", "ba"))
+        # Unlike OSA, DL may edit between transposed characters
+        self.assertEqual(2, damerau_levenshtein_distance("ca", "abc"))
+        self.assertEqual(3, edit_distance("ca", "abc"))
+        
+    def test_words_at_distance_t0(self) -> None:
+        tree = BKTree(self.WORDS)
+        self.assertEqual(len(self.WORDS), len(tree))
+        for guess in self.WORDS + ["stones", "xyz"]:
+            for dist in range(7):
+                expected = sorted(word for word in self.WORDS if edit_distance(guess, word) == dist)
+                self.assertEqual(expected, sorted(tree.words_at_distance(guess, dist)))
+        
+    def test_save_load_t0(self) -> None:
+        tree = BKTree(self.WORDS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = bk_tree_path_for(os.path.join(directory, "words.txt"))
+            tree.save(path, "abc123")
+            self.assertEqual("abc123", read_bk_tree_hash(path))
+            loaded = BKTree.load(path)
+            self.assertEqual(tree.words, loaded.words)
+            self.assertEqual(tree.children, loaded.children)
+            self.assertIs(find_bk_tree("abc123", directory), find_bk_tree("abc123", directory))
+            self.assertIsNone(find_bk_tree("nope", directory))
+        
+    def test_game_words_at_distance_t0(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            dictionary_path = os.path.join(directory, "words.txt")
+            with open(dictionary_path, "w") as file:
+                file.write("\n".join(self.WORDS) + "\n")
+            game = DistleGame(dictionary_path, False, None)
+            for dist in range(4):
+                expected = sorted(word for word in self.WORDS if edit_distance("stone", word) == dist)
+                self.assertEqual(expected, sorted(game.words_at_distance("stone", dist)))
+            # Built and saved next to the dictionary on first use, then loaded from there
+            tree_path = bk_tree_path_for(dictionary_path)
+            self.assertEqual(dictionary_hash(game.dictionary), read_bk_tree_hash(tree_path))
+            reloaded = DistleGame(dictionary_path, False, None).get_bk_tree()
+            self.assertEqual(game.get_bk_tree().children, reloaded.children)
+        
+    def test_player_bk_tree_t0(self) -> None:
+        queries: list[tuple[str, int]] = []
+        class CountingBKTree(BKTree):
+            def words_at_distance(self, guess: str, edit_dist: int) -> list[str]:
+                queries.append((guess, edit_dist))
+                return super().words_at_distance(guess, edit_dist)
+        
+        dictionary = FrozenDictionary(self.WORDS)
+        for use_bk_tree in (True, False):
+            # Only opting in queries the tree, even though the prefix sweep is on by default
+            player = DistlePlayer(use_bk_tree = use_bk_tree)
+            player.start_new_game(dictionary, 10)
+            self.assertIsNotNone(player.prefix_sweep)
+            if use_bk_tree:
+                player.bk_tree = CountingBKTree(dictionary.words)
+            edit_dist, encoded = feedback_signature("stone", "shone")
+            player.get_feedback("stone", edit_dist, list(encoded))
+            self.assertEqual({word for word in self.WORDS if feedback_signature("stone", word) == (edit_dist, encoded)},
+                             set(player.possible_words))
+        self.assertEqual([("stone", 1)], queries)
+        
+if __name__ == '__main__':
+    unittest.main()
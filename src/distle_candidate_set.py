@@ -0,0 +1,223 @@
+from distle_dictionary import FrozenDictionary, feedback_length
+from typing import *
+import numpy as np
+import random
+'''
+Set of the candidates still possible in a game, as a mask over the positions of
+a FrozenDictionary's sorted words rather than a set of the words themselves: one
+byte per dictionary word instead of a hash table of references, narrowed by
+vectorized intersection, and reset to the whole dictionary in constant time, so
+that a player can keep the same CandidateSet from game to game.
+'''
+
+class CandidateSet(AbstractSet[str]):
+    '''
+    Subset of a FrozenDictionary's words, backed by a NumPy bool mask aligned
+    with its sorted words. Iterates over its words in sorted order.
+    '''
+
+    def __init__(self, dictionary: FrozenDictionary) -> None:
+        '''
+        Constructs a new CandidateSet holding every word of the given dictionary.
+
+        Parameters:
+            dictionary (FrozenDictionary):
+                The dictionary whose words are the candidates
+        '''
+        self.dictionary: FrozenDictionary = dictionary
+        # The mask of the candidates, or None while they are the whole dictionary;
+        # the mask's buffer is kept across resets so that games allocate none
+        self._mask: Optional[np.ndarray] = None
+        self._buffer: Optional[np.ndarray] = None
+        # Positions and words of the candidates, computed on first use after a change
+        self._survivors: Optional[np.ndarray] = None
+        self._words: Optional[Sequence[str]] = None
+
+    def reset(self) -> None:
+        '''
+        Makes every word of the dictionary a candidate again, in constant time.
+        '''
+        self._mask = None
+        self._survivors = None
+        self._words = None
+
+    def is_full(self) -> bool:
+        '''
+        Returns whether every word of the dictionary is a candidate, i.e., the set
+        was never narrowed since its construction or last reset.
+
+        Returns:
+            bool:
+                Whether the candidates are the whole dictionary
+        '''
+        return self._mask is None
+
+    def intersect(self, other: np.ndarray) -> None:
+        '''
+        Narrows the candidates down to those also in the given mask or positions.
+
+        Parameters:
+            other (np.ndarray):
+                A bool mask aligned with the dictionary's words, or an array of
+                positions in them
+        '''
+        if other.dtype != np.bool_:
+            positions = other
+            other = np.zeros(len(self.dictionary), dtype = np.bool_)
+            other[positions] = True
+        if self._mask is None:
+            if self._buffer is None:
+                self._buffer = np.empty(len(self.dictionary), dtype = np.bool_)
+            np.copyto(self._buffer, other)
+            self._mask = self._buffer
+        else:
+            np.logical_and(self._mask, other, out = self._mask)
+        self._survivors = None
+        self._words = None
+
+    def keep(self, words: Iterable[str]) -> None:
+        '''
+        Narrows the candidates down to those among the given words; words not in
+        the dictionary are ignored.
+
+        Parameters:
+            words (Iterable[str]):
+                The words to keep
+        '''
+        index_of = self.dictionary.index_of
+        positions = [index_of[word] for word in words if word in index_of]
+        self.intersect(np.array(positions, dtype = np.int64))
+
+    def survivors(self) -> np.ndarray:
+        '''
+        Returns the positions of the candidates in the dictionary's sorted words.
+
+        Returns:
+            np.ndarray:
+                The candidates' positions, in increasing order
+        '''
+        if self._survivors is None:
+            self._survivors = np.arange(len(self.dictionary)) if self._mask is None else np.flatnonzero(self._mask)
+        return self._survivors
+
+    def words(self) -> Sequence[str]:
+        '''
+        Returns the candidates themselves; the dictionary's own words while full.
+
+        Returns:
+            Sequence[str]:
+                The candidates, in sorted order
+        '''
+        if self._words is None:
+            if self._mask is None:
+                self._words = self.dictionary.words
+            else:
+                dictionary_words = self.dictionary.words
+                self._words = [dictionary_words[position] for position in self.survivors().tolist()]
+        return self._words
+
+    def sample(self, rng: Optional[random.Random] = None) -> str:
+        '''
+        Returns a random candidate, in constant time once the survivors are known.
+
+        Parameters:
+            rng (Optional[random.Random]):
+                Source of randomness; the random module if None
+
+        Returns:
+            str:
+                A candidate, uniformly at random
+        '''
+        sampler = random if rng is None else rng
+        if self._mask is None:
+            return self.dictionary.words[sampler.randrange(len(self.dictionary))]
+        survivors = self.survivors()
+        if len(survivors) == 0:
+            raise ValueError("[X] Cannot sample an empty CandidateSet")
+        return self.dictionary.words[int(survivors[sampler.randrange(len(survivors))])]
+
+    def candidate_positions(self, guess_len: int, edit_dist: int, transforms: list[str]) -> np.ndarray:
+        '''
+        Returns the positions of the candidates of the length consistent with the
+        given feedback, found over all of the candidates' lengths at once.
+
+        Parameters:
+            guess_len (int):
+                The length of the guess
+            edit_dist (int):
+                The edit distance between the guess and the secret
+            transforms (list[str]):
+                The top-down transforms from the guess to the secret
+
+        Returns:
+            np.ndarray:
+                The positions of the candidates whose length is consistent with the
+                feedback, in increasing order
+        '''
+        length = feedback_length(guess_len, transforms)
+        if abs(length - guess_len) > edit_dist:
+            return np.zeros(0, dtype = np.int64)
+        if self._mask is None:
+            return np.flatnonzero(self.dictionary.lengths == length)
+        survivors = self.survivors()
+        positions: np.ndarray = survivors[self.dictionary.lengths[survivors] == length]
+        return positions
+
+    def candidates(self, guess_len: int, edit_dist: int, transforms: list[str]) -> list[str]:
+        '''
+        Returns the candidates of the length consistent with the given feedback,
+        like LengthIndex.candidates; see candidate_positions.
+
+        Parameters:
+            guess_len (int):
+                The length of the guess
+            edit_dist (int):
+                The edit distance between the guess and the secret
+            transforms (list[str]):
+                The top-down transforms from the guess to the secret
+
+        Returns:
+            list[str]:
+                The candidates whose length is consistent with the feedback
+        '''
+        if self._mask is None:
+            return self.dictionary.length_index.candidates(guess_len, edit_dist, transforms)
+        dictionary_words = self.dictionary.words
+        return [dictionary_words[position] for position in self.candidate_positions(guess_len, edit_dist, transforms).tolist()]
+
+    def __contains__(self, word: object) -> bool:
+        '''
+        Returns whether the given word is a candidate.
+
+        Parameters:
+            word (object):
+                The word to look up
+
+        Returns:
+            bool:
+                Whether the word is a candidate
+        '''
+        if not isinstance(word, str):
+            return False
+        position = self.dictionary.position(word)
+        return position is not None and (self._mask is None or bool(self._mask[position]))
+
+    def __iter__(self) -> Iterator[str]:
+        '''
+        Returns an iterator over the candidates, in sorted order.
+
+        Returns:
+            Iterator[str]:
+                Iterator over the candidates
+        '''
+        return iter(self.words())
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of candidates, i.e., the popcount of the mask.
+
+        Returns:
+            int:
+                The number of candidates
+        '''
+        return len(self.dictionary) if self._mask is None else len(self.survivors())
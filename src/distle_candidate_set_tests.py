@@ -0,0 +1,79 @@
+import unittest
+import pytest
+import random
+import numpy as np
+from distle_candidate_set import *
+from distle_dictionary import FrozenDictionary, load_dictionary
+from distle_player import DistlePlayer
+from edit_dist_utils import feedback_signature
+
+class DistleCandidateSetTests(unittest.TestCase):
+    """
+    Unit tests for validating the mask-backed CandidateSet of DistlePlayers.
+    """
+    
+    def test_candidate_set_t0(self) -> None:
+        dictionary = FrozenDictionary(["stone", "store", "tone", "tons", "strobe"])
+        candidates = CandidateSet(dictionary)
+        self.assertTrue(candidates.is_full())
+        self.assertEqual(set(dictionary), candidates)
+        candidates.keep(["tone", "store", "tons", "nope"])
+        self.assertEqual(["store", "tone", "tons"], list(candidates))
+        candidates.intersect(np.array([True, False, False, True, True]))
+        self.assertEqual({"tone", "tons"}, candidates)
+        self.assertEqual(2, len(candidates))
+        self.assertNotIn("store", candidates)
+        self.assertEqual(["tone", "tons"], candidates.candidates(4, 1, ["R"]))
+        self.assertEqual([3, 4], candidates.candidate_positions(4, 1, ["R"]).tolist())
+        self.assertEqual([], candidates.candidates(5, 1, ["R"]))
+        self.assertIn(candidates.sample(random.Random(0)), {"tone", "tons"})
+        candidates.reset()
+        self.assertTrue(candidates.is_full())
+        self.assertEqual(5, len(candidates))
+        self.assertIn("store", candidates)
+        self.assertIn(candidates.sample(random.Random(0)), dictionary)
+        self.assertEqual([0, 1], candidates.candidate_positions(4, 1, ["I"]).tolist())
+        
+    def test_player_candidate_set_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        player = DistlePlayer()
+        player.start_new_game(dictionary, 10)
+        candidate_set = player.candidate_set
+        assert candidate_set is not None
+        # Narrowed by the filters' positions, without looking up survivors by word
+        kept: list[Iterable[str]] = []
+        candidate_set.keep = kept.append  # type: ignore[method-assign, assignment]
+        for guess in ("stone", "stomp"):
+            edit_dist, encoded = feedback_signature(guess, "stoop")
+            player.get_feedback(guess, edit_dist, list(encoded))
+        self.assertEqual([], kept)
+        self.assertIsInstance(player.possible_words, CandidateSet)
+        self.assertFalse(candidate_set.is_full())
+        self.assertIn("stoop", player.possible_words)
+        self.assertEqual({word for word in dictionary if feedback_signature("stone", word) == feedback_signature("stone", "stoop")
+                          and feedback_signature("stomp", word) == feedback_signature("stomp", "stoop")}, player.possible_words)
+        player.start_new_game(dictionary, 10)
+        self.assertIs(candidate_set, player.candidate_set)
+        self.assertEqual(len(dictionary), len(player.possible_words))
+        
+    def test_player_random_candidate_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        player = DistlePlayer()
+        player.start_new_game(dictionary, 10)
+        player.opening_book = None
+        edit_dist, encoded = feedback_signature("stone", "stoop")
+        player.get_feedback("stone", edit_dist, list(encoded))
+        assert player.candidate_set is not None
+        sampled: list[str] = []
+        sample = player.candidate_set.sample
+        def recorded_sample(rng: Optional[random.Random] = None) -> str:
+            sampled.append(sample(rng))
+            return sampled[-1]
+        player.candidate_set.sample = recorded_sample  # type: ignore[method-assign]
+        # Out of time, the guess is a random candidate, sampled without listing them
+        guess = player.make_guess(time_budget = 0.0)
+        self.assertEqual([guess], sampled)
+        self.assertIn(guess, player.possible_words)
+        
+if __name__ == '__main__':
+    unittest.main()
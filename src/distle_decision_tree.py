@@ -0,0 +1,514 @@
+from distle_partition import *
+from distle_dictionary import FrozenDictionary, dictionary_hash, load_dictionary
+from distle_opening_book import feedback_key
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import struct
+'''
+Offline builder and loader of complete Distle strategies: a decision tree whose
+root is the first guess to make and whose every node maps each feedback its
+guess can receive to the node of the next guess. A DistlePlayer following it
+(see use_decision_tree) does no more work per turn than one node lookup, and is
+guaranteed to win every game whose secret the tree solves, as recorded in the
+tree file. Feedback only tells apart so much (e.g., no guess splits a cluster of
+words differing in the same single letter faster than one word at a time), so
+not every dictionary has a tree solving all of its secrets within max_guesses;
+the builder then solves as many as it finds a way to, and players leave the tree
+for ordinary play on the others.
+
+Usage:
+    python distle_decision_tree.py ../dat/dictionary6.txt [--max-guesses 10] [--workers N]
+
+The subtrees below the first guess are solved by worker processes, and each is
+checkpointed as it completes, so an interrupted build resumes where it stopped.
+The tree is saved next to the dictionary (e.g., dictionary6.tree.bin), keyed by
+the hash of the dictionary's contents.
+'''
+
+# Directory searched for decision trees by find_decision_tree
+DEFAULT_TREE_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dat")
+
+# Suffixes replacing a dictionary file's extension to name its tree, and the
+# directory of its build's checkpointed subtrees
+TREE_SUFFIX: str = ".tree.bin"
+TREE_SHARD_DIR_SUFFIX: str = ".tree.shards"
+
+# Number of best-scoring guesses tried at every node whose candidates outnumber
+# the guesses left, keeping the one whose subtree solves the most of them; only
+# nodes of at most TREE_RETRY_MAX_CANDIDATES candidates retry, since every retry
+# multiplies the work below them
+TREE_GUESS_RETRIES: int = 4
+TREE_RETRY_MAX_CANDIDATES: int = 32
+
+# Tree file layout, all little-endian and 4-byte aligned:
+#    - Header: magic, format version, max guesses, number of secrets solved within
+#      them, node, edge and feedback counts, feedback blob size, dictionary hash
+#    - Guesses: uint32[nodes], each node's guess as an index into the sorted words
+#    - First edges: uint32[nodes + 1], the start of each node's edges, then their end
+#    - Edge feedbacks: uint32[edges], indices into the feedback table
+#    - Edge children: uint32[edges], the node each edge leads to
+#    - Feedback table: the feedback_keys of the edges, new-line separated
+# Nodes are numbered breadth-first from the root, node 0.
+TREE_MAGIC: bytes = b"DSTLTREE"
+TREE_VERSION: int = 1
+_TREE_HEADER: struct.Struct = struct.Struct("<8sIIIIIII64s")
+
+# A subtree as built and checkpointed: {"guess": str, "children": {feedback_key: subtree}}
+TreeNode = dict[str, Any]
+
+class DecisionTree:
+    '''
+    Complete strategy for one dictionary, stored as flat arrays (see the tree file
+    layout above); a game's state is just the index of its current node.
+    '''
+
+    def __init__(self, dictionary_hash: str, words: Sequence[str], max_guesses: int, solved: int, guesses: np.ndarray,
+                 first_edges: np.ndarray, edge_feedbacks: np.ndarray, edge_children: np.ndarray,
+                 feedback_keys: list[str]) -> None:
+        '''
+        Constructs a new DecisionTree.
+
+        Parameters:
+            dictionary_hash (str):
+                The dictionary_hash of the dictionary this tree was built for
+            words (Sequence[str]):
+                That dictionary's sorted words, which guesses index into
+            max_guesses (int):
+                The number of guesses the tree was built for
+            solved (int):
+                The number of secrets the tree solves within max_guesses
+            guesses, first_edges, edge_feedbacks, edge_children (np.ndarray):
+                The node and edge arrays (see the tree file layout)
+            feedback_keys (list[str]):
+                The feedback table
+        '''
+        self.dictionary_hash: str = dictionary_hash
+        self.words: Sequence[str] = words
+        self.max_guesses: int = max_guesses
+        self.solved: int = solved
+        self.guesses: np.ndarray = guesses
+        self.first_edges: np.ndarray = first_edges
+        self.edge_feedbacks: np.ndarray = edge_feedbacks
+        self.edge_children: np.ndarray = edge_children
+        self.feedback_keys: list[str] = feedback_keys
+        # Map from (node, feedback_key) to child node, so that each turn is one lookup
+        self._children: dict[tuple[int, str], int] = {}
+        for node in range(len(guesses)):
+            for edge in range(int(first_edges[node]), int(first_edges[node + 1])):
+                self._children[(node, feedback_keys[edge_feedbacks[edge]])] = int(edge_children[edge])
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of nodes of the tree.
+
+        Returns:
+            int:
+                The number of nodes
+        '''
+        return len(self.guesses)
+
+    def win_rate(self) -> float:
+        '''
+        Returns the proportion of the dictionary's secrets the tree is guaranteed
+        to solve within max_guesses.
+
+        Returns:
+            float:
+                The tree's guaranteed win rate
+        '''
+        return self.solved / len(self.words) if len(self.words) > 0 else 1.0
+
+    def guess(self, node: int) -> str:
+        '''
+        Returns the guess to make at the given node.
+
+        Parameters:
+            node (int):
+                The current node; 0 at the start of a game
+
+        Returns:
+            str:
+                The node's guess
+        '''
+        return self.words[int(self.guesses[node])]
+
+    def child(self, node: int, feedback: Feedback) -> Optional[int]:
+        '''
+        Returns the node reached from the given one when its guess receives the
+        given feedback.
+
+        Parameters:
+            node (int):
+                The current node
+            feedback (Feedback):
+                The feedback its guess received
+
+        Returns:
+            Optional[int]:
+                The next node, or None if no secret of the dictionary gives the
+                guess this feedback
+        '''
+        return self._children.get((node, feedback_key(feedback)))
+
+    @staticmethod
+    def from_nodes(words: Sequence[str], max_guesses: int, solved: int, root: TreeNode) -> "DecisionTree":
+        '''
+        Flattens a built tree of TreeNodes into a DecisionTree, numbering the
+        nodes breadth-first.
+
+        Parameters:
+            words (Sequence[str]):
+                The sorted words of the dictionary the tree was built for
+            max_guesses (int):
+                The number of guesses the tree was built for
+            solved (int):
+                The number of secrets the tree solves within max_guesses
+            root (TreeNode):
+                The built tree
+
+        Returns:
+            DecisionTree:
+                The flattened tree
+        '''
+        index_of = {word: index for index, word in enumerate(words)}
+        feedback_ids: dict[str, int] = {}
+        guesses: list[int] = []
+        first_edges: list[int] = [0]
+        edge_feedbacks: list[int] = []
+        edge_children: list[int] = []
+        queue: list[TreeNode] = [root]
+        for node in queue:
+            guesses.append(index_of[node["guess"]])
+            for key in sorted(node["children"]):
+                edge_feedbacks.append(feedback_ids.setdefault(key, len(feedback_ids)))
+                edge_children.append(len(queue))
+                queue.append(node["children"][key])
+            first_edges.append(len(edge_feedbacks))
+        as_array: Callable[[list[int]], np.ndarray] = lambda values: np.array(values, dtype = "<u4")
+        return DecisionTree(dictionary_hash(words), words, max_guesses, solved, as_array(guesses), as_array(first_edges),
+                            as_array(edge_feedbacks), as_array(edge_children), list(feedback_ids))
+
+    def save(self, path: str) -> None:
+        '''
+        Writes this tree in the binary tree file layout to the given path.
+
+        Parameters:
+            path (str):
+                Destination of the tree file
+        '''
+        blob = "\n".join(self.feedback_keys).encode("utf-8")
+        with open(path + ".tmp", "wb") as file:
+            file.write(_TREE_HEADER.pack(TREE_MAGIC, TREE_VERSION, self.max_guesses, self.solved, len(self.guesses), len(self.edge_children),
+                                         len(self.feedback_keys), len(blob), self.dictionary_hash.encode("ascii")))
+            for array in (self.guesses, self.first_edges, self.edge_feedbacks, self.edge_children):
+                file.write(array.astype("<u4").tobytes())
+            file.write(blob)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def load(path: str, words: Sequence[str]) -> "DecisionTree":
+        '''
+        Reads a tree previously written by save.
+
+        Parameters:
+            path (str):
+                Location of the tree file
+            words (Sequence[str]):
+                The sorted words of the dictionary the tree was built for
+
+        Returns:
+            DecisionTree:
+                The loaded tree
+        '''
+        with open(path, "rb") as file:
+            contents = file.read()
+        magic, version, max_guesses, solved, n_nodes, n_edges, n_feedbacks, blob_size, words_hash = _TREE_HEADER.unpack_from(contents, 0)
+        if magic != TREE_MAGIC or version != TREE_VERSION:
+            raise ValueError("[X] Not a decision tree of version " + str(TREE_VERSION) + ": " + path)
+        position = _TREE_HEADER.size
+        arrays: list[np.ndarray] = []
+        for count in (n_nodes, n_nodes + 1, n_edges, n_edges):
+            arrays.append(np.frombuffer(contents, dtype = "<u4", count = count, offset = position))
+            position += 4 * count
+        feedback_keys = contents[position:position + blob_size].decode("utf-8").split("\n") if n_feedbacks > 0 else []
+        guesses, first_edges, edge_feedbacks, edge_children = arrays
+        return DecisionTree(words_hash.decode("ascii"), words, max_guesses, solved, guesses, first_edges,
+                            edge_feedbacks, edge_children, feedback_keys)
+
+def read_tree_header(path: str) -> tuple[str, int]:
+    '''
+    Returns the dictionary hash and max guesses recorded in a tree file's header,
+    without reading the rest of the file.
+
+    Parameters:
+        path (str):
+            Location of the tree file
+
+    Returns:
+        tuple[str, int]:
+            The tree's (dictionary hash, max guesses)
+    '''
+    with open(path, "rb") as file:
+        magic, version, max_guesses, _, _, _, _, _, words_hash = _TREE_HEADER.unpack(file.read(_TREE_HEADER.size))
+    if magic != TREE_MAGIC or version != TREE_VERSION:
+        raise ValueError("[X] Not a decision tree of version " + str(TREE_VERSION) + ": " + path)
+    return words_hash.decode("ascii"), max_guesses
+
+def tree_path_for(dictionary_path: str) -> str:
+    '''
+    Returns the path of the decision tree belonging to the given dictionary file.
+
+    Parameters:
+        dictionary_path (str):
+            Path to a dictionary file
+
+    Returns:
+        str:
+            Path of the dictionary's tree
+    '''
+    return os.path.splitext(dictionary_path)[0] + TREE_SUFFIX
+
+_trees_by_hash: dict[tuple[str, str], Optional[DecisionTree]] = {}
+
+def find_decision_tree(dictionary: AbstractSet[str], directory: str = DEFAULT_TREE_DIR) -> Optional[DecisionTree]:
+    '''
+    Returns the decision tree in the given directory built for the given
+    dictionary, if any. Trees are only looked up once per process.
+
+    Parameters:
+        dictionary (AbstractSet[str]):
+            The dictionary being played
+        directory (str):
+            Directory containing tree files
+
+    Returns:
+        Optional[DecisionTree]:
+            The matching tree, or None if there is none
+    '''
+    words_hash = dictionary_hash(dictionary)
+    if (directory, words_hash) not in _trees_by_hash:
+        _trees_by_hash[(directory, words_hash)] = None
+        words = dictionary.words if isinstance(dictionary, FrozenDictionary) else sorted(dictionary)
+        for path in sorted(glob.glob(os.path.join(directory, "*" + TREE_SUFFIX))):
+            if read_tree_header(path)[0] == words_hash:
+                _trees_by_hash[(directory, words_hash)] = DecisionTree.load(path, words)
+                break
+    return _trees_by_hash[(directory, words_hash)]
+
+# Builder
+# -------------------------------------------------
+
+def rank_guesses(candidates: Sequence[str], metric: str, guess_sample: int, secret_sample: int, rng: random.Random) -> list[str]:
+    '''
+    Returns sampled candidates as guesses, best-scoring first, each scored by its
+    partition of sampled candidates (see choose_guess).
+
+    Parameters:
+        candidates (Sequence[str]):
+            The possible secrets, which the guesses are drawn from
+        metric (str):
+            One of SCORING_METRICS
+        guess_sample (int):
+            Maximum number of guesses to score
+        secret_sample (int):
+            Maximum number of candidates each guess is scored against
+        rng (random.Random):
+            Source of randomness for sampling
+
+    Returns:
+        list[str]:
+            The sampled guesses, best first
+    '''
+    guesses = list(candidates) if len(candidates) <= guess_sample else rng.sample(list(candidates), guess_sample)
+    secrets = list(candidates) if len(candidates) <= secret_sample else rng.sample(list(candidates), secret_sample)
+    candidate_set = set(candidates)
+    scored = [(score_partition(partition_candidates(guess, secrets), metric), guess not in candidate_set, guess) for guess in guesses]
+    return [guess for _, _, guess in sorted(scored)]
+
+def solve_subtree(candidates: Sequence[str], guesses_left: int, metric: str, guess_sample: int, secret_sample: int,
+                  rng: random.Random, memo: Optional[dict[tuple[tuple[str, ...], int], tuple[TreeNode, int]]] = None) -> tuple[TreeNode, int]:
+    '''
+    Builds the subtree solving as many of the given candidates as it can within
+    the given number of guesses. Each node guesses one of its candidates, so every
+    guess rules at least itself out; when the candidates outnumber the guesses
+    left (and are few enough), the TREE_GUESS_RETRIES best-ranked ones are tried
+    in turn, until one solves every candidate, and the one solving the most is kept.
+
+    Parameters:
+        candidates (Sequence[str]):
+            The possible secrets; must be non-empty
+        guesses_left (int):
+            The number of guesses left to solve them in; must be positive
+        metric, guess_sample, secret_sample:
+            How guesses are ranked; see rank_guesses
+        rng (random.Random):
+            Source of randomness for sampling
+        memo (Optional[dict[tuple[tuple[str, ...], int], tuple[TreeNode, int]]]):
+            Subtrees already solved, by candidates and guesses left
+
+    Returns:
+        tuple[TreeNode, int]:
+            The subtree, and the number of candidates it solves
+    '''
+    if len(candidates) == 1 or guesses_left == 1:
+        return {"guess": candidates[0], "children": {}}, 1
+    memo = {} if memo is None else memo
+    key = (tuple(candidates), guesses_left)
+    if key in memo:
+        return memo[key]
+    best: Optional[tuple[TreeNode, int]] = None
+    retries = TREE_GUESS_RETRIES if guesses_left < len(candidates) <= TREE_RETRY_MAX_CANDIDATES else 1
+    for guess in rank_guesses(candidates, metric, guess_sample, secret_sample, rng)[:retries]:
+        partition = partition_candidates(guess, candidates)
+        solved = len(partition.pop((0, ""), []))
+        children: dict[str, TreeNode] = {}
+        for feedback in sorted(partition):
+            child, child_solved = solve_subtree(partition[feedback], guesses_left - 1, metric, guess_sample, secret_sample, rng, memo)
+            children[feedback_key(feedback)] = child
+            solved += child_solved
+        if best is None or solved > best[1]:
+            best = ({"guess": guess, "children": children}, solved)
+        if solved == len(candidates):
+            break
+    assert best is not None
+    memo[key] = best
+    return best
+
+def _tree_shard_path(shard_dir: str, key: str) -> str:
+    '''
+    Returns the path of the checkpointed subtree below the given root feedback.
+
+    Parameters:
+        shard_dir (str):
+            Directory of the build's checkpoints
+        key (str):
+            The feedback_key of the root guess' feedback leading to the subtree
+
+    Returns:
+        str:
+            Path of the checkpoint file
+    '''
+    return os.path.join(shard_dir, key.replace(":", "_") + ".json")
+
+def _solve_shard(task: tuple[str, str, list[str], int, str, int, int, int]) -> int:
+    '''
+    Solves one subtree below the root in a worker, and checkpoints it atomically
+    (written under a temporary name, then renamed) along with the number of
+    secrets it solves.
+
+    Parameters:
+        task (tuple[str, str, list[str], int, str, int, int, int]):
+            The (shard directory, feedback key, bucket, guesses left, metric,
+            guess sample, secret sample, seed) of the subtree
+
+    Returns:
+        int:
+            The number of secrets the subtree solves
+    '''
+    shard_dir, key, bucket, guesses_left, metric, guess_sample, secret_sample, seed = task
+    subtree, solved = solve_subtree(bucket, guesses_left, metric, guess_sample, secret_sample, random.Random(seed))
+    path = _tree_shard_path(shard_dir, key)
+    with open(path + ".tmp", "w") as file:
+        json.dump({"tree": subtree, "solved": solved}, file)
+    os.replace(path + ".tmp", path)
+    return solved
+
+def build_decision_tree(dictionary_path: str, max_guesses: int = 10, metric: str = "expected_size",
+                        guess_sample: int = DEFAULT_GUESS_SAMPLE, secret_sample: int = DEFAULT_SECRET_SAMPLE,
+                        seed: int = 0, n_workers: Optional[int] = None) -> str:
+    '''
+    Builds the decision tree of the given dictionary and saves it next to it. The
+    root guess is chosen here, and the subtree below each of its feedbacks built
+    by a pool of worker processes, resuming from the subtrees checkpointed by an
+    earlier, interrupted build with the same parameters. Deterministic for a
+    given seed.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file, of either format
+        max_guesses (int):
+            The number of guesses within which secrets must be solved
+        metric (str):
+            One of SCORING_METRICS
+        guess_sample (int):
+            Maximum number of guesses scored per node
+        secret_sample (int):
+            Maximum number of candidates each guess is scored against
+        seed (int):
+            Seed of the sampling
+        n_workers (Optional[int]):
+            Number of worker processes; all cores if None
+
+    Returns:
+        str:
+            Path of the saved tree
+    '''
+    if metric not in SCORING_METRICS:
+        raise ValueError("[X] Metric must be one of " + str(SCORING_METRICS) + ", but was " + str(metric))
+    dictionary = load_dictionary(dictionary_path)
+    words = list(dictionary.words)
+    if len(words) == 0:
+        raise ValueError("[X] Cannot build a decision tree for an empty dictionary")
+    shard_dir = os.path.splitext(dictionary_path)[0] + TREE_SHARD_DIR_SUFFIX
+    header_path = os.path.join(shard_dir, "header.json")
+    header: dict[str, Any] = {"hash": dictionary_hash(dictionary), "max_guesses": max_guesses, "metric": metric,
+                              "guess_sample": guess_sample, "secret_sample": secret_sample, "seed": seed}
+
+    # The root guess is part of the checkpoint, so a resumed build keeps it
+    saved: dict[str, Any] = {}
+    if os.path.isfile(header_path):
+        with open(header_path, "r") as file:
+            saved = json.load(file)
+    root_guess: Optional[str] = saved.pop("root", None)
+    if saved != header:
+        shutil.rmtree(shard_dir, ignore_errors = True)
+        root_guess = None
+    if root_guess is None:
+        root_guess = rank_guesses(words, metric, 4 * guess_sample, 4 * secret_sample, random.Random(seed))[0]
+        os.makedirs(shard_dir, exist_ok = True)
+        with open(header_path, "w") as file:
+            json.dump(dict(header, root = root_guess), file)
+
+    partition = partition_candidates(root_guess, words)
+    partition.pop((0, ""), None)
+    keys = sorted(partition)
+    tasks = [(shard_dir, feedback_key(key), partition[key], max_guesses - 1, metric, guess_sample, secret_sample, seed + index)
+             for index, key in enumerate(keys) if not os.path.exists(_tree_shard_path(shard_dir, feedback_key(key)))]
+    if tasks:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with context.Pool(n_workers or os.cpu_count()) as pool:
+            pool.map(_solve_shard, tasks, chunksize = 1)
+
+    children: dict[str, TreeNode] = {}
+    solved = 1
+    for key in keys:
+        with open(_tree_shard_path(shard_dir, feedback_key(key)), "r") as file:
+            shard: dict[str, Any] = json.load(file)
+        children[feedback_key(key)] = shard["tree"]
+        solved += shard["solved"]
+    path = tree_path_for(dictionary_path)
+    DecisionTree.from_nodes(words, max_guesses, solved, {"guess": root_guess, "children": children}).save(path)
+    shutil.rmtree(shard_dir)
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Builds the complete decision tree of a Distle dictionary")
+    parser.add_argument("dictionary", help = "path to the dictionary file, e.g., ../dat/dictionary6.txt")
+    parser.add_argument("--max-guesses", type = int, default = 10)
+    parser.add_argument("--metric", default = "expected_size", choices = SCORING_METRICS)
+    parser.add_argument("--guess-sample", type = int, default = DEFAULT_GUESS_SAMPLE)
+    parser.add_argument("--secret-sample", type = int, default = DEFAULT_SECRET_SAMPLE)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args()
+
+    tree_path = build_decision_tree(args.dictionary, args.max_guesses, args.metric, args.guess_sample,
+                                    args.secret_sample, args.seed, args.workers)
+    tree = DecisionTree.load(tree_path, load_dictionary(args.dictionary).words)
+    print("[!] Built " + tree_path + ", solving " + str(tree.solved) + " of " + str(len(tree.words)) + " secrets within "
+          + str(tree.max_guesses) + " guesses")
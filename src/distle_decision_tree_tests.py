@@ -0,0 +1,82 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_decision_tree import *
+from distle_player import DistlePlayer
+
+class DistleDecisionTreeTests(unittest.TestCase):
+    """
+    Unit tests for validating the building, saving and following of decision trees.
+    """
+    
+    WORDS: list[str] = ["stone", "stoke", "shone", "phone", "score", "strobe", "tone", "atone", "notes", "onset",
+                        "stove", "store", "shore", "chore", "chose", "those"]
+    
+    def write_dictionary(self, directory: str) -> str:
+        path = os.path.join(directory, "words.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(self.WORDS))
+        return path
+    
+    def test_solve_subtree_t0(self) -> None:
+        words = sorted(self.WORDS)
+        self.assertEqual(1, solve_subtree(words, 1, "expected_size", 8, 8, random.Random(0))[1])
+        self.assertLess(solve_subtree(words, 2, "expected_size", 8, 8, random.Random(0))[1], len(words))
+        root, solved = solve_subtree(words, 10, "expected_size", 8, 8, random.Random(0))
+        self.assertEqual(len(words), solved)
+        tree = DecisionTree.from_nodes(words, 10, solved, root)
+        self.assertEqual(1.0, tree.win_rate())
+        for secret in words:
+            node: Optional[int] = 0
+            for _ in range(10):
+                assert node is not None
+                if tree.guess(node) == secret:
+                    break
+                node = tree.child(node, feedback_signature(tree.guess(node), secret))
+            self.assertEqual(secret, tree.guess(node) if node is not None else None)
+    
+    def test_build_decision_tree_t0(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            dictionary_path = self.write_dictionary(directory)
+            path = build_decision_tree(dictionary_path, 6, guess_sample = 8, secret_sample = 8, n_workers = 1)
+            self.assertEqual(tree_path_for(dictionary_path), path)
+            self.assertFalse(os.path.exists(os.path.splitext(dictionary_path)[0] + TREE_SHARD_DIR_SUFFIX))
+            dictionary = load_dictionary(dictionary_path)
+            tree = find_decision_tree(dictionary, directory)
+            assert tree is not None
+            self.assertEqual((dictionary_hash(dictionary), 6), read_tree_header(path))
+            self.assertEqual(len(self.WORDS), tree.solved)
+            
+            # The saved tree wins every game, checking it once per feedback, and
+            # survives feedback it was not built for
+            player = DistlePlayer(use_decision_tree = True)
+            checks: list[tuple[int, list[str]]] = []
+            on_tree = player._on_tree
+            def counted_on_tree(edit_dist: int, transforms: list[str]) -> bool:
+                checks.append((edit_dist, transforms))
+                return on_tree(edit_dist, transforms)
+            player._on_tree = counted_on_tree  # type: ignore[method-assign]
+            n_feedbacks = 0
+            for secret in self.WORDS:
+                player.start_new_game(dictionary, 6)
+                player.decision_tree, player.tree_node = tree, 0
+                for _ in range(6):
+                    guess = player.make_guess()
+                    distance, encoded = feedback_signature(guess, secret)
+                    if distance == 0:
+                        break
+                    player.get_feedback(guess, distance, list(encoded))
+                    n_feedbacks += 1
+                    self.assertIsNotNone(player.tree_node)
+                self.assertEqual(secret, guess)
+            self.assertEqual(n_feedbacks, len(checks))
+            player.start_new_game(dictionary, 6)
+            player.decision_tree, player.tree_node = tree, 0
+            guess = player.make_guess()
+            player.get_feedback(guess, 9, ["I"] * 9)
+            self.assertIsNone(player.tree_node)
+            self.assertEqual(set(), player.possible_words)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,579 @@
+from typing import *
+import bisect
+import hashlib
+import mmap
+import os
+import struct
+import numpy as np
+'''
+Dictionary and dictionary indexes shared by the DistleGame and DistlePlayer: the
+dictionary is loaded once, frozen, and shared by reference between every game
+(and, via fork, every worker process), and its indexes avoid scanning the whole
+dictionary when only a fraction of it can be consistent with some feedback.
+'''
+
+def feedback_length(guess_len: int, transforms: list[str]) -> int:
+    '''
+    Returns the exact length of any secret consistent with the given transforms:
+    each Insertion lengthens the guess by one, each Deletion shortens it by one,
+    and Replacements and Transpositions leave its length unchanged.
+
+    Parameters:
+        guess_len (int):
+            The length of the guess the transforms were given for
+        transforms (list[str]):
+            The top-down transforms turning the guess into the secret
+
+    Returns:
+        int:
+            The length of the secret
+    '''
+    return guess_len + transforms.count("I") - transforms.count("D")
+
+class LengthIndex:
+    '''
+    Words bucketed by their length, so that the candidates consistent with some
+    feedback can be visited without scanning the words of any other length.
+    '''
+
+    def __init__(self, words: Iterable[str]) -> None:
+        '''
+        Constructs a new LengthIndex over the given words.
+
+        Parameters:
+            words (Iterable[str]):
+                The words to index
+        '''
+        self.buckets: dict[int, list[str]] = {}
+        # Buckets of from_lengths indexes are only materialized on first access
+        self._source: Sequence[str] = ()
+        self._pending: dict[int, np.ndarray] = {}
+        for word in words:
+            self.buckets.setdefault(len(word), []).append(word)
+
+    @staticmethod
+    def from_lengths(words: Sequence[str], lengths: np.ndarray) -> "LengthIndex":
+        '''
+        Returns a LengthIndex over the given words whose lengths are already known,
+        e.g., those of a compiled dictionary. Only the positions of each bucket's
+        words are computed up front; the words themselves are fetched from the
+        sequence the first time their bucket is requested.
+
+        Parameters:
+            words (Sequence[str]):
+                The words to index
+            lengths (np.ndarray):
+                The length of each word, aligned with words
+
+        Returns:
+            LengthIndex:
+                The index over the words
+        '''
+        index = LengthIndex(())
+        index._source = words
+        for length in np.unique(lengths).tolist():
+            index._pending[int(length)] = np.flatnonzero(lengths == length)
+        return index
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of indexed words.
+
+        Returns:
+            int:
+                The number of words across all buckets
+        '''
+        return sum(len(bucket) for bucket in self.buckets.values()) + sum(len(positions) for positions in self._pending.values())
+
+    def lengths(self) -> list[int]:
+        '''
+        Returns the lengths of the non-empty buckets.
+
+        Returns:
+            list[int]:
+                The distinct word lengths, in increasing order
+        '''
+        return sorted(set(self.buckets) | set(self._pending))
+
+    def bucket(self, length: int) -> list[str]:
+        '''
+        Returns the indexed words of the given length.
+
+        Parameters:
+            length (int):
+                The length of the words requested
+
+        Returns:
+            list[str]:
+                The words of that length, possibly none
+        '''
+        if length in self._pending:
+            self.buckets[length] = [self._source[position] for position in self._pending.pop(length).tolist()]
+        return self.buckets.get(length, [])
+
+    def candidate_lengths(self, guess_len: int, edit_dist: int, transforms: Optional[list[str]] = None) -> list[int]:
+        '''
+        Returns the lengths of the buckets that can hold words consistent with the
+        given feedback: a word at edit distance edit_dist from a guess differs from
+        it in length by at most edit_dist, and the transforms, if given, fix the
+        length exactly (see feedback_length).
+
+        Parameters:
+            guess_len (int):
+                The length of the guess
+            edit_dist (int):
+                The edit distance between the guess and the secret
+            transforms (Optional[list[str]]):
+                The top-down transforms from the guess to the secret, if known
+
+        Returns:
+            list[int]:
+                The lengths of the buckets that can still hold the secret
+        '''
+        if transforms is not None:
+            length = feedback_length(guess_len, transforms)
+            return [length] if length in self.lengths() and abs(length - guess_len) <= edit_dist else []
+        return [length for length in self.lengths() if abs(length - guess_len) <= edit_dist]
+
+    def candidates(self, guess_len: int, edit_dist: int, transforms: Optional[list[str]] = None) -> list[str]:
+        '''
+        Returns the indexed words in the buckets that can hold words consistent
+        with the given feedback (see candidate_lengths).
+
+        Parameters:
+            guess_len (int):
+                The length of the guess
+            edit_dist (int):
+                The edit distance between the guess and the secret
+            transforms (Optional[list[str]]):
+                The top-down transforms from the guess to the secret, if known
+
+        Returns:
+            list[str]:
+                The words whose length is consistent with the feedback
+        '''
+        words: list[str] = []
+        for length in self.candidate_lengths(guess_len, edit_dist, transforms):
+            words.extend(self.bucket(length))
+        return words
+
+def dictionary_hash(words: Iterable[str]) -> str:
+    '''
+    Returns a hash of the given dictionary's contents, independent of the order
+    in which its words are given. FrozenDictionaries compute theirs only once.
+
+    Parameters:
+        words (Iterable[str]):
+            The words of the dictionary
+
+    Returns:
+        str:
+            Hex digest identifying the dictionary's contents
+    '''
+    if isinstance(words, FrozenDictionary):
+        return words.content_hash
+    return _sorted_words_hash(sorted(words))
+
+def _sorted_words_hash(words: Sequence[str]) -> str:
+    '''
+    Returns the dictionary_hash of the given words, already sorted and unique.
+
+    Parameters:
+        words (Sequence[str]):
+            The sorted words of the dictionary
+
+    Returns:
+        str:
+            Hex digest identifying the dictionary's contents
+    '''
+    return hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()
+
+def letter_mask(word: str) -> int:
+    '''
+    Returns the bitmask of the distinct letters in the given word: bit i is set
+    iff the word contains the i-th letter of the alphabet, with bit 31 standing in
+    for every character outside of a-z.
+
+    Parameters:
+        word (str):
+            The word to compute the letter mask of
+
+    Returns:
+        int:
+            The word's letter mask
+    '''
+    mask = 0
+    for char in word:
+        mask |= 1 << (ord(char) - 97) if "a" <= char <= "z" else 1 << 31
+    return mask
+
+class MappedWords(Sequence[str]):
+    '''
+    Read-only sequence of the words stored in a compiled dictionary, decoded from
+    the memory-mapped file one at a time as they are accessed rather than copied
+    into memory up front.
+    '''
+
+    def __init__(self, blob: memoryview, offsets: np.ndarray) -> None:
+        '''
+        Constructs a new MappedWords over the given encoded words.
+
+        Parameters:
+            blob (memoryview):
+                The UTF-8 encoded words, concatenated
+            offsets (np.ndarray):
+                The start of each word in the blob, followed by the blob's end
+        '''
+        self._blob: memoryview = blob
+        self._offsets: np.ndarray = offsets
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of words.
+
+        Returns:
+            int:
+                The number of words
+        '''
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, Sequence[str]]:
+        '''
+        Returns the word(s) at the given position(s).
+
+        Parameters:
+            index (Union[int, slice]):
+                The position, or slice of positions, of the words requested
+
+        Returns:
+            Union[str, Sequence[str]]:
+                The decoded word, or list of decoded words for a slice
+        '''
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return str(self._blob[int(self._offsets[index]):int(self._offsets[index + 1])], "utf-8")
+
+class FrozenDictionary(AbstractSet[str]):
+    '''
+    Immutable, indexed dictionary of words, meant to be loaded once and shared by
+    reference between all games and players rather than copied per game. Behaves
+    as a read-only set of its words, which are also available in sorted order
+    along with the position of each, their LengthIndex and a content hash. May be
+    backed by a plain tuple of words or by a memory-mapped compiled dictionary
+    (see compile_dictionary and load_compiled_dictionary).
+    '''
+
+    def __init__(self, words: Iterable[str], sorted_unique: bool = False) -> None:
+        '''
+        Constructs a new FrozenDictionary of the given words, deduplicated.
+
+        Parameters:
+            words (Iterable[str]):
+                The words of the dictionary
+            sorted_unique (bool):
+                Whether words is already a sorted, duplicate-free Sequence, in
+                which case it is shared rather than copied
+        '''
+        self.words: Sequence[str] = words if sorted_unique and isinstance(words, Sequence) else tuple(sorted(set(words)))
+        self._index_of: Optional[dict[str, int]] = None
+        self._length_index: Optional[LengthIndex] = None
+        self._lengths: Optional[np.ndarray] = None
+        self._letter_masks: Optional[np.ndarray] = None
+        self._content_hash: Optional[str] = None
+        if not isinstance(self.words, MappedWords):
+            self._index_of = {word: index for index, word in enumerate(self.words)}
+            self._length_index = LengthIndex(self.words)
+
+    def __contains__(self, word: object) -> bool:
+        '''
+        Returns whether the given word is in the dictionary.
+
+        Parameters:
+            word (object):
+                The word to look up
+
+        Returns:
+            bool:
+                Whether the word is in the dictionary
+        '''
+        if not isinstance(word, str):
+            return False
+        return self.position(word) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        '''
+        Returns an iterator over the dictionary's words, in sorted order.
+
+        Returns:
+            Iterator[str]:
+                Iterator over the words
+        '''
+        return iter(self.words)
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of words in the dictionary.
+
+        Returns:
+            int:
+                The number of words
+        '''
+        return len(self.words)
+
+    def __hash__(self) -> int:
+        '''
+        Returns a hash of the dictionary, consistent with its content-based equality.
+
+        Returns:
+            int:
+                The dictionary's hash
+        '''
+        return hash(self.content_hash)
+
+    def position(self, word: str) -> Optional[int]:
+        '''
+        Returns the position of the given word in the dictionary's sorted words,
+        by binary search if the word-to-position map was never built.
+
+        Parameters:
+            word (str):
+                The word to look up
+
+        Returns:
+            Optional[int]:
+                The word's position, or None if not in the dictionary
+        '''
+        if self._index_of is not None:
+            return self._index_of.get(word)
+        position = bisect.bisect_left(self.words, word)
+        return position if position < len(self.words) and self.words[position] == word else None
+
+    def warm(self) -> None:
+        '''
+        Builds the dictionary's lazily computed state that every game uses, i.e.,
+        its lengths, LengthIndex and content hash, e.g., before forking processes
+        that should share it copy-on-write rather than each build their own.
+        '''
+        if self._length_index is None:
+            self._length_index = LengthIndex.from_lengths(self.words, self.lengths)
+        if self._content_hash is None:
+            self._content_hash = _sorted_words_hash(self.words)
+
+    @property
+    def index_of(self) -> dict[str, int]:
+        '''
+        Map from each word to its position in the sorted words, built on first use.
+
+        Returns:
+            dict[str, int]:
+                The position of every word
+        '''
+        if self._index_of is None:
+            self._index_of = {word: index for index, word in enumerate(self.words)}
+        return self._index_of
+
+    @property
+    def length_index(self) -> LengthIndex:
+        '''
+        The LengthIndex of the dictionary's words, built on first use.
+
+        Returns:
+            LengthIndex:
+                The words bucketed by length
+        '''
+        if self._length_index is None:
+            self._length_index = LengthIndex.from_lengths(self.words, self.lengths)
+        return self._length_index
+
+    @property
+    def lengths(self) -> np.ndarray:
+        '''
+        The length of every word, aligned with the sorted words.
+
+        Returns:
+            np.ndarray:
+                uint8 array of word lengths
+        '''
+        if self._lengths is None:
+            self._lengths = np.fromiter((len(word) for word in self.words), dtype = np.uint8, count = len(self.words))
+        return self._lengths
+
+    @property
+    def letter_masks(self) -> np.ndarray:
+        '''
+        The letter_mask of every word, aligned with the sorted words. Any word at
+        edit distance d from a guess has at most d letters absent from the guess,
+        and vice versa, so these give a cheap lower bound on distances.
+
+        Returns:
+            np.ndarray:
+                uint32 array of letter masks
+        '''
+        if self._letter_masks is None:
+            self._letter_masks = np.fromiter((letter_mask(word) for word in self.words), dtype = np.uint32, count = len(self.words))
+        return self._letter_masks
+
+    @property
+    def content_hash(self) -> str:
+        '''
+        The dictionary_hash of this dictionary's words, computed on first use.
+
+        Returns:
+            str:
+                Hex digest identifying the dictionary's contents
+        '''
+        if self._content_hash is None:
+            self._content_hash = _sorted_words_hash(self.words)
+        return self._content_hash
+
+# Compiled Dictionaries
+# -------------------------------------------------
+
+# Compiled dictionary layout, all little-endian and 4-byte aligned:
+#    - Header: magic, format version, word count, blob size, content hash
+#    - Offsets: uint32[count + 1], the start of each word in the blob, then its end
+#    - Letter masks: uint32[count]
+#    - Lengths: uint8[count], padded to a multiple of 4 bytes
+#    - Blob: the sorted, deduplicated words, UTF-8 encoded and concatenated
+COMPILED_MAGIC: bytes = b"DSTLDICT"
+COMPILED_VERSION: int = 1
+COMPILED_SUFFIX: str = ".dict"
+_COMPILED_HEADER: struct.Struct = struct.Struct("<8sIII64s")
+
+def compiled_path_for(dictionary_path: str) -> str:
+    '''
+    Returns the path of the compiled form of the given dictionary file.
+
+    Parameters:
+        dictionary_path (str):
+            Path to a new-line separated dictionary file
+
+    Returns:
+        str:
+            Path of the dictionary's compiled form
+    '''
+    return os.path.splitext(dictionary_path)[0] + COMPILED_SUFFIX
+
+def compile_dictionary(dictionary_path: str, compiled_path: Optional[str] = None) -> str:
+    '''
+    Compiles the given new-line separated dictionary file into the binary format
+    read by load_compiled_dictionary: sorted, deduplicated words along with their
+    offsets, lengths and letter masks.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file
+        compiled_path (Optional[str]):
+            Destination of the compiled dictionary; next to the original if None
+
+    Returns:
+        str:
+            The path the compiled dictionary was written to
+    '''
+    if compiled_path is None:
+        compiled_path = compiled_path_for(dictionary_path)
+    with open(dictionary_path, "r") as file:
+        dictionary = FrozenDictionary(line.rstrip() for line in file)
+    encoded = [word.encode("utf-8") for word in dictionary.words]
+    offsets = np.zeros(len(encoded) + 1, dtype = "<u4")
+    offsets[1:] = np.cumsum([len(word) for word in encoded])
+    lengths = dictionary.lengths.tobytes()
+    lengths += bytes(-len(lengths) % 4)
+    blob = b"".join(encoded)
+
+    with open(compiled_path, "wb") as file:
+        file.write(_COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, len(encoded), len(blob), dictionary.content_hash.encode("ascii")))
+        file.write(offsets.tobytes())
+        file.write(dictionary.letter_masks.astype("<u4").tobytes())
+        file.write(lengths)
+        file.write(blob)
+    return compiled_path
+
+def is_compiled_dictionary(path: str) -> bool:
+    '''
+    Returns whether the given file is a compiled dictionary, judging by its magic.
+
+    Parameters:
+        path (str):
+            Path to a dictionary file of either format
+
+    Returns:
+        bool:
+            True if compiled, False if (presumably) new-line separated text
+    '''
+    with open(path, "rb") as file:
+        return file.read(len(COMPILED_MAGIC)) == COMPILED_MAGIC
+
+def load_compiled_dictionary(compiled_path: str) -> FrozenDictionary:
+    '''
+    Memory-maps the given compiled dictionary and returns a FrozenDictionary backed
+    by it, without copying the words: they are decoded as accessed, and the
+    offsets, lengths and letter masks are NumPy views of the mapping, so every
+    process loading the same file shares its pages.
+
+    Parameters:
+        compiled_path (str):
+            Path to a file written by compile_dictionary
+
+    Returns:
+        FrozenDictionary:
+            The dictionary backed by the mapped file
+    '''
+    with open(compiled_path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+    magic, version, count, blob_size, content_hash = _COMPILED_HEADER.unpack_from(mapping, 0)
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION:
+        raise ValueError("[X] Not a compiled dictionary of version " + str(COMPILED_VERSION) + ": " + compiled_path)
+
+    position = _COMPILED_HEADER.size
+    offsets = np.frombuffer(mapping, dtype = "<u4", count = count + 1, offset = position)
+    position += offsets.nbytes
+    letter_masks = np.frombuffer(mapping, dtype = "<u4", count = count, offset = position)
+    position += letter_masks.nbytes
+    lengths = np.frombuffer(mapping, dtype = np.uint8, count = count, offset = position)
+    position += count + (-count % 4)
+    blob = memoryview(mapping)[position:position + blob_size]
+
+    dictionary = FrozenDictionary(MappedWords(blob, offsets), sorted_unique = True)
+    dictionary._lengths = lengths
+    dictionary._letter_masks = letter_masks
+    dictionary._content_hash = content_hash.decode("ascii")
+    return dictionary
+
+_loaded_dictionaries: dict[tuple[str, float], FrozenDictionary] = {}
+
+def load_dictionary(dictionary_path: str) -> FrozenDictionary:
+    '''
+    Returns the FrozenDictionary of the words in the given dictionary file, which
+    may be either new-line separated text or compiled (see compile_dictionary).
+    Each file is only read once per process (as long as it is not modified), with
+    every later call sharing the same dictionary.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file
+
+    Returns:
+        FrozenDictionary:
+            The file's shared dictionary
+    '''
+    key = (os.path.realpath(dictionary_path), os.path.getmtime(dictionary_path))
+    if key not in _loaded_dictionaries:
+        if is_compiled_dictionary(dictionary_path):
+            _loaded_dictionaries[key] = load_compiled_dictionary(dictionary_path)
+        else:
+            with open(dictionary_path, "r") as file:
+                _loaded_dictionaries[key] = FrozenDictionary(line.rstrip() for line in file)
+    return _loaded_dictionaries[key]
+
+if __name__ == '__main__':
+    import sys
+    for path in sys.argv[1:]:
+        print("[!] Compiled " + path + " => " + compile_dictionary(path))
@@ -0,0 +1,82 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_dictionary import *
+
+class DistleDictionaryTests(unittest.TestCase):
+    """
+    Unit tests for validating the dictionary indexes shared by games and players.
+    """
+    
+    WORDS: list[str] = ["a", "at", "ate", "eat", "tea", "seat", "state", "states"]
+    
+    def test_feedback_length_t0(self) -> None:
+        self.assertEqual(4, feedback_length(4, []))
+        self.assertEqual(4, feedback_length(4, ["R", "T"]))
+        self.assertEqual(5, feedback_length(4, ["I", "R"]))
+        self.assertEqual(2, feedback_length(4, ["D", "R", "D"]))
+        self.assertEqual(4, feedback_length(4, ["I", "D"]))
+        
+    def test_length_index_t0(self) -> None:
+        index = LengthIndex(self.WORDS)
+        self.assertEqual(len(self.WORDS), len(index))
+        self.assertEqual(["ate", "eat", "tea"], index.bucket(3))
+        self.assertEqual([], index.bucket(7))
+        
+    def test_length_index_t1(self) -> None:
+        index = LengthIndex(self.WORDS)
+        self.assertEqual([2, 3, 4], index.candidate_lengths(3, 1))
+        self.assertEqual([4], index.candidate_lengths(3, 1, ["I"]))
+        self.assertEqual([], index.candidate_lengths(3, 1, ["I", "I"]))
+        self.assertEqual(["seat"], index.candidates(3, 2, ["I", "R"]))
+        self.assertEqual(["at", "ate", "eat", "tea", "seat"], index.candidates(3, 1))
+        
+    def test_frozen_dictionary_t0(self) -> None:
+        dictionary = FrozenDictionary(["tea", "at", "tea", "a"])
+        self.assertEqual(("a", "at", "tea"), dictionary.words)
+        self.assertEqual(3, len(dictionary))
+        self.assertIn("at", dictionary)
+        self.assertNotIn("eat", dictionary)
+        self.assertEqual(2, dictionary.index_of["tea"])
+        self.assertEqual(["tea"], dictionary.length_index.bucket(3))
+        self.assertEqual(dictionary_hash({"a", "at", "tea"}), dictionary_hash(dictionary))
+        self.assertEqual({"a", "at", "tea"}, set(dictionary))
+        
+    def test_load_dictionary_t0(self) -> None:
+        dictionary = load_dictionary("../dat/testing.txt")
+        self.assertIs(dictionary, load_dictionary("../dat/testing.txt"))
+        self.assertEqual(["phone", "score", "shone", "stoke", "stone", "strobe"], list(dictionary))
+        
+    def test_letter_mask_t0(self) -> None:
+        self.assertEqual(0, letter_mask(""))
+        self.assertEqual(0b111, letter_mask("cabbage"[:4]))
+        self.assertEqual((1 << 25) | (1 << 31), letter_mask("z!"))
+        
+    def test_compiled_dictionary_t0(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            compiled_path = compile_dictionary("../dat/testing.txt", os.path.join(directory, "testing.dict"))
+            self.assertTrue(is_compiled_dictionary(compiled_path))
+            self.assertFalse(is_compiled_dictionary("../dat/testing.txt"))
+            compiled = load_compiled_dictionary(compiled_path)
+            text = load_dictionary("../dat/testing.txt")
+            self.assertEqual(list(text), list(compiled))
+            self.assertEqual(text.content_hash, compiled.content_hash)
+            self.assertEqual(text.lengths.tolist(), compiled.lengths.tolist())
+            self.assertEqual(text.letter_masks.tolist(), compiled.letter_masks.tolist())
+            self.assertEqual(text.length_index.bucket(5), compiled.length_index.bucket(5))
+            self.assertEqual(2, compiled.position("shone"))
+            self.assertIn("strobe", compiled)
+            self.assertNotIn("strobes", compiled)
+            self.assertEqual("strobe", compiled.words[-1])
+            self.assertIsInstance(load_dictionary(compiled_path).words, MappedWords)
+            # Compiled dictionaries build their LengthIndex lazily, unless warmed
+            warmed = load_compiled_dictionary(compiled_path)
+            self.assertIsNone(warmed._length_index)
+            warmed.warm()
+            self.assertIsNotNone(warmed._length_index)
+            self.assertEqual(text.length_index.bucket(5), warmed.length_index.bucket(5))
+            self.assertEqual(dictionary_hash(list(text)), warmed.content_hash)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,412 @@
+from edit_dist_utils import *
+from distle_dictionary import FrozenDictionary, dictionary_hash, load_dictionary
+from distle_partition import score_bucket_sizes
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import random
+import shutil
+'''
+Pairwise edit distance matrices over small dictionaries, with which every
+DistlePlayer feedback filter becomes a row lookup. Entry (i, j) of a dictionary's
+matrix is the edit distance between its i-th and j-th (sorted) words, as uint8,
+so dictionary6's ~27k words take ~740 MB on disk, memory-mapped rather than read.
+
+Matrices are built offline (python distle_distance_matrix.py ../dat/dictionary6.txt)
+in shards of rows computed by worker processes; every finished shard is saved,
+so an interrupted build resumes where it stopped. The result is written next to
+the dictionary (e.g., dictionary6.dist.npy), with a small header file
+(dictionary6.dist.json) recording the hash of the dictionary it was built for.
+'''
+
+# Suffixes replacing a dictionary file's extension to name its matrix, the
+# matrix's header and the directory of its build's checkpointed shards
+MATRIX_SUFFIX: str = ".dist.npy"
+MATRIX_HEADER_SUFFIX: str = ".dist.json"
+SHARD_DIR_SUFFIX: str = ".dist.shards"
+
+# Number of matrix rows computed and checkpointed per shard
+DEFAULT_SHARD_ROWS: int = 512
+
+# Distances stored as uint8 are capped here
+MATRIX_MAX_DISTANCE: int = 255
+
+# Directory searched for matrices by find_distance_matrix
+DEFAULT_MATRIX_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dat")
+
+class DistanceMatrix:
+    '''
+    Pairwise edit distances between a sequence of words, either a whole
+    dictionary's (memory-mapped from its built matrix) or only a few surviving
+    candidates' (computed on the spot by of_words).
+    '''
+
+    def __init__(self, words: Sequence[str], distances: np.ndarray, index_of: Optional[Callable[[str], Optional[int]]] = None) -> None:
+        '''
+        Constructs a new DistanceMatrix.
+
+        Parameters:
+            words (Sequence[str]):
+                The words along both axes of the matrix
+            distances (np.ndarray):
+                The (len(words), len(words)) matrix of their edit distances
+            index_of (Optional[Callable[[str], Optional[int]]]):
+                Looks up a word's position in words (None if absent); a dict is
+                built for it if None
+        '''
+        self.words: Sequence[str] = words
+        self.distances: np.ndarray = distances
+        if index_of is None:
+            index_of = {word: index for index, word in enumerate(words)}.get
+        self._index_of: Callable[[str], Optional[int]] = index_of
+
+    @staticmethod
+    def of_words(words: Sequence[str]) -> "DistanceMatrix":
+        '''
+        Computes the DistanceMatrix of the given words, with the distances of every
+        pair above the diagonal computed in one edit_distance_pairs batch.
+
+        Parameters:
+            words (Sequence[str]):
+                The words, few enough for len(words) ** 2 distances to be cheap
+
+        Returns:
+            DistanceMatrix:
+                Their matrix
+        '''
+        rows, cols = np.triu_indices(len(words), 1)
+        distances = np.zeros((len(words), len(words)), dtype=np.uint8)
+        upper = np.minimum(edit_distance_pairs([words[row] for row in rows.tolist()], [words[col] for col in cols.tolist()]), MATRIX_MAX_DISTANCE)
+        distances[rows, cols] = upper
+        distances[cols, rows] = upper
+        return DistanceMatrix(words, distances)
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of words along each axis of the matrix.
+
+        Returns:
+            int:
+                The number of words
+        '''
+        return len(self.words)
+
+    def index(self, word: str) -> Optional[int]:
+        '''
+        Returns the row (and column) of the given word.
+
+        Parameters:
+            word (str):
+                The word to look up
+
+        Returns:
+            Optional[int]:
+                The word's row, or None if it is not in the matrix
+        '''
+        return self._index_of(word)
+
+    def at_distance(self, word: str, edit_dist: int, indices: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        '''
+        Returns the rows of the words at the given edit distance from the given word.
+
+        Parameters:
+            word (str):
+                The word to measure distances from
+            edit_dist (int):
+                The edit distance of the words requested
+            indices (Optional[np.ndarray]):
+                The rows to choose among; all of them if None
+
+        Returns:
+            Optional[np.ndarray]:
+                The rows of the words at that distance, or None if the word is
+                not in the matrix
+        '''
+        row = self.index(word)
+        if row is None:
+            return None
+        if indices is None:
+            return np.flatnonzero(self.distances[row] == edit_dist)
+        rows: np.ndarray = indices[self.distances[row, indices] == edit_dist]
+        return rows
+
+    def shortlist(self, indices: np.ndarray, size: int, metric: str, sample: int, rng: Optional[random.Random] = None) -> list[str]:
+        '''
+        Returns the given number of guesses (among the words at the given rows)
+        that best partition those words by edit distance alone. This is a coarser
+        split than the full feedback's, but a matrix lookup, so many more guesses
+        can be scored against every candidate than choose_guess could afford.
+
+        Parameters:
+            indices (np.ndarray):
+                The rows of the candidates, which the guesses are drawn from
+            size (int):
+                The number of guesses to return
+            metric (str):
+                One of SCORING_METRICS
+            sample (int):
+                Maximum number of guesses to score
+            rng (Optional[random.Random]):
+                Source of randomness for sampling the guesses; the random module if None
+
+        Returns:
+            list[str]:
+                The best-scoring guesses, best first
+        '''
+        sampler = random if rng is None else rng
+        guesses = indices if len(indices) <= sample else np.array(sampler.sample(list(indices), sample))
+        scored: list[tuple[float, int]] = []
+        for guess in guesses:
+            counts = np.bincount(self.distances[guess, indices])
+            scored.append((score_bucket_sizes(counts[counts > 0].tolist(), metric), int(guess)))
+        scored.sort()
+        return [self.words[guess] for _, guess in scored[:size]]
+
+def distance_rows(words: Sequence[str], start: int, end: int) -> np.ndarray:
+    '''
+    Returns rows start..end (exclusive) of the distance matrix of the given words.
+
+    Parameters:
+        words (Sequence[str]):
+            The words along both axes of the matrix
+        start (int):
+            The first row to compute
+        end (int):
+            One past the last row to compute
+
+    Returns:
+        np.ndarray:
+            The (end - start, len(words)) uint8 rows, capped at MATRIX_MAX_DISTANCE
+    '''
+    rows = np.zeros((end - start, len(words)), dtype=np.uint8)
+    for row in range(start, end):
+        rows[row - start] = np.minimum(edit_distances(words[row], words), MATRIX_MAX_DISTANCE)
+    return rows
+
+def matrix_path_for(dictionary_path: str) -> str:
+    '''
+    Returns the path of the distance matrix belonging to the given dictionary file.
+
+    Parameters:
+        dictionary_path (str):
+            Path to a dictionary file
+
+    Returns:
+        str:
+            Path of the dictionary's matrix
+    '''
+    return os.path.splitext(dictionary_path)[0] + MATRIX_SUFFIX
+
+def _header_path(matrix_path: str) -> str:
+    '''
+    Returns the path of the header of the given matrix file.
+
+    Parameters:
+        matrix_path (str):
+            Path of a matrix file
+
+    Returns:
+        str:
+            Path of its header file
+    '''
+    return matrix_path[:-len(MATRIX_SUFFIX)] + MATRIX_HEADER_SUFFIX
+
+def _shard_path(shard_dir: str, start: int) -> str:
+    '''
+    Returns the path of the checkpointed shard starting at the given row.
+
+    Parameters:
+        shard_dir (str):
+            Directory of the build's shards
+        start (int):
+            The shard's first row
+
+    Returns:
+        str:
+            Path of the shard file
+    '''
+    return os.path.join(shard_dir, format(start, "09d") + ".npy")
+
+# The dictionary words every shard-building worker process computes rows of
+_worker_words: Sequence[str] = []
+
+def _init_worker(words: Sequence[str]) -> None:
+    '''
+    Process-pool initializer storing the dictionary's words in the worker.
+
+    Parameters:
+        words (Sequence[str]):
+            The dictionary's sorted words
+    '''
+    global _worker_words
+    _worker_words = words
+
+def _build_shard(task: tuple[str, int, int]) -> int:
+    '''
+    Computes one shard of matrix rows in a worker, and checkpoints it atomically
+    (written under a temporary name, then renamed), so a shard file is either
+    complete or absent.
+
+    Parameters:
+        task (tuple[str, int, int]):
+            The shard directory, and the first and one past the last row
+
+    Returns:
+        int:
+            The number of rows computed
+    '''
+    shard_dir, start, end = task
+    path = _shard_path(shard_dir, start)
+    with open(path + ".tmp", "wb") as file:
+        np.save(file, distance_rows(_worker_words, start, end))
+    os.replace(path + ".tmp", path)
+    return end - start
+
+def _read_shard_header(header_path: str) -> Optional[dict[str, Any]]:
+    '''
+    Returns the header of an interrupted build's shard directory.
+
+    Parameters:
+        header_path (str):
+            Path of the header, in the shard directory
+
+    Returns:
+        Optional[dict[str, Any]]:
+            The header, or None if it is missing or not valid JSON
+    '''
+    if not os.path.isfile(header_path):
+        return None
+    try:
+        with open(header_path, "r") as file:
+            header: dict[str, Any] = json.load(file)
+        return header
+    except json.JSONDecodeError:
+        return None
+
+def build_distance_matrix(dictionary_path: str, shard_rows: int = DEFAULT_SHARD_ROWS, n_workers: Optional[int] = None,
+                          progress: Optional[Callable[[int, int], None]] = None) -> str:
+    '''
+    Builds the distance matrix of the given dictionary and saves it next to it,
+    resuming from the shards checkpointed by an earlier, interrupted build of
+    the same dictionary (a build for different words is discarded).
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file, of either format
+        shard_rows (int):
+            The number of rows per checkpointed shard
+        n_workers (Optional[int]):
+            The number of worker processes; one per CPU if None
+        progress (Optional[Callable[[int, int], None]]):
+            Called with (rows done, total rows) as shards complete
+
+    Returns:
+        str:
+            Path of the saved matrix
+    '''
+    if shard_rows < 1:
+        raise ValueError("[X] Shard rows must be positive, but was " + str(shard_rows))
+    dictionary = load_dictionary(dictionary_path)
+    words, words_hash = dictionary.words, dictionary_hash(dictionary)
+    path = matrix_path_for(dictionary_path)
+    shard_dir = os.path.splitext(dictionary_path)[0] + SHARD_DIR_SUFFIX
+    header = {"hash": words_hash, "size": len(words), "shard_rows": shard_rows}
+
+    # Shards are stale unless their directory's header is complete and matches;
+    # a header missing (e.g., a crash before it was written) or truncated too
+    header_path = os.path.join(shard_dir, "header.json")
+    if os.path.isdir(shard_dir) and _read_shard_header(header_path) != header:
+        shutil.rmtree(shard_dir)
+    if not os.path.isdir(shard_dir):
+        os.makedirs(shard_dir)
+        with open(header_path + ".tmp", "w") as file:
+            json.dump(header, file)
+        os.replace(header_path + ".tmp", header_path)
+
+    starts = range(0, len(words), shard_rows)
+    tasks = [(shard_dir, start, min(start + shard_rows, len(words))) for start in starts
+             if not os.path.exists(_shard_path(shard_dir, start))]
+    done = len(words) - sum(end - start for _, start, end in tasks)
+    if tasks:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with context.Pool(n_workers, _init_worker, (list(words),)) as pool:
+            for rows in pool.imap_unordered(_build_shard, tasks):
+                done += rows
+                if progress is not None:
+                    progress(done, len(words))
+
+    matrix = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=np.uint8, shape=(len(words), len(words)))
+    for start in starts:
+        shard = np.load(_shard_path(shard_dir, start))
+        matrix[start:start + len(shard)] = shard
+    matrix.flush()
+    del matrix
+    os.replace(path + ".tmp", path)
+    with open(_header_path(path), "w") as file:
+        json.dump({"hash": words_hash, "size": len(words)}, file)
+    shutil.rmtree(shard_dir)
+    return path
+
+_matrices_by_hash: dict[str, Optional[np.ndarray]] = {}
+
+def find_distance_matrix(words_hash: str, directory: str = DEFAULT_MATRIX_DIR) -> Optional[np.ndarray]:
+    '''
+    Returns the distance matrix saved in the given directory for the dictionary
+    with the given hash, if any, memory-mapped read-only; matrices are only
+    looked up once per process.
+
+    Parameters:
+        words_hash (str):
+            The dictionary_hash of the dictionary being played
+        directory (str):
+            Directory containing matrix files
+
+    Returns:
+        Optional[np.ndarray]:
+            The matching matrix, or None if there is none
+    '''
+    if words_hash not in _matrices_by_hash:
+        _matrices_by_hash[words_hash] = None
+        for header_path in sorted(glob.glob(os.path.join(directory, "*" + MATRIX_HEADER_SUFFIX))):
+            with open(header_path, "r") as file:
+                header: dict[str, Any] = json.load(file)
+            matrix_path = header_path[:-len(MATRIX_HEADER_SUFFIX)] + MATRIX_SUFFIX
+            if header["hash"] == words_hash and os.path.exists(matrix_path):
+                _matrices_by_hash[words_hash] = np.load(matrix_path, mmap_mode="r")
+                break
+    return _matrices_by_hash.get(words_hash)
+
+def find_dictionary_matrix(dictionary: AbstractSet[str], directory: str = DEFAULT_MATRIX_DIR) -> Optional[DistanceMatrix]:
+    '''
+    Returns the DistanceMatrix of the given dictionary, if one was built.
+
+    Parameters:
+        dictionary (AbstractSet[str]):
+            The dictionary; only a FrozenDictionary can have a matrix
+        directory (str):
+            Directory containing matrix files
+
+    Returns:
+        Optional[DistanceMatrix]:
+            The dictionary's matrix, or None if there is none
+    '''
+    if not isinstance(dictionary, FrozenDictionary):
+        return None
+    distances = find_distance_matrix(dictionary_hash(dictionary), directory)
+    if distances is None:
+        return None
+    return DistanceMatrix(dictionary.words, distances, dictionary.position)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Builds the pairwise distance matrices of Distle dictionaries")
+    parser.add_argument("dictionaries", nargs = "+", help = "dictionary files to build matrices for")
+    parser.add_argument("--shard-rows", type = int, default = DEFAULT_SHARD_ROWS)
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args()
+
+    for dictionary_file in args.dictionaries:
+        report: Callable[[int, int], None] = lambda done, total: print("\r[!] " + str(done) + " / " + str(total) + " rows", end = "", flush = True)
+        print("\n[!] Built " + build_distance_matrix(dictionary_file, args.shard_rows, args.workers, report))
@@ -0,0 +1,84 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_distance_matrix import *
+from distle_player import DistlePlayer
+
+class DistleDistanceMatrixTests(unittest.TestCase):
+    """
+    Unit tests for validating the building, resuming and lookup of distance matrices.
+    """
+    
+    WORDS: list[str] = ["stone", "stoke", "shone", "phone", "score", "strobe", "tone", "atone", "notes", "onset"]
+    
+    def write_dictionary(self, directory: str) -> str:
+        path = os.path.join(directory, "words.txt")
+        with open(path, "w") as file:
+            file.write("\n".join(self.WORDS))
+        return path
+    
+    def test_of_words_t0(self) -> None:
+        matrix = DistanceMatrix.of_words(self.WORDS)
+        for i, first in enumerate(self.WORDS):
+            for j, second in enumerate(self.WORDS):
+                self.assertEqual(edit_distance(first, second), matrix.distances[i, j])
+        at_one = matrix.at_distance("stone", 1)
+        assert at_one is not None
+        self.assertEqual({"stoke", "shone", "atone", "tone"}, {matrix.words[row] for row in at_one})
+        self.assertIsNone(matrix.at_distance("nope", 1))
+        self.assertEqual(2, len(matrix.shortlist(np.arange(len(matrix)), 2, "expected_size", 4)))
+    
+    def test_build_distance_matrix_t0(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            dictionary_path = self.write_dictionary(directory)
+            # An interrupted build: one shard checkpointed, the rest to resume
+            shard_dir = os.path.splitext(dictionary_path)[0] + SHARD_DIR_SUFFIX
+            os.makedirs(shard_dir)
+            dictionary = load_dictionary(dictionary_path)
+            with open(os.path.join(shard_dir, "header.json"), "w") as file:
+                json.dump({"hash": dictionary_hash(dictionary), "size": len(dictionary), "shard_rows": 3}, file)
+            np.save(os.path.join(shard_dir, format(0, "09d") + ".npy"), distance_rows(dictionary.words, 0, 3))
+            progress: list[int] = []
+            path = build_distance_matrix(dictionary_path, shard_rows = 3, n_workers = 1,
+                                         progress = lambda done, total: progress.append(done))
+            self.assertEqual([6, 9, 10], sorted(progress))
+            self.assertFalse(os.path.exists(shard_dir))
+            
+            found = find_dictionary_matrix(dictionary, directory)
+            assert found is not None
+            self.assertTrue(np.array_equal(DistanceMatrix.of_words(dictionary.words).distances, found.distances))
+            self.assertEqual(path, matrix_path_for(dictionary_path))
+            
+            # Shard directories without a complete header are stale, and rebuilt
+            for header_text in (None, '{"hash": '):
+                os.makedirs(shard_dir)
+                if header_text is not None:
+                    with open(os.path.join(shard_dir, "header.json"), "w") as file:
+                        file.write(header_text)
+                np.save(os.path.join(shard_dir, format(0, "09d") + ".npy"), np.zeros((3, len(dictionary)), dtype = np.uint8))
+                progress.clear()
+                build_distance_matrix(dictionary_path, shard_rows = 3, n_workers = 1,
+                                      progress = lambda done, total: progress.append(done))
+                self.assertEqual(10, max(progress))
+                self.assertEqual(4, len(progress))
+                self.assertFalse(os.path.exists(shard_dir))
+                self.assertTrue(np.array_equal(DistanceMatrix.of_words(dictionary.words).distances,
+                                               np.load(path, mmap_mode = "r")))
+    
+    def test_player_distance_matrix_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        player = DistlePlayer(use_distance_matrix = True)
+        for secret in ["stone", "phone", "grouch"]:
+            player.start_new_game(dictionary, 10)
+            for _ in range(10):
+                guess = player.make_guess()
+                distance, encoded = feedback_signature(guess, secret)
+                if distance == 0:
+                    break
+                player.get_feedback(guess, distance, list(encoded))
+                self.assertIn(secret, player.possible_words)
+            self.assertEqual(secret, guess)
+        
+if __name__ == '__main__':
+    unittest.main()
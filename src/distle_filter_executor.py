@@ -0,0 +1,382 @@
+from edit_dist_utils import *
+from distle_dictionary import FrozenDictionary, dictionary_hash
+import atexit
+import concurrent.futures
+import itertools
+import multiprocessing
+import multiprocessing.pool
+import os
+'''
+Executors for the candidate filter of DistlePlayer.get_feedback, i.e., keeping
+the candidates that produce the same feedback as the secret. The first filter of
+every game scans a whole length bucket of the dictionary and dominates the
+player's CPU time, so it can be split into chunks filtered in parallel:
+    - FilterExecutor: serial, in the calling thread
+    - ThreadFilterExecutor: on a thread pool, which only pays off with kernels
+      releasing the GIL (NumPy's, mostly) or on free-threaded Pythons
+    - ProcessFilterExecutor: on a process pool sharing the dictionary, to which
+      only the chunks' word positions are sent, and masks of their survivors returned
+Executors filter into bool masks aligned with the candidates, which players
+holding a CandidateSet intersect with it directly.
+Players only hand an executor candidate sets of at least PARALLEL_FILTER_THRESHOLD
+words, filtering smaller ones serially, where splitting would cost more than it saves.
+Unless given one, players opting into auto_parallel use the one shared_filter_executor
+of their dictionary.
+'''
+
+# Candidate counts at or above which filter_mask computes all distances with
+# one batched NumPy call rather than one bit-parallel call per candidate
+BATCH_DISTANCE_THRESHOLD: int = 256
+
+# Candidate counts at or above which a DistlePlayer hands its filtering to its
+# FilterExecutor, if it has one
+PARALLEL_FILTER_THRESHOLD: int = 2048
+
+# Number of chunks per worker the candidates are split into, so that workers
+# finishing early pick up the slack of slower ones
+CHUNKS_PER_WORKER: int = 2
+
+# Names of the executors make_filter_executor builds
+FILTER_BACKENDS: tuple[str, ...] = ("serial", "thread", "process")
+
+def filter_mask(guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+                at_distance: bool = False) -> np.ndarray:
+    '''
+    Returns which of the candidates would give the guess the given feedback if
+    they were the secret.
+
+    Parameters:
+        guess (str):
+            The guess that received the feedback
+        edit_dist (int):
+            The edit distance between the guess and the secret word
+        transforms (list[str]):
+            The top-down transforms turning the guess into the secret word
+        candidates (Sequence[str]):
+            The words to filter
+        at_distance (bool):
+            Whether the candidates are known to be at edit_dist from the guess
+            already (e.g., from a BK-tree), so that only transforms are checked
+
+    Returns:
+        np.ndarray:
+            bool array of whether each candidate is consistent with the feedback
+    '''
+    n_candidates = len(candidates)
+    if n_candidates >= BATCH_DISTANCE_THRESHOLD:
+        matches: np.ndarray = feedback_matches([guess] * n_candidates, candidates, [edit_dist] * n_candidates,
+                                               [encode_transforms(transforms)] * n_candidates)
+        return matches
+    near: Iterable[bool]
+    if at_distance:
+        near = itertools.repeat(True)
+    elif len(guess) > WORD_BITS:
+        # Past a machine word, the bit-parallel kernel falls back to whole
+        # tables, while the banded check gives up after a few cells
+        near = (edit_distance_within(guess, word, edit_dist) == edit_dist for word in candidates)
+    else:
+        guess_masks: dict[str, int] = get_match_masks(guess)
+        near = (bit_parallel_edit_distance(guess, word, guess_masks) == edit_dist for word in candidates)
+    return np.fromiter((is_near and matches_feedback(guess, word, edit_dist, transforms) for word, is_near in zip(candidates, near)),
+                       dtype = np.bool_, count = n_candidates)
+
+def filter_candidates(guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+                      at_distance: bool = False) -> list[str]:
+    '''
+    Returns the candidates that would give the guess the given feedback if they
+    were the secret; see filter_mask.
+
+    Parameters:
+        guess (str):
+            The guess that received the feedback
+        edit_dist (int):
+            The edit distance between the guess and the secret word
+        transforms (list[str]):
+            The top-down transforms turning the guess into the secret word
+        candidates (Sequence[str]):
+            The words to filter
+        at_distance (bool):
+            Whether the candidates are known to be at edit_dist from the guess already
+
+    Returns:
+        list[str]:
+            The candidates consistent with the feedback, in order
+    '''
+    return [word for word, match in zip(candidates, filter_mask(guess, edit_dist, transforms, candidates, at_distance).tolist()) if match]
+
+def split_chunks(items: Sequence[Any], n_chunks: int) -> list[Sequence[Any]]:
+    '''
+    Splits the given items into at most n_chunks contiguous chunks of near-equal
+    sizes.
+
+    Parameters:
+        items (Sequence[Any]):
+            The items to split
+        n_chunks (int):
+            The maximum number of chunks
+
+    Returns:
+        list[Sequence[Any]]:
+            The non-empty chunks, in order
+    '''
+    n_chunks = max(1, min(n_chunks, len(items)))
+    bounds = [len(items) * chunk // n_chunks for chunk in range(n_chunks + 1)]
+    return [items[start:end] for start, end in zip(bounds, bounds[1:])]
+
+class FilterExecutor:
+    '''
+    Serial executor of the candidate filter, and the interface of the parallel
+    ones, which override filter_mask. Use as a context manager, or call close
+    when done.
+    '''
+
+    def filter_mask(self, guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+                    at_distance: bool = False, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+        Returns which candidates are consistent with the feedback; see the
+        module-level filter_mask.
+
+        Parameters:
+            guess (str):
+                The guess that received the feedback
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+            candidates (Sequence[str]):
+                The words to filter
+            at_distance (bool):
+                Whether the candidates are known to be at edit_dist from the guess
+                already, so that only transforms are checked
+            positions (Optional[np.ndarray]):
+                The positions of the candidates in the dictionary, if known, which
+                spares executors sharing the dictionary from looking them up
+
+        Returns:
+            np.ndarray:
+                bool array of whether each candidate is consistent with the feedback
+        '''
+        return filter_mask(guess, edit_dist, transforms, candidates, at_distance)
+
+    def filter(self, guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+               at_distance: bool = False) -> list[str]:
+        '''
+        Returns the candidates consistent with the feedback; see filter_mask.
+
+        Parameters:
+            guess (str):
+                The guess that received the feedback
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+            candidates (Sequence[str]):
+                The words to filter
+            at_distance (bool):
+                Whether the candidates are known to be at edit_dist from the guess already
+
+        Returns:
+            list[str]:
+                The candidates consistent with the feedback, in order
+        '''
+        matches = self.filter_mask(guess, edit_dist, transforms, candidates, at_distance)
+        return [word for word, match in zip(candidates, matches.tolist()) if match]
+
+    def close(self) -> None:
+        '''
+        Shuts down the executor's workers, if any.
+        '''
+        return
+
+    def __enter__(self) -> "FilterExecutor":
+        '''
+        Returns this executor, for use as a context manager.
+
+        Returns:
+            FilterExecutor:
+                This executor
+        '''
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        '''
+        Closes this executor on leaving its context.
+        '''
+        self.close()
+
+class ThreadFilterExecutor(FilterExecutor):
+    '''
+    FilterExecutor filtering chunks of the candidates on a pool of threads.
+    '''
+
+    def __init__(self, n_workers: Optional[int] = None) -> None:
+        '''
+        Constructs a new ThreadFilterExecutor, starting its threads.
+
+        Parameters:
+            n_workers (Optional[int]):
+                The number of threads; one per CPU if None
+        '''
+        self.n_workers: int = n_workers or os.cpu_count() or 1
+        self._pool: concurrent.futures.ThreadPoolExecutor = concurrent.futures.ThreadPoolExecutor(self.n_workers)
+
+    def filter_mask(self, guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+                    at_distance: bool = False, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+        Returns which candidates are consistent with the feedback; see
+        FilterExecutor.filter_mask.
+        '''
+        chunks = split_chunks(candidates, self.n_workers * CHUNKS_PER_WORKER)
+        masks = list(self._pool.map(lambda chunk: filter_mask(guess, edit_dist, transforms, chunk, at_distance), chunks))
+        return np.concatenate(masks) if len(masks) > 0 else np.zeros(0, dtype = np.bool_)
+
+    def close(self) -> None:
+        '''
+        Shuts down the executor's threads.
+        '''
+        self._pool.shutdown()
+
+# The dictionary words every filtering worker process was started with
+_worker_words: Sequence[str] = []
+
+def _init_worker(words: Sequence[str]) -> None:
+    '''
+    Process-pool initializer storing the dictionary's words in the worker.
+
+    Parameters:
+        words (Sequence[str]):
+            The dictionary's sorted words
+    '''
+    global _worker_words
+    _worker_words = words
+
+def _filter_chunk(task: tuple[str, int, list[str], np.ndarray, bool]) -> np.ndarray:
+    '''
+    Filters one chunk of candidates in a worker.
+
+    Parameters:
+        task (tuple[str, int, list[str], np.ndarray, bool]):
+            The (guess, edit distance, transforms) of the feedback, the positions
+            of the chunk's candidates in the dictionary, and whether they are
+            known to be at the edit distance already
+
+    Returns:
+        np.ndarray:
+            bool array of whether each of the chunk's candidates is consistent
+            with the feedback
+    '''
+    guess, edit_dist, transforms, positions, at_distance = task
+    chunk = [_worker_words[position] for position in positions.tolist()]
+    return filter_mask(guess, edit_dist, transforms, chunk, at_distance)
+
+class ProcessFilterExecutor(FilterExecutor):
+    '''
+    FilterExecutor filtering chunks of the candidates on a pool of processes,
+    started with the dictionary's words (copy-on-write through fork, where
+    available), so each chunk is sent as the positions of its words.
+    '''
+
+    def __init__(self, dictionary: FrozenDictionary, n_workers: Optional[int] = None) -> None:
+        '''
+        Constructs a new ProcessFilterExecutor, starting its processes.
+
+        Parameters:
+            dictionary (FrozenDictionary):
+                The dictionary the candidates are drawn from
+            n_workers (Optional[int]):
+                The number of processes; one per CPU if None
+        '''
+        self.dictionary: FrozenDictionary = dictionary
+        self.n_workers: int = n_workers or os.cpu_count() or 1
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        # Forked workers inherit the words as they are; others are sent a copy, as
+        # a compiled dictionary's mapped words cannot be pickled
+        words = dictionary.words if context.get_start_method() == "fork" else list(dictionary.words)
+        self._pool: Optional[multiprocessing.pool.Pool] = context.Pool(self.n_workers, _init_worker, (words,))
+
+    def filter_mask(self, guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str],
+                    at_distance: bool = False, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        '''
+        Returns which candidates are consistent with the feedback, filtering them
+        in this process instead if any is not in the dictionary; see
+        FilterExecutor.filter_mask.
+        '''
+        if positions is None:
+            index_of = self.dictionary.index_of
+            found = [index_of.get(word) for word in candidates]
+            if None in found:
+                return filter_mask(guess, edit_dist, transforms, candidates, at_distance)
+            positions = np.array(found, dtype = np.int64)
+        if self._pool is None or len(positions) == 0:
+            return filter_mask(guess, edit_dist, transforms, candidates, at_distance)
+        n_chunks = max(1, min(self.n_workers * CHUNKS_PER_WORKER, len(positions)))
+        chunks = np.array_split(positions, n_chunks)
+        masks = self._pool.map(_filter_chunk, [(guess, edit_dist, transforms, chunk, at_distance) for chunk in chunks])
+        matches: np.ndarray = np.concatenate(masks)
+        return matches
+
+    def close(self) -> None:
+        '''
+        Shuts down the executor's processes.
+        '''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+def make_filter_executor(backend: str, dictionary: Optional[FrozenDictionary] = None, n_workers: Optional[int] = None) -> FilterExecutor:
+    '''
+    Returns a new FilterExecutor of the given backend. A daemonic process (e.g.,
+    a GameShowRunner worker) cannot start processes of its own, so there the
+    process backend falls back to threads.
+
+    Parameters:
+        backend (str):
+            One of FILTER_BACKENDS
+        dictionary (Optional[FrozenDictionary]):
+            The dictionary the candidates are drawn from; needed by "process"
+        n_workers (Optional[int]):
+            The number of threads or processes; one per CPU if None
+
+    Returns:
+        FilterExecutor:
+            The new executor
+    '''
+    if backend not in FILTER_BACKENDS:
+        raise ValueError("[X] Backend must be one of " + str(FILTER_BACKENDS) + ", but was " + str(backend))
+    if backend == "process" and not multiprocessing.current_process().daemon:
+        if dictionary is None:
+            raise ValueError("[X] The process backend needs the dictionary")
+        return ProcessFilterExecutor(dictionary, n_workers)
+    if backend == "serial":
+        return FilterExecutor()
+    return ThreadFilterExecutor(n_workers)
+
+# The executor of each dictionary shared by the players of this process, keyed by
+# process id too, so that forked children never use their parent's pool
+_shared_executors: dict[tuple[int, str], FilterExecutor] = {}
+
+def shared_filter_executor(dictionary: FrozenDictionary) -> FilterExecutor:
+    '''
+    Returns the FilterExecutor shared by every player of this process filtering
+    candidates of the given dictionary, started on first use and closed at exit:
+    a process pool with one process per CPU, or the serial executor on a single
+    CPU or in a daemonic process, where a pool would only add overhead or cannot
+    be started.
+
+    Parameters:
+        dictionary (FrozenDictionary):
+            The dictionary the candidates are drawn from
+
+    Returns:
+        FilterExecutor:
+            The dictionary's shared executor
+    '''
+    key = (os.getpid(), dictionary_hash(dictionary))
+    if key not in _shared_executors:
+        parallel = (os.cpu_count() or 1) > 1 and not multiprocessing.current_process().daemon
+        executor = make_filter_executor("process" if parallel else "serial", dictionary)
+        atexit.register(executor.close)
+        _shared_executors[key] = executor
+    return _shared_executors[key]
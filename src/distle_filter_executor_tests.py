@@ -0,0 +1,95 @@
+import unittest
+import pytest
+from unittest import mock
+from distle_filter_executor import *
+from distle_dictionary import load_dictionary
+from distle_player import DistlePlayer
+
+class DistleFilterExecutorTests(unittest.TestCase):
+    """
+    Unit tests for validating that every filter backend keeps the same candidates.
+    """
+    
+    def test_split_chunks_t0(self) -> None:
+        self.assertEqual([[0], [1, 2], [3, 4]], [list(chunk) for chunk in split_chunks(range(5), 3)])
+        self.assertEqual([[0]], [list(chunk) for chunk in split_chunks([0], 4)])
+        
+    def test_filter_backends_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        guess, secret = "stone", "phones"
+        edit_dist, encoded = feedback_signature(guess, secret)
+        candidates = dictionary.length_index.candidates(len(guess), edit_dist, list(encoded))
+        expected = [word for word in candidates if feedback_signature(guess, word) == (edit_dist, encoded)]
+        self.assertIn(secret, expected)
+        self.assertEqual(expected, filter_candidates(guess, edit_dist, list(encoded), candidates))
+        for backend in FILTER_BACKENDS:
+            with make_filter_executor(backend, dictionary, 2) as executor:
+                self.assertEqual(expected, executor.filter(guess, edit_dist, list(encoded), candidates), backend)
+                # Candidates at the distance already only have their transforms checked
+                at_distance = [word for word in candidates if feedback_signature(guess, word)[0] == edit_dist]
+                self.assertEqual(expected, executor.filter(guess, edit_dist, list(encoded), at_distance, True), backend)
+                # Words outside the dictionary are filtered too
+                self.assertEqual(["phonesx"], executor.filter("phones", 1, ["I"], ["phonesx", "phone"]), backend)
+        with self.assertRaises(ValueError):
+            make_filter_executor("gpu")
+    
+    def spy_on(self, executor: FilterExecutor) -> list[tuple[int, bool]]:
+        """
+        Makes the given executor record the number of candidates and the
+        at_distance flag of each filter call, in the returned list, until the
+        end of the test.
+        """
+        calls: list[tuple[int, bool]] = []
+        original = executor.filter_mask
+        def spied(guess: str, edit_dist: int, transforms: list[str], candidates: Sequence[str], at_distance: bool = False,
+                  positions: Optional[np.ndarray] = None) -> np.ndarray:
+            calls.append((len(candidates), at_distance))
+            return original(guess, edit_dist, transforms, candidates, at_distance, positions)
+        patcher = mock.patch.object(executor, "filter_mask", spied)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return calls
+    
+    def test_player_filter_executor_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        guess, secret = "stone", "phones"
+        edit_dist, encoded = feedback_signature(guess, secret)
+        expected = set(filter_candidates(guess, edit_dist, list(encoded), list(dictionary)))
+        with make_filter_executor("process", dictionary, 2) as executor:
+            calls = self.spy_on(executor)
+            player = DistlePlayer(filter_executor = executor, parallel_threshold = 1)
+            player.start_new_game(dictionary, 10)
+            player.get_feedback(guess, edit_dist, list(encoded))
+            self.assertIn(secret, player.possible_words)
+            self.assertEqual(expected, player.possible_words)
+            # The first filter's candidates come from the prefix sweep, at the distance already
+            self.assertEqual(1, len(calls))
+            self.assertTrue(calls[0][1])
+            
+            # Small candidate sets stay serial
+            player = DistlePlayer(filter_executor = executor)
+            player.start_new_game(dictionary, 10)
+            player.get_feedback(guess, edit_dist, list(encoded))
+            self.assertEqual(1, len(calls))
+            self.assertEqual(expected, player.possible_words)
+    
+    def test_player_shared_executor_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        executor = shared_filter_executor(dictionary)
+        self.assertIs(executor, shared_filter_executor(dictionary))
+        calls = self.spy_on(executor)
+        guess, secret = "stone", "phones"
+        edit_dist, encoded = feedback_signature(guess, secret)
+        player = DistlePlayer(parallel_threshold = 1, use_prefix_sweep = False, auto_parallel = True)
+        player.start_new_game(dictionary, 10)
+        player.get_feedback(guess, edit_dist, list(encoded))
+        self.assertEqual([(len(dictionary.length_index.bucket(len(secret))), False)], calls)
+        self.assertIn(secret, player.possible_words)
+        # The shared executor is only used when opted into
+        player = DistlePlayer(parallel_threshold = 1, use_prefix_sweep = False)
+        player.start_new_game(dictionary, 10)
+        player.get_feedback(guess, edit_dist, list(encoded))
+        self.assertEqual(1, len(calls))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,12 @@
 from edit_dist_utils import *
 from distle_player import *
+from distle_bk_tree import BKTree, load_or_build_bk_tree
+from distle_dictionary import FrozenDictionary, load_dictionary
+from distle_instrumentation import GameInstrumentation, TurnRecord
 from typing import *
 import random
 import os
-import copy
+import time
 
 class DistleGame:
     '''
@@ -11,7 +14,9 @@ class DistleGame:
     for managing the input sources, either a human or AI player
     '''
 
-    def __init__(self, dictionary_path: str, verbose: bool, ai: Optional["DistlePlayer"]) -> None:
+    def __init__(self, dictionary_path: str, verbose: bool, ai: Optional["DistlePlayer"],
+                 instrumentation: Optional[GameInstrumentation] = None,
+                 feedback_cache: Optional[FeedbackCache] = None) -> None:
         '''
         Constructs a new DistleGame to play from the given dictionary.
         
@@ -25,17 +30,25 @@ class DistleGame:
             ai (Optional[DistlePlayer]):
                 Pass in a new DistlePlayer object to have it play the game; otherwise, leave as
                 None to play as a human.
+            instrumentation (Optional[GameInstrumentation]):
+                Receives per-turn timings of every game played, if given; leave as None
+                to skip all measurement
+            feedback_cache (Optional[FeedbackCache]):
+                Memo of the feedback given for each (guess, secret) pair, e.g., the
+                shared_feedback_cache also given to the DistlePlayer; None computes
+                every feedback afresh
         '''
         self._ai: Optional["DistlePlayer"] = ai
+        self._instrumentation: Optional[GameInstrumentation] = instrumentation
+        self._feedback_cache: Optional[FeedbackCache] = feedback_cache
         self._verbose: bool = verbose
         script_dir = os.path.dirname(__file__)
         file_path = os.path.join(script_dir, dictionary_path)
-        self.dictionary: set[str] = set()
-        with open(file_path, "r") as file:
-            for line in file:
-                self.dictionary.add(line.rstrip())
-        self.rand_word_list: list[str] = list(self.dictionary)
-        self.rand_word_list.sort()
+        self._dictionary_path: str = file_path
+        self._bk_tree: Optional[BKTree] = None
+        # Shared by reference with every game and player, never copied
+        self.dictionary: FrozenDictionary = load_dictionary(file_path)
+        self.rand_word_list: Sequence[str] = self.dictionary.words
     
     def new_game(self, max_guesses: int, word: Optional[str] = None, rand_ind: Optional[int] = None) -> bool:
         '''
@@ -90,6 +103,36 @@ class DistleGame:
         '''
         return len(self.dictionary)
     
+    def get_bk_tree(self) -> BKTree:
+        '''
+        Getter for the BK-tree over this game's dictionary, loaded from next to the
+        dictionary file on first use, or built and saved there if missing or stale.
+        
+        Returns:
+            BKTree:
+                The BK-tree over this game's dictionary
+        '''
+        if self._bk_tree is None:
+            self._bk_tree = load_or_build_bk_tree(self._dictionary_path, self.dictionary, dictionary_hash(self.dictionary))
+        return self._bk_tree
+    
+    def words_at_distance(self, word: str, edit_dist: int) -> list[str]:
+        '''
+        Returns every word of this game's dictionary at exactly the given edit
+        distance from the given word, found through the dictionary's BK-tree.
+        
+        Parameters:
+            word (str):
+                The word to measure distances from
+            edit_dist (int):
+                The edit distance of the words requested
+        
+        Returns:
+            list[str]:
+                The dictionary words at that edit distance from the word
+        '''
+        return self.get_bk_tree().words_at_distance(word, edit_dist)
+    
     def _end_game(self, won: bool, guess: str) -> bool:
         '''
         Reporting method largely for just keeping code DRY: reports on whether or not
@@ -105,6 +148,8 @@ class DistleGame:
             bool:
                 Whether or not the player won.
         '''
+        if not self._instrumentation is None:
+            self._instrumentation.end_game(won, self._guesses)
         if won:
             self._won_game = True
             if self._verbose:
@@ -114,6 +159,28 @@ class DistleGame:
             if self._verbose: print("[L] Your word game is weak, too bad. The correct answer:\n" + self._word)
         return won
             
+    def _record_turn(self, guess: str, turn_start: float, guess_end: float, dp_end: float) -> None:
+        '''
+        Reports the just-finished turn to this game's instrumentation; only called
+        when instrumentation is enabled. Everything after the DP up to now is
+        attributed to the player's get_feedback.
+        
+        Parameters:
+            guess (str):
+                The turn's guess
+            turn_start (float):
+                perf_counter time at which the guess was requested
+            guess_end (float):
+                perf_counter time at which the guess was received
+            dp_end (float):
+                perf_counter time at which the game finished computing the feedback
+        '''
+        assert self._instrumentation is not None
+        now = time.perf_counter()
+        remaining = None if self._ai is None else len(self._ai.possible_words)
+        self._instrumentation.record_turn(TurnRecord(0, self._guesses, guess, turn_start, guess_end - turn_start,
+                                                     dp_end - guess_end, now - dp_end, remaining))
+    
     def won_game(self) -> bool:
         '''
         Getter for whether or not the player won the game.
@@ -145,9 +212,12 @@ class DistleGame:
         self._guesses: int = 0
         self._won_game = False
         guess = ""
+        instrumentation = self._instrumentation
         
+        if not instrumentation is None:
+            instrumentation.start_game(word, max_guesses)
         if not self._ai is None:
-            self._ai.start_new_game(copy.deepcopy(self.dictionary), max_guesses)
+            self._ai.start_new_game(self.dictionary, max_guesses)
         
         if self._verbose:
             print("=================================")
@@ -157,22 +227,34 @@ class DistleGame:
         while self._guesses < self._max_guesses:
             if self._verbose: print("[G] Guess " + str(self._guesses+1) + " / " + str(self._max_guesses))
             
+            if not instrumentation is None: turn_start = time.perf_counter()
             guess = self.get_guess()
             self._guesses += 1
+            if not instrumentation is None: guess_end = dp_end = time.perf_counter()
             
             if not guess in self.dictionary:
                 if self._verbose: print("  [X] Word not in dictionary, try again (lost your turn lul)")
+                if not instrumentation is None: self._record_turn(guess, turn_start, guess_end, dp_end)
                 continue
             
-            table = get_edit_dist_table(guess, self._word)
-            distance = table[len(guess)][len(self._word)]
+            if self._feedback_cache is None:
+                table = get_edit_dist_table(guess, self._word)
+                distance = table[len(guess)][len(self._word)]
+            else:
+                distance, encoded = self._feedback_cache.feedback(guess, self._word)
             if distance == 0:
+                if not instrumentation is None: self._record_turn(guess, turn_start, guess_end, time.perf_counter())
                 return self._end_game(True, guess)
             
-            transforms = get_transformation_list_with_table(guess, self._word, table)
+            if self._feedback_cache is None:
+                transforms = get_transformation_list_with_table(guess, self._word, table)
+            else:
+                transforms = list(encoded)
+            if not instrumentation is None: dp_end = time.perf_counter()
             if not self._ai is None:
                 if self._verbose: print("  > Enter Guess Below > \n" + guess)
                 self._ai.get_feedback(guess, distance, transforms)
+            if not instrumentation is None: self._record_turn(guess, turn_start, guess_end, dp_end)
             
             if self._verbose and not self._guesses == self._max_guesses:
                 print("  [~] Not quite, here are some hints:")
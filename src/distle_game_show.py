@@ -5,9 +5,19 @@ or AI play the game of Distle with a set of configurable parameters.
 [!] Useful for debugging what's happening with particular words or to just
 have fun playing the game! It is fun. You are required to agree for the
 duration of this course.
+
+The constants below are the defaults of the command line flags, e.g.:
+    python distle_game_show.py --ai --games 20 --quiet --profile cpu
+profiles 20 games of the AI with cProfile, writing the stats to
+game_show.pstats and its collapsed stacks to game_show.folded (e.g., for
+flamegraph.pl game_show.folded > game_show.svg), while --profile mem measures
+the allocations of the AI's every start_new_game, make_guess and get_feedback.
+Either ends with a summary of the top functions or allocation sites.
 '''
 
 from distle_game import *
+from distle_profiling import CpuProfiler, MemoryProfiler
+import argparse
 
 # Number of tries the player gets to guess the secret word
 MAX_GUESSES: int = 10
@@ -32,14 +42,80 @@ AI_PLAYER: bool = False
 # The path to the dictionary file that you wish to play from
 DICTIONARY_PATH: str = "../dat/dictionary14.txt"
 
-# Main game loop begun below!
-game = DistleGame(DICTIONARY_PATH, VERBOSE, DistlePlayer() if AI_PLAYER else None)
-victories = 0
-for g in range(N_GAMES):
-    if VERBOSE:
-        print("[!] Game Starting: " + str(g+1) + " / " + str(N_GAMES))
-    victories += 1 if game.new_game(MAX_GUESSES, WORD) else 0
-
-print("=================================")
-print("= Won: " + str(victories) + " / " + str(N_GAMES))
-print("=================================")
+# Profilers that --profile may run the games under
+PROFILE_MODES: tuple[str, ...] = ("cpu", "mem")
+
+# Path prefix of the files a CPU profile is written to
+PROFILE_PREFIX: str = "game_show"
+
+# Number of functions or allocation sites a profile's summary lists
+PROFILE_TOP_N: int = 20
+
+def play_games(game: DistleGame, n_games: int, max_guesses: int, word: Optional[str], verbose: bool) -> int:
+    '''
+    Plays the given number of games, each with the given secret or a random one.
+
+    Parameters:
+        game (DistleGame):
+            The game to play
+        n_games (int):
+            The number of games
+        max_guesses (int):
+            The maximum number of guesses of each game
+        word (Optional[str]):
+            The secret word of every game, or None for random ones
+        verbose (bool):
+            Whether to announce each game
+
+    Returns:
+        int:
+            The number of games won
+    '''
+    victories = 0
+    for g in range(n_games):
+        if verbose:
+            print("[!] Game Starting: " + str(g+1) + " / " + str(n_games))
+        victories += 1 if game.new_game(max_guesses, word) else 0
+    return victories
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Plays games of Distle, by a human or the AI, optionally profiled")
+    parser.add_argument("--games", type = int, default = N_GAMES)
+    parser.add_argument("--max-guesses", type = int, default = MAX_GUESSES)
+    parser.add_argument("--word", default = WORD, help = "secret word of every game; random if not given")
+    parser.add_argument("--dictionary", default = DICTIONARY_PATH)
+    parser.add_argument("--ai", action = argparse.BooleanOptionalAction, default = AI_PLAYER,
+                        help = "whether the AI DistlePlayer plays rather than a human")
+    parser.add_argument("--quiet", action = "store_true", help = "only print the results")
+    parser.add_argument("--parallel", action = "store_true", help = "have the AI filter large candidate sets on all cores")
+    parser.add_argument("--profile", choices = PROFILE_MODES)
+    parser.add_argument("--profile-output", default = PROFILE_PREFIX, help = "path prefix of the CPU profile's files")
+    parser.add_argument("--top", type = int, default = PROFILE_TOP_N, help = "functions or sites listed by the profile's summary")
+    args = parser.parse_args()
+    verbose = VERBOSE and not args.quiet
+    if args.profile == "mem" and not args.ai:
+        parser.error("--profile mem measures the AI's methods, so needs --ai")
+
+    player = DistlePlayer(auto_parallel = args.parallel) if args.ai else None
+    memory_profiler = MemoryProfiler()
+    if args.profile == "mem":
+        memory_profiler.wrap(player)
+    # Main game loop begun below!
+    game = DistleGame(args.dictionary, verbose, player)
+    if args.profile == "cpu":
+        with CpuProfiler() as cpu_profiler:
+            victories = play_games(game, args.games, args.max_guesses, args.word, verbose)
+    elif args.profile == "mem":
+        with memory_profiler:
+            victories = play_games(game, args.games, args.max_guesses, args.word, verbose)
+    else:
+        victories = play_games(game, args.games, args.max_guesses, args.word, verbose)
+
+    print("=================================")
+    print("= Won: " + str(victories) + " / " + str(args.games))
+    print("=================================")
+    if args.profile == "cpu":
+        print(cpu_profiler.summary(args.top))
+        print("[!] Profile written to " + ", ".join(cpu_profiler.save(args.profile_output)))
+    elif args.profile == "mem":
+        print(memory_profiler.summary(args.top))
@@ -0,0 +1,155 @@
+from typing import *
+import json
+import time
+'''
+Optional per-turn instrumentation of DistleGames, for finding out where the
+time of slow game runs goes: into the player's make_guess, into the game's own
+edit distance table and transforms computation, or into the player's
+get_feedback.
+
+Pass a GameInstrumentation (e.g., a TraceRecorder) to a DistleGame to enable it;
+games without one skip every measurement.
+'''
+
+class TurnRecord(NamedTuple):
+    '''
+    Measurements of a single turn of a DistleGame, all durations in seconds.
+    '''
+    game: int
+    turn: int
+    guess: str
+    start: float
+    guess_time: float
+    dp_time: float
+    feedback_time: float
+    remaining: Optional[int]
+
+class GameInstrumentation:
+    '''
+    Interface through which a DistleGame reports on the games it plays. Every
+    method is a no-op here; subclasses override those they are interested in.
+    '''
+
+    def start_game(self, word: str, max_guesses: int) -> None:
+        '''
+        Called when a game starts, before the player is set up.
+
+        Parameters:
+            word (str):
+                The game's secret word
+            max_guesses (int):
+                The maximum number of guesses in the game
+        '''
+        return
+
+    def record_turn(self, record: TurnRecord) -> None:
+        '''
+        Called at the end of every turn of the current game.
+
+        Parameters:
+            record (TurnRecord):
+                The turn's measurements
+        '''
+        return
+
+    def end_game(self, won: bool, guesses: int) -> None:
+        '''
+        Called when the current game ends.
+
+        Parameters:
+            won (bool):
+                Whether the player won
+            guesses (int):
+                The number of guesses made
+        '''
+        return
+
+class TraceRecorder(GameInstrumentation):
+    '''
+    GameInstrumentation keeping every TurnRecord of every game, which can then be
+    aggregated or exported as JSON lines or in the Chrome trace-event format
+    (viewable in chrome://tracing or Perfetto).
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Constructs a new, empty TraceRecorder.
+        '''
+        self.turns: list[TurnRecord] = []
+        self.results: list[tuple[bool, int]] = []
+        self._origin: float = time.perf_counter()
+
+    def current_game(self) -> int:
+        '''
+        Returns the number of the game currently being recorded, counting from 0.
+
+        Returns:
+            int:
+                The game's number
+        '''
+        return len(self.results)
+
+    def end_game(self, won: bool, guesses: int) -> None:
+        '''
+        Records the result of the current game; see GameInstrumentation.end_game.
+        '''
+        self.results.append((won, guesses))
+
+    def record_turn(self, record: TurnRecord) -> None:
+        '''
+        Records a turn of the current game; see GameInstrumentation.record_turn.
+        '''
+        self.turns.append(record._replace(game = self.current_game(), start = record.start - self._origin))
+
+    def aggregate(self) -> dict[str, float]:
+        '''
+        Returns the totals and means of the recorded turns' measurements.
+
+        Returns:
+            dict[str, float]:
+                Game and turn counts, wins, and the total and mean per-turn time (in
+                seconds) spent in make_guess, the game's DP and get_feedback
+        '''
+        n_turns = max(1, len(self.turns))
+        summary: dict[str, float] = {
+            "games": len(self.results),
+            "wins": sum(1 for won, _ in self.results if won),
+            "turns": len(self.turns),
+        }
+        for field in ("guess_time", "dp_time", "feedback_time"):
+            total = sum(getattr(turn, field) for turn in self.turns)
+            summary["total_" + field] = total
+            summary["mean_" + field] = total / n_turns
+        return summary
+
+    def export_jsonl(self, path: str) -> None:
+        '''
+        Writes one JSON object per recorded turn to the given path.
+
+        Parameters:
+            path (str):
+                Destination of the JSON lines file
+        '''
+        with open(path, "w") as file:
+            for turn in self.turns:
+                file.write(json.dumps(turn._asdict()) + "\n")
+
+    def export_chrome_trace(self, path: str) -> None:
+        '''
+        Writes the recorded turns to the given path in the Chrome trace-event
+        format: each game is a thread, and each turn's make_guess, DP and
+        get_feedback phases are consecutive complete ("X") events.
+
+        Parameters:
+            path (str):
+                Destination of the trace file
+        '''
+        events: list[dict[str, Any]] = []
+        for turn in self.turns:
+            start = turn.start
+            for name, duration in (("make_guess", turn.guess_time), ("dp", turn.dp_time), ("get_feedback", turn.feedback_time)):
+                events.append({"name": name, "ph": "X", "pid": 0, "tid": turn.game, "ts": start * 1e6, "dur": duration * 1e6,
+                               "args": {"turn": turn.turn, "guess": turn.guess, "remaining": turn.remaining}})
+                start += duration
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
@@ -0,0 +1,44 @@
+import unittest
+import pytest
+import json
+import os
+import tempfile
+from distle_game import *
+from distle_instrumentation import *
+
+class DistleInstrumentationTests(unittest.TestCase):
+    """
+    Unit tests for validating the per-turn instrumentation of DistleGames.
+    """
+    
+    def test_trace_recorder_t0(self) -> None:
+        recorder = TraceRecorder()
+        game = DistleGame("../dat/testing.txt", False, DistlePlayer(), recorder)
+        self.assertTrue(game.new_game(10, "strobe"))
+        self.assertTrue(game.new_game(10, "stone"))
+        self.assertEqual(2, len(recorder.results))
+        self.assertEqual(sum(guesses for _, guesses in recorder.results), len(recorder.turns))
+        self.assertEqual([0, 1], sorted(set(turn.game for turn in recorder.turns)))
+        for turn in recorder.turns:
+            self.assertGreaterEqual(min(turn.guess_time, turn.dp_time, turn.feedback_time), 0.0)
+            self.assertIsNotNone(turn.remaining)
+        summary = recorder.aggregate()
+        self.assertEqual(2, summary["games"])
+        self.assertEqual(2, summary["wins"])
+        
+    def test_trace_export_t0(self) -> None:
+        recorder = TraceRecorder()
+        DistleGame("../dat/testing.txt", False, DistlePlayer(), recorder).new_game(10, "score")
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl_path, trace_path = os.path.join(directory, "turns.jsonl"), os.path.join(directory, "trace.json")
+            recorder.export_jsonl(jsonl_path)
+            recorder.export_chrome_trace(trace_path)
+            with open(jsonl_path) as file:
+                self.assertEqual(len(recorder.turns), len(file.readlines()))
+            with open(trace_path) as file:
+                events = json.load(file)["traceEvents"]
+            self.assertEqual(3 * len(recorder.turns), len(events))
+            self.assertEqual({"make_guess", "dp", "get_feedback"}, set(event["name"] for event in events))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+from distle_benchmarks import percentile
+from distle_dictionary import FrozenDictionary, load_dictionary
+from distle_player import *
+from distle_server import DEFAULT_PORT
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+'''
+Load generator for the Distle session server (see distle_server): opens many
+concurrent client connections, each playing games back to back through a bot,
+and reports the server's throughput and per-request latency, apart from the
+time the bots themselves spend thinking.
+
+Usage:
+    python distle_load_generator.py ../dat/dictionary6.txt [--clients 100] [--games 5] [--bot random]
+'''
+
+# Bots the load generator can play with
+BOTS: tuple[str, ...] = ("random", "player")
+
+class RandomBot:
+    '''
+    Cheap stand-in for a DistlePlayer that guesses dictionary words at random,
+    keeping the load on the server rather than on the load generator.
+    '''
+
+    def __init__(self, rng: random.Random) -> None:
+        '''
+        Constructs a new RandomBot.
+
+        Parameters:
+            rng (random.Random):
+                Source of the bot's guesses
+        '''
+        self.rng: random.Random = rng
+        self.words: Sequence[str] = []
+
+    def start_new_game(self, dictionary: AbstractSet[str], max_guesses: int) -> None:
+        '''
+        Starts a new game; see DistlePlayer.start_new_game.
+        '''
+        self.words = dictionary.words if isinstance(dictionary, FrozenDictionary) else sorted(dictionary)
+
+    def make_guess(self) -> str:
+        '''
+        Returns a random dictionary word; see DistlePlayer.make_guess.
+        '''
+        return self.rng.choice(self.words)
+
+    def get_feedback(self, guess: str, edit_dist: int, transforms: list[str]) -> None:
+        '''
+        Ignores the feedback; see DistlePlayer.get_feedback.
+        '''
+        return
+
+async def _request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: dict[str, Any],
+                   latencies: list[float]) -> dict[str, Any]:
+    '''
+    Sends one request to the server and waits for its response, recording the
+    round trip's latency.
+
+    Parameters:
+        reader (asyncio.StreamReader):
+            The server's responses
+        writer (asyncio.StreamWriter):
+            Where the requests are written
+        request (dict[str, Any]):
+            The JSON request
+        latencies (list[float]):
+            Round trip times, in seconds, appended to
+
+    Returns:
+        dict[str, Any]:
+            The JSON response
+    '''
+    start = time.perf_counter()
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    response: dict[str, Any] = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - start)
+    if not response.get("ok"):
+        raise ValueError("[X] Server refused " + json.dumps(request) + ": " + str(response.get("error")))
+    return response
+
+async def _think(bot: Union["DistlePlayer", RandomBot], think_times: list[float], method: Callable[..., Any], *args: Any) -> Any:
+    '''
+    Calls one of the bot's methods, recording how long the bot thought. A
+    DistlePlayer's calls run in the event loop's default executor, as filtering
+    its candidates would otherwise stall every other client's pending responses
+    and count towards their latencies; a RandomBot's are too cheap to bother.
+
+    Parameters:
+        bot (Union[DistlePlayer, RandomBot]):
+            The bot whose method is called
+        think_times (list[float]):
+            Durations of the bots' calls, in seconds, appended to
+        method (Callable[..., Any]):
+            The bound method of the bot to call
+        args (Any):
+            The method's arguments
+
+    Returns:
+        Any:
+            The method's result
+    '''
+    start = time.perf_counter()
+    if isinstance(bot, RandomBot):
+        result = method(*args)
+    else:
+        result = await asyncio.get_running_loop().run_in_executor(None, method, *args)
+    think_times.append(time.perf_counter() - start)
+    return result
+
+async def run_client(dictionary: FrozenDictionary, dictionary_name: str, bot: Union["DistlePlayer", RandomBot], n_games: int,
+                     max_guesses: int, latencies: list[float], think_times: list[float], host: str = "127.0.0.1",
+                     port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> list[bool]:
+    '''
+    Connects to the server and plays the given number of games through the bot.
+
+    Parameters:
+        dictionary (FrozenDictionary):
+            The dictionary the server's sessions are played on
+        dictionary_name (str):
+            The name the server knows the dictionary by
+        bot (Union[DistlePlayer, RandomBot]):
+            Makes the client's guesses
+        n_games (int):
+            The number of games to play, one after the other
+        max_guesses (int):
+            The maximum number of guesses per game
+        latencies (list[float]):
+            Round trip times of every request, in seconds, appended to
+        think_times (list[float]):
+            Durations of the bot's calls, in seconds, appended to
+        host, port, unix_path:
+            Where the server listens; see DistleServer.serve
+
+    Returns:
+        list[bool]:
+            Whether the bot won each game
+    '''
+    if unix_path is not None:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    results: list[bool] = []
+    try:
+        for _ in range(n_games):
+            session = await _request(reader, writer, {"op": "new", "dictionary": dictionary_name, "max_guesses": max_guesses}, latencies)
+            await _think(bot, think_times, bot.start_new_game, dictionary, max_guesses)
+            while True:
+                guess = await _think(bot, think_times, bot.make_guess)
+                response = await _request(reader, writer, {"op": "guess", "session": session["session"], "guess": guess}, latencies)
+                if response["over"]:
+                    results.append(response["won"])
+                    break
+                if response["valid"]:
+                    await _think(bot, think_times, bot.get_feedback, guess, response["distance"], response["transforms"])
+            await _request(reader, writer, {"op": "close", "session": session["session"]}, latencies)
+    finally:
+        writer.close()
+    return results
+
+async def generate_load(dictionary_path: str, n_clients: int, games_per_client: int, bot: str = "random",
+                        max_guesses: int = 10, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                        unix_path: Optional[str] = None, seed: int = 0) -> dict[str, float]:
+    '''
+    Runs the given number of concurrent clients against the server, and reports
+    on their games and on the server's responsiveness.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary, which the server must host too
+        n_clients (int):
+            The number of concurrent client connections
+        games_per_client (int):
+            The number of games each client plays
+        bot (str):
+            One of BOTS: "random" guesses, or a DistlePlayer per client
+        max_guesses (int):
+            The maximum number of guesses per game
+        host, port, unix_path:
+            Where the server listens; see DistleServer.serve
+        seed (int):
+            Seed of the random bots
+
+    Returns:
+        dict[str, float]:
+            The games played and won, requests made, elapsed seconds, requests per
+            second, p50 / p99 request latency in milliseconds, and the bots' own
+            p50 / p99 think time per call in milliseconds, kept out of the latencies
+    '''
+    if bot not in BOTS:
+        raise ValueError("[X] Bot must be one of " + str(BOTS) + ", but was " + str(bot))
+    dictionary = load_dictionary(dictionary_path)
+    name = os.path.splitext(os.path.basename(dictionary_path))[0]
+    latencies: list[float] = []
+    think_times: list[float] = []
+    bots = [RandomBot(random.Random(seed + client)) if bot == "random" else DistlePlayer() for client in range(n_clients)]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client(dictionary, name, client_bot, games_per_client, max_guesses, latencies,
+                                                think_times, host, port, unix_path) for client_bot in bots))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    think_times.sort()
+    return {
+        "games": sum(len(games) for games in results),
+        "wins": sum(sum(games) for games in results),
+        "requests": len(latencies),
+        "elapsed_s": elapsed,
+        "requests_per_sec": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": 1000 * percentile(latencies, 0.50) if latencies else 0.0,
+        "p99_ms": 1000 * percentile(latencies, 0.99) if latencies else 0.0,
+        "think_p50_ms": 1000 * percentile(think_times, 0.50) if think_times else 0.0,
+        "think_p99_ms": 1000 * percentile(think_times, 0.99) if think_times else 0.0,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Generates load against a Distle session server")
+    parser.add_argument("dictionary", help = "dictionary file the server hosts")
+    parser.add_argument("--clients", type = int, default = 100)
+    parser.add_argument("--games", type = int, default = 5, help = "games per client")
+    parser.add_argument("--bot", choices = BOTS, default = "random")
+    parser.add_argument("--max-guesses", type = int, default = 10)
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = DEFAULT_PORT)
+    parser.add_argument("--unix", help = "path of the server's Unix socket, instead of TCP")
+    args = parser.parse_args()
+
+    report = asyncio.run(generate_load(args.dictionary, args.clients, args.games, args.bot, args.max_guesses,
+                                       args.host, args.port, args.unix))
+    for key, value in report.items():
+        print(format(key, "<20") + format(value, ">12.3f"))
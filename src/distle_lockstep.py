@@ -0,0 +1,173 @@
+from distle_game import *
+'''
+Lockstep engine playing many games of Distle at once against the same
+dictionary. Every turn, each game's player guesses, and the candidate words all
+players must check against their feedback are gathered into a single batched
+feedback_matches call rather than one small computation per game, so the
+distance and transforms work per turn is a few vectorized passes whatever the
+number of games.
+'''
+
+# Default number of games played in lockstep
+DEFAULT_BATCH_SIZE: int = 64
+
+class _LockstepGame:
+    '''
+    State of one game in flight within a LockstepEngine.
+    '''
+
+    def __init__(self, round_number: int, word: str, player: "DistlePlayer") -> None:
+        '''
+        Constructs the state of a newly started game.
+
+        Parameters:
+            round_number (int):
+                The game's position among the secrets given to LockstepEngine.run
+            word (str):
+                The game's secret word
+            player (DistlePlayer):
+                The player playing the game, already started on it
+        '''
+        self.round_number: int = round_number
+        self.word: str = word
+        self.player: "DistlePlayer" = player
+        self.guesses: int = 0
+        self.won: Optional[bool] = None
+
+class LockstepEngine:
+    '''
+    Plays batches of games in lockstep (see module docstring), one DistlePlayer
+    per concurrent game; players are reused from one game to the next.
+    '''
+
+    def __init__(self, dictionary_path: str, player_factory: Callable[[], "DistlePlayer"] = DistlePlayer,
+                 max_guesses: int = 10, batch_size: int = DEFAULT_BATCH_SIZE,
+                 feedback_cache: Optional[FeedbackCache] = None) -> None:
+        '''
+        Constructs a new LockstepEngine.
+
+        Parameters:
+            dictionary_path (str):
+                Path to the dictionary, of either format, relative to the src directory
+            player_factory (Callable[[], DistlePlayer]):
+                Creates the players, one per concurrent game
+            max_guesses (int):
+                The maximum number of guesses per game
+            batch_size (int):
+                The number of games played at once
+            feedback_cache (Optional[FeedbackCache]):
+                Memo of the feedback given for each (guess, secret) pair; None
+                computes every feedback afresh
+        '''
+        if batch_size < 1:
+            raise ValueError("[X] Batch size must be positive, but was " + str(batch_size))
+        self.game: DistleGame = DistleGame(dictionary_path, False, None)
+        self.dictionary: FrozenDictionary = self.game.dictionary
+        self.max_guesses: int = max_guesses
+        self.batch_size: int = batch_size
+        self.feedback_cache: Optional[FeedbackCache] = feedback_cache
+        self._players: list["DistlePlayer"] = [player_factory() for _ in range(batch_size)]
+
+    def get_dictionary_size(self) -> int:
+        '''
+        Getter for the number of words in the engine's dictionary.
+
+        Returns:
+            int:
+                The number of words in the dictionary
+        '''
+        return self.game.get_dictionary_size()
+
+    def run(self, rand_inds: Iterable[int]) -> Iterator[tuple[int, bool]]:
+        '''
+        Plays one game per given secret word index, batch_size of them at a time,
+        starting the next game in line as soon as one ends. Each game's result is
+        yielded as soon as it is known, in completion order.
+
+        Parameters:
+            rand_inds (Iterable[int]):
+                The index of the secret word of each game
+
+        Returns:
+            Iterator[tuple[int, bool]]:
+                The game's number (position in rand_inds) and whether the player won
+        '''
+        pending = enumerate(rand_inds)
+        free_players = list(reversed(self._players))
+        active: list[_LockstepGame] = []
+        while True:
+            while free_players:
+                next_game = next(pending, None)
+                if next_game is None:
+                    break
+                player = free_players.pop()
+                player.start_new_game(self.dictionary, self.max_guesses)
+                active.append(_LockstepGame(next_game[0], self.game.rand_word_list[next_game[1]], player))
+            if not active:
+                return
+
+            self._give_feedback(self._guess_all(active))
+            for state in active:
+                if state.won is not None:
+                    free_players.append(state.player)
+                    yield state.round_number, state.won
+            active = [state for state in active if state.won is None]
+
+    def _guess_all(self, active: list[_LockstepGame]) -> list[tuple[_LockstepGame, str, int, list[str]]]:
+        '''
+        Has every active game's player make its next guess, and works out the
+        feedback each guess gets exactly as DistleGame would, setting won on the
+        games that end this turn.
+
+        Parameters:
+            active (list[_LockstepGame]):
+                The games in flight
+
+        Returns:
+            list[tuple[_LockstepGame, str, int, list[str]]]:
+                The (game, guess, distance, transforms) of every incorrect, valid
+                guess of a game that goes on
+        '''
+        feedback: list[tuple[_LockstepGame, str, int, list[str]]] = []
+        for state in active:
+            guess = state.player.make_guess()
+            state.guesses += 1
+            if guess in self.dictionary:
+                if self.feedback_cache is None:
+                    distance, encoded = feedback_signature(guess, state.word)
+                else:
+                    distance, encoded = self.feedback_cache.feedback(guess, state.word)
+                if distance == 0:
+                    state.won = True
+                    continue
+                if state.guesses < self.max_guesses:
+                    feedback.append((state, guess, distance, list(encoded)))
+            if state.guesses >= self.max_guesses:
+                state.won = False
+        return feedback
+
+    def _give_feedback(self, feedback: list[tuple[_LockstepGame, str, int, list[str]]]) -> None:
+        '''
+        Gives every player the feedback on its guess, with the candidates of all
+        players checked against their feedback in a single batch.
+
+        Parameters:
+            feedback (list[tuple[_LockstepGame, str, int, list[str]]]):
+                The (game, guess, distance, transforms) of every valid guess
+        '''
+        all_candidates = [state.player.feedback_candidates(guess, distance, transforms)
+                          for state, guess, distance, transforms in feedback]
+        guesses: list[str] = []
+        distances: list[int] = []
+        encoded: list[str] = []
+        for (_, guess, distance, transforms), candidates in zip(feedback, all_candidates):
+            guesses += [guess] * len(candidates)
+            distances += [distance] * len(candidates)
+            encoded += [encode_transforms(transforms)] * len(candidates)
+        matches = feedback_matches(guesses, [word for candidates in all_candidates for word in candidates], distances, encoded)
+        start = 0
+        for (state, guess, distance, transforms), candidates in zip(feedback, all_candidates):
+            end = start + len(candidates)
+            state.player.apply_feedback(guess, distance, transforms,
+                                        [word for word, match in zip(candidates, matches[start:end]) if match])
+            start = end
@@ -0,0 +1,31 @@
+import unittest
+import pytest
+from distle_lockstep import *
+
+class DistleLockstepTests(unittest.TestCase):
+    """
+    Unit tests for validating the lockstep, batched multi-game engine.
+    """
+    
+    def test_lockstep_engine_t0(self) -> None:
+        engine = LockstepEngine("../dat/testing.txt", max_guesses = 10, batch_size = 4)
+        self.assertEqual(6, engine.get_dictionary_size())
+        rand_inds = [0, 1, 2, 3, 4, 5, 0, 1]
+        results = sorted(engine.run(rand_inds))
+        self.assertEqual(list(range(len(rand_inds))), [round_number for round_number, _ in results])
+        self.assertTrue(all(won for _, won in results))
+        
+    def test_lockstep_engine_t1(self) -> None:
+        # A single guess only wins if it happens to be the secret
+        engine = LockstepEngine("../dat/testing.txt", max_guesses = 1, batch_size = 3)
+        results = dict(engine.run(range(6)))
+        self.assertEqual(list(range(6)), sorted(results))
+        self.assertEqual(1, sum(results.values()))
+        self.assertEqual([], list(engine.run([])))
+        
+    def test_lockstep_engine_t2(self) -> None:
+        with pytest.raises(ValueError):
+            LockstepEngine("../dat/testing.txt", batch_size = 0)
+        
+if __name__ == '__main__':
+    unittest.main()
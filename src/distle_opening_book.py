@@ -0,0 +1,289 @@
+from distle_partition import *
+from distle_dictionary import dictionary_hash
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+'''
+Offline builder and loader for two-ply Distle opening books. Every game starts
+from the same full dictionary, so the best first guess, and the best second
+guess for each feedback that first guess can receive, are the same in every
+game; the book precomputes them once per dictionary so the two most expensive
+turns of a game become lookups.
+
+Usage:
+    python distle_opening_book.py ../dat/dictionary6.txt [--workers N]
+
+The book is saved next to the dictionary (e.g., dictionary6.book.json) and keyed
+by a hash of the dictionary's contents, so stale books are never used.
+'''
+
+# Directory searched for opening books by find_opening_book
+DEFAULT_BOOK_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dat")
+
+# Suffix replacing a dictionary file's extension to name its book
+BOOK_SUFFIX: str = ".book.json"
+
+class OpeningBook:
+    '''
+    Precomputed first guess for a dictionary, plus the second guess to make for
+    every feedback the first guess can receive.
+    '''
+
+    def __init__(self, dictionary_hash: str, first_guess: str, second_guesses: dict[str, str]) -> None:
+        '''
+        Constructs a new OpeningBook.
+
+        Parameters:
+            dictionary_hash (str):
+                The dictionary_hash of the dictionary this book was built for
+            first_guess (str):
+                The opening guess
+            second_guesses (dict[str, str]):
+                Map from the feedback_key of each feedback the first guess can
+                receive to the guess to make next
+        '''
+        self.dictionary_hash: str = dictionary_hash
+        self.first_guess: str = first_guess
+        self.second_guesses: dict[str, str] = second_guesses
+
+    def second_guess(self, feedback: Feedback) -> Optional[str]:
+        '''
+        Returns the book's second guess after the first guess received the given
+        feedback, or None if the book has no entry for it.
+
+        Parameters:
+            feedback (Feedback):
+                The feedback received by the first guess
+
+        Returns:
+            Optional[str]:
+                The second guess to make, if known
+        '''
+        return self.second_guesses.get(feedback_key(feedback))
+
+    def save(self, path: str) -> None:
+        '''
+        Writes this book as JSON to the given path.
+
+        Parameters:
+            path (str):
+                Destination of the book file
+        '''
+        with open(path, "w") as file:
+            json.dump({"hash": self.dictionary_hash, "first": self.first_guess, "second": self.second_guesses}, file, indent = 1, sort_keys = True)
+
+    @staticmethod
+    def load(path: str) -> "OpeningBook":
+        '''
+        Reads a book previously written by save.
+
+        Parameters:
+            path (str):
+                Location of the book file
+
+        Returns:
+            OpeningBook:
+                The loaded book
+        '''
+        with open(path, "r") as file:
+            contents = json.load(file)
+        return OpeningBook(contents["hash"], contents["first"], contents["second"])
+
+def feedback_key(feedback: Feedback) -> str:
+    '''
+    Returns the str used to key a feedback signature in a book file, e.g.,
+    (3, "TRD") => "3:TRD".
+
+    Parameters:
+        feedback (Feedback):
+            The feedback to key
+
+    Returns:
+        str:
+            The feedback's key
+    '''
+    return str(feedback[0]) + ":" + feedback[1]
+
+def book_path_for(dictionary_path: str) -> str:
+    '''
+    Returns the path of the book belonging to the given dictionary file.
+
+    Parameters:
+        dictionary_path (str):
+            Path to a new-line separated dictionary file
+
+    Returns:
+        str:
+            Path of the dictionary's opening book
+    '''
+    return os.path.splitext(dictionary_path)[0] + BOOK_SUFFIX
+
+_books_by_hash: dict[str, dict[str, OpeningBook]] = {}
+
+def find_opening_book(words_hash: str, directory: str = DEFAULT_BOOK_DIR) -> Optional[OpeningBook]:
+    '''
+    Returns the opening book in the given directory built for the dictionary with
+    the given hash, if any. The directory is only scanned once per process.
+
+    Parameters:
+        words_hash (str):
+            The dictionary_hash of the dictionary being played
+        directory (str):
+            Directory containing book files
+
+    Returns:
+        Optional[OpeningBook]:
+            The matching book, or None if there is none
+    '''
+    if directory not in _books_by_hash:
+        books: dict[str, OpeningBook] = {}
+        for path in sorted(glob.glob(os.path.join(directory, "*" + BOOK_SUFFIX))):
+            book = OpeningBook.load(path)
+            books[book.dictionary_hash] = book
+        _books_by_hash[directory] = books
+    return _books_by_hash[directory].get(words_hash)
+
+# Builder
+# -------------------------------------------------
+
+_worker_secrets: list[str] = []
+
+def _init_worker(secrets: list[str]) -> None:
+    '''
+    Process-pool initializer sharing the sampled secrets with each worker once,
+    rather than with every task.
+
+    Parameters:
+        secrets (list[str]):
+            The sampled secrets first guesses are scored against
+    '''
+    global _worker_secrets
+    _worker_secrets = secrets
+
+def _score_first_guess(task: tuple[str, str]) -> float:
+    '''
+    Scores a candidate first guess against the worker's sampled secrets.
+
+    Parameters:
+        task (tuple[str, str]):
+            The (guess, metric) to score
+
+    Returns:
+        float:
+            The guess' score, lower being better
+    '''
+    guess, metric = task
+    return score_partition(partition_candidates(guess, _worker_secrets), metric)
+
+def _feedback_of(task: tuple[str, str]) -> Feedback:
+    '''
+    Returns the feedback_signature of a (guess, secret) pair; used to partition
+    the whole dictionary by the first guess in parallel.
+
+    Parameters:
+        task (tuple[str, str]):
+            The (guess, secret) pair
+
+    Returns:
+        Feedback:
+            The feedback the guess receives against the secret
+    '''
+    return feedback_signature(task[0], task[1])
+
+def _choose_second_guess(task: tuple[list[str], str, int, int, int]) -> str:
+    '''
+    Chooses the second guess for one bucket of the first guess' partition.
+
+    Parameters:
+        task (tuple[list[str], str, int, int, int]):
+            The (bucket, metric, guess_sample, secret_sample, seed) to solve
+
+    Returns:
+        str:
+            The best second guess found for the bucket
+    '''
+    bucket, metric, guess_sample, secret_sample, seed = task
+    return choose_guess(bucket, metric = metric, guess_sample = guess_sample,
+                        secret_sample = secret_sample, rng = random.Random(seed))
+
+def build_opening_book(words: Sequence[str], metric: str = "expected_size", guess_sample: int = 4 * DEFAULT_GUESS_SAMPLE,
+                       secret_sample: int = 4 * DEFAULT_SECRET_SAMPLE, seed: int = 0, n_workers: Optional[int] = None) -> OpeningBook:
+    '''
+    Computes the two-ply opening book for the given dictionary using a pool of
+    worker processes: the first guess is the best scoring of guess_sample sampled
+    words, and each bucket of its partition of the whole dictionary gets its own
+    best second guess. Deterministic for a given seed.
+
+    Parameters:
+        words (Sequence[str]):
+            The dictionary to build the book for
+        metric (str):
+            One of SCORING_METRICS
+        guess_sample (int):
+            Maximum number of guesses scored per ply
+        secret_sample (int):
+            Maximum number of secrets each guess is scored against
+        seed (int):
+            Seed of the sampling
+        n_workers (Optional[int]):
+            Number of worker processes; all cores if None
+
+    Returns:
+        OpeningBook:
+            The computed book
+    '''
+    words = sorted(set(words))
+    if len(words) == 0:
+        raise ValueError("[X] Cannot build an opening book for an empty dictionary")
+    rng = random.Random(seed)
+    first_pool = words if len(words) <= guess_sample else rng.sample(words, guess_sample)
+    secrets = words if len(words) <= secret_sample else rng.sample(words, secret_sample)
+
+    with multiprocessing.Pool(n_workers or os.cpu_count(), _init_worker, (secrets,)) as pool:
+        scores = pool.map(_score_first_guess, [(guess, metric) for guess in first_pool])
+        first_guess = min(zip(scores, first_pool))[1]
+
+        feedbacks = pool.map(_feedback_of, [(first_guess, word) for word in words], chunksize = 1024)
+        buckets: dict[Feedback, list[str]] = {}
+        for word, feedback in zip(words, feedbacks):
+            buckets.setdefault(feedback, []).append(word)
+        del buckets[(0, "")]
+
+        keys = sorted(buckets)
+        tasks = [(buckets[key], metric, guess_sample, secret_sample, seed + index) for index, key in enumerate(keys)]
+        seconds = pool.map(_choose_second_guess, tasks)
+
+    return OpeningBook(dictionary_hash(words), first_guess, {feedback_key(key): guess for key, guess in zip(keys, seconds)})
+
+def read_dictionary(dictionary_path: str) -> list[str]:
+    '''
+    Reads the words of a new-line separated dictionary file, in the same way as
+    the DistleGame does.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the dictionary file
+
+    Returns:
+        list[str]:
+            The dictionary's words, in file order
+    '''
+    with open(dictionary_path, "r") as file:
+        return [line.rstrip() for line in file]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Builds the two-ply opening book of a Distle dictionary")
+    parser.add_argument("dictionary", help = "path to the dictionary file, e.g., ../dat/dictionary6.txt")
+    parser.add_argument("--metric", default = "expected_size", choices = SCORING_METRICS)
+    parser.add_argument("--guess-sample", type = int, default = 4 * DEFAULT_GUESS_SAMPLE)
+    parser.add_argument("--secret-sample", type = int, default = 4 * DEFAULT_SECRET_SAMPLE)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--workers", type = int, default = None)
+    args = parser.parse_args()
+
+    book = build_opening_book(read_dictionary(args.dictionary), args.metric, args.guess_sample,
+                              args.secret_sample, args.seed, args.workers)
+    book.save(book_path_for(args.dictionary))
+    print("[!] First guess: " + book.first_guess + ", second guesses: " + str(len(book.second_guesses)))
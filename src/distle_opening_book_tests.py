@@ -0,0 +1,41 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_opening_book import *
+
+class DistleOpeningBookTests(unittest.TestCase):
+    """
+    Unit tests for validating the building, saving and lookup of opening books.
+    """
+    
+    WORDS: list[str] = ["stone", "stoke", "shone", "phone", "score", "strobe", "tone", "atone"]
+    
+    def test_dictionary_hash_t0(self) -> None:
+        self.assertEqual(dictionary_hash(["a", "b"]), dictionary_hash(["b", "a"]))
+        self.assertNotEqual(dictionary_hash(["a", "b"]), dictionary_hash(["a", "c"]))
+        
+    def test_build_opening_book_t0(self) -> None:
+        book = build_opening_book(self.WORDS, n_workers = 1)
+        self.assertEqual(dictionary_hash(self.WORDS), book.dictionary_hash)
+        self.assertIn(book.first_guess, self.WORDS)
+        for word in self.WORDS:
+            if word == book.first_guess:
+                continue
+            second = book.second_guess(feedback_signature(book.first_guess, word))
+            self.assertIsNotNone(second)
+            self.assertEqual(feedback_signature(book.first_guess, word), feedback_signature(book.first_guess, str(second)))
+        
+    def test_find_opening_book_t0(self) -> None:
+        book = build_opening_book(self.WORDS, n_workers = 1)
+        with tempfile.TemporaryDirectory() as directory:
+            book.save(book_path_for(os.path.join(directory, "words.txt")))
+            found = find_opening_book(book.dictionary_hash, directory)
+            self.assertIsNotNone(found)
+            assert found is not None
+            self.assertEqual(book.first_guess, found.first_guess)
+            self.assertEqual(book.second_guesses, found.second_guesses)
+            self.assertIsNone(find_opening_book(dictionary_hash(["nope"]), directory))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+from edit_dist_utils import *
+import math
+import random
+import time
+'''
+Feedback-partition engine used to pick informative guesses: a guess splits the
+remaining candidate secrets into buckets keyed by the feedback (distance and
+transforms) each would produce, and the best guesses are those whose buckets
+are smallest, i.e., that cut the space of possible secrets down fastest.
+'''
+
+# Ways of scoring a partition, all of which are minimized:
+#    - "expected_size": expected number of candidates left after the guess
+#    - "entropy": negated Shannon entropy (in bits) of the feedback
+#    - "minimax": size of the largest (worst-case) bucket
+SCORING_METRICS: tuple[str, ...] = ("expected_size", "entropy", "minimax")
+
+# Default bounds on the number of guesses scored, and of candidate secrets each
+# guess is scored against, so that guess selection stays cheap on dictionary14
+DEFAULT_GUESS_SAMPLE: int = 24
+DEFAULT_SECRET_SAMPLE: int = 300
+
+# Number of secrets the guesses are first scored against when choosing under a
+# deadline, doubled every round after
+ANYTIME_FIRST_SECRETS: int = 16
+
+def partition_candidates(guess: str, candidates: Iterable[str], cache: Optional[FeedbackCache] = None) -> dict[Feedback, list[str]]:
+    '''
+    Splits the candidates into buckets keyed by the feedback the DistleGame would
+    give for the guess if each candidate were the secret.
+
+    Parameters:
+        guess (str):
+            The guess to partition the candidates with
+        candidates (Iterable[str]):
+            The possible secrets
+        cache (Optional[FeedbackCache]):
+            Memo the feedback is looked up in and added to; computed afresh if None
+
+    Returns:
+        dict[Feedback, list[str]]:
+            Map from each feedback signature to the candidates producing it
+    '''
+    signature = feedback_signature if cache is None else cache.feedback
+    partition: dict[Feedback, list[str]] = {}
+    for candidate in candidates:
+        partition.setdefault(signature(guess, candidate), []).append(candidate)
+    return partition
+
+def score_bucket_sizes(sizes: Iterable[int], metric: str) -> float:
+    '''
+    Scores a partition from the sizes of its buckets, according to the given
+    metric (see SCORING_METRICS). Lower scores are better.
+
+    Parameters:
+        sizes (Iterable[int]):
+            The number of candidates in each bucket of the partition
+        metric (str):
+            One of SCORING_METRICS
+
+    Returns:
+        float:
+            The partition's score, lower being better
+    '''
+    sizes = list(sizes)
+    total = sum(sizes)
+    if total == 0:
+        return 0.0
+    if metric == "expected_size":
+        return sum(size * size for size in sizes) / total
+    if metric == "entropy":
+        return sum(size / total * math.log2(size / total) for size in sizes if size > 0)
+    if metric == "minimax":
+        return float(max(sizes))
+    raise ValueError("[X] Metric must be one of " + str(SCORING_METRICS) + ", but was " + str(metric))
+
+def score_partition(partition: dict[Feedback, list[str]], metric: str) -> float:
+    '''
+    Scores the given partition according to the given metric (see SCORING_METRICS).
+    Lower scores are better.
+
+    Parameters:
+        partition (dict[Feedback, list[str]]):
+            A partition, as returned by partition_candidates
+        metric (str):
+            One of SCORING_METRICS
+
+    Returns:
+        float:
+            The partition's score, lower being better
+    '''
+    return score_bucket_sizes((len(bucket) for bucket in partition.values()), metric)
+
+def choose_guess(candidates: Sequence[str], guess_pool: Optional[Sequence[str]] = None, metric: str = "expected_size",
+                 guess_sample: int = DEFAULT_GUESS_SAMPLE, secret_sample: int = DEFAULT_SECRET_SAMPLE,
+                 rng: Optional[random.Random] = None, cache: Optional[FeedbackCache] = None,
+                 deadline: Optional[float] = None, random_candidate: Optional[Callable[[], str]] = None) -> str:
+    '''
+    Returns the guess whose partition of the candidates scores best. At most
+    guess_sample guesses (drawn from the guess_pool) are scored, each against at
+    most secret_sample of the candidates, so the work per call is bounded regardless
+    of the dictionary's size. Ties are broken in favor of guesses that are themselves
+    candidates, since those might win outright.
+    
+    Given a deadline, the choice is refined anytime instead: the guesses are scored
+    in rounds against ANYTIME_FIRST_SECRETS, then twice, four times... as many of
+    the sampled secrets (each round only adding the new secrets to the guesses'
+    partitions), until all are scored or the deadline hits. The best guess of the
+    last complete round is then returned; failing that, the best guess scored so
+    far; and failing that, a random candidate. The deadline is checked before
+    scoring each guess, so it is overshot by at most one guess's scoring.
+
+    Parameters:
+        candidates (Sequence[str]):
+            The remaining possible secrets; must be non-empty
+        guess_pool (Optional[Sequence[str]]):
+            The words to consider guessing; the candidates themselves if None
+        metric (str):
+            One of SCORING_METRICS
+        guess_sample (int):
+            Maximum number of guesses to score
+        secret_sample (int):
+            Maximum number of candidates each guess is scored against
+        rng (Optional[random.Random]):
+            Source of randomness for sampling; the random module if None
+        cache (Optional[FeedbackCache]):
+            Memo of feedback shared across calls (see partition_candidates)
+        deadline (Optional[float]):
+            time.perf_counter() time by which to return; no limit if None
+        random_candidate (Optional[Callable[[], str]]):
+            Returns the random candidate guessed when no guess could be scored in
+            time, e.g., CandidateSet.sample; a random choice of the candidates if None
+
+    Returns:
+        str:
+            The best-scoring guess found
+    '''
+    if len(candidates) == 0:
+        raise ValueError("[X] Cannot choose a guess without any candidates")
+    if metric not in SCORING_METRICS:
+        raise ValueError("[X] Metric must be one of " + str(SCORING_METRICS) + ", but was " + str(metric))
+    if len(candidates) <= 2:
+        return candidates[0]
+
+    sampler = random if rng is None else rng
+    pool = candidates if guess_pool is None else guess_pool
+    guesses = pool if len(pool) <= guess_sample else sampler.sample(pool, guess_sample)
+    secrets = candidates if len(candidates) <= secret_sample else sampler.sample(candidates, secret_sample)
+    candidate_set = set(candidates)
+    if deadline is None:
+        rounds = [len(secrets)]
+    else:
+        rounds = [min(len(secrets), ANYTIME_FIRST_SECRETS << round_number)
+                  for round_number in range(max(1, math.ceil(math.log2(len(secrets) / ANYTIME_FIRST_SECRETS)) + 1))]
+
+    signature = feedback_signature if cache is None else cache.feedback
+    bucket_sizes: list[dict[Feedback, int]] = [{} for _ in guesses]
+    best_guess: Optional[str] = None
+    scored = 0
+    for round_size in rounds:
+        round_guess: Optional[str] = None
+        round_score = math.inf
+        for guess, sizes in zip(guesses, bucket_sizes):
+            if deadline is not None and time.perf_counter() >= deadline:
+                scored_guess = best_guess if best_guess is not None else round_guess
+                if scored_guess is not None:
+                    return scored_guess
+                return random_candidate() if random_candidate is not None else sampler.choice(candidates)
+            for secret in secrets[scored:round_size]:
+                feedback = signature(guess, secret)
+                sizes[feedback] = sizes.get(feedback, 0) + 1
+            score = score_bucket_sizes(sizes.values(), metric)
+            if guess not in candidate_set:
+                score += 1e-9
+            if score < round_score:
+                round_guess, round_score = guess, score
+        best_guess, scored = round_guess, round_size
+    assert best_guess is not None
+    return best_guess
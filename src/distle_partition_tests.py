@@ -0,0 +1,45 @@
+import unittest
+import pytest
+import random
+import time
+from distle_partition import *
+
+class DistlePartitionTests(unittest.TestCase):
+    """
+    Unit tests for validating the feedback-partition engine used to select guesses.
+    """
+    
+    def test_partition_candidates_t0(self) -> None:
+        partition = partition_candidates("stone", ["stone", "stoke", "shone", "tones"])
+        self.assertEqual(["stone"], partition[(0, "")])
+        self.assertEqual(4, sum(len(bucket) for bucket in partition.values()))
+        for feedback, bucket in partition.items():
+            for word in bucket:
+                self.assertEqual(feedback, feedback_signature("stone", word))
+        
+    def test_score_bucket_sizes_t0(self) -> None:
+        self.assertEqual(1.0, score_bucket_sizes([1, 1, 1, 1], "expected_size"))
+        self.assertEqual(2.5, score_bucket_sizes([1, 3], "expected_size"))
+        self.assertEqual(-2.0, score_bucket_sizes([1, 1, 1, 1], "entropy"))
+        self.assertEqual(3.0, score_bucket_sizes([1, 3], "minimax"))
+        with self.assertRaises(ValueError):
+            score_bucket_sizes([1], "best")
+        
+    def test_choose_guess_t0(self) -> None:
+        # "abc" separates all three candidates, whereas "xyz" separates none
+        candidates = ["abc", "abd", "bac"]
+        self.assertEqual("abc", choose_guess(candidates, guess_pool = ["xyz", "abc"]))
+        self.assertIn(choose_guess(candidates, rng = random.Random(0)), candidates)
+        with self.assertRaises(ValueError):
+            choose_guess([])
+        
+    def test_choose_guess_deadline_t0(self) -> None:
+        words = ["".join(random.Random(i).choice("abcde") for _ in range(5)) for i in range(400)]
+        # With time to spare, the anytime rounds end on the same choice as one round
+        self.assertEqual(choose_guess(words, rng = random.Random(1)),
+                         choose_guess(words, rng = random.Random(1), deadline = time.perf_counter() + 60))
+        # Past the deadline, a random candidate is all there is time for
+        self.assertIn(choose_guess(words, rng = random.Random(1), deadline = time.perf_counter()), words)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,34 @@
 from edit_dist_utils import *
+from distle_partition import *
+from distle_dictionary import FrozenDictionary, LengthIndex, dictionary_hash, feedback_length
+from distle_bk_tree import BKTree, find_bk_tree
+from distle_opening_book import find_opening_book, OpeningBook
+from distle_distance_matrix import DistanceMatrix, find_dictionary_matrix
+from distle_decision_tree import DecisionTree, find_decision_tree
+from distle_filter_executor import *
+from distle_prefix_sweep import PrefixSweep, dictionary_sweep
+from distle_candidate_set import CandidateSet
+import numpy as np
 import random
+import time
+
+# Largest edit distance for which the first, whole-dictionary filter queries the
+# dictionary's BK-tree (when enabled) instead of scanning the length bucket; range
+# queries only prune well for small radii
+BK_TREE_MAX_DIST: int = 2
+
+# Largest edit distance for which the first, whole-dictionary filter sweeps the
+# dictionary's trie (when enabled) instead of scanning the length bucket; further
+# away, too few subtrees are pruned for the sweep to pay off
+PREFIX_SWEEP_MAX_DIST: int = 3
+
+# Candidate counts at or below which a player using distance matrices computes
+# one over the survivors, when the dictionary has no matrix built
+MATRIX_CANDIDATE_THRESHOLD: int = 64
+
+# Maximum number of guesses a distance matrix scores to shortlist those that
+# choose_guess then scores by full feedback
+MATRIX_SHORTLIST_SAMPLE: int = 512
 
 class DistlePlayer:
     '''
@@ -7,7 +36,80 @@ class DistlePlayer:
     the game of Distle with frightening accuracy (hopefully)
     '''
     
-    def start_new_game(self, dictionary: set[str], max_guesses: int) -> None:
+    def __init__(self, metric: str = "expected_size", guess_sample: int = DEFAULT_GUESS_SAMPLE,
+                 secret_sample: int = DEFAULT_SECRET_SAMPLE, use_bk_tree: bool = False,
+                 feedback_cache: Optional[FeedbackCache] = None, time_budget: Optional[float] = None,
+                 use_distance_matrix: bool = False, matrix_threshold: int = MATRIX_CANDIDATE_THRESHOLD,
+                 use_decision_tree: bool = False, filter_executor: Optional[FilterExecutor] = None,
+                 parallel_threshold: int = PARALLEL_FILTER_THRESHOLD, use_prefix_sweep: bool = True,
+                 auto_parallel: bool = False) -> None:
+        '''
+        Constructs a new DistlePlayer that picks its guesses by partitioning the
+        remaining candidates by feedback (see distle_partition.choose_guess).
+        
+        Parameters:
+            metric (str):
+                How guesses' partitions are scored; one of SCORING_METRICS
+            guess_sample (int):
+                Maximum number of candidate guesses scored per turn
+            secret_sample (int):
+                Maximum number of possible secrets each guess is scored against
+            use_bk_tree (bool):
+                Whether to generate first-turn candidates from the dictionary's saved
+                BK-tree (see distle_bk_tree), when one exists
+            feedback_cache (Optional[FeedbackCache]):
+                Memo of the feedback computed while scoring guesses, e.g., the
+                shared_feedback_cache also given to the DistleGame; None disables it
+            time_budget (Optional[float]):
+                Seconds each make_guess may take by default (see make_guess); no
+                limit if None
+            use_distance_matrix (bool):
+                Whether to filter candidates and shortlist guesses by lookups in the
+                dictionary's built distance matrix (see distle_distance_matrix), or,
+                without one, in a matrix computed over the survivors once few remain
+            matrix_threshold (int):
+                The most survivors a matrix is computed over, without a built one
+            use_decision_tree (bool):
+                Whether to follow the dictionary's decision tree (see
+                distle_decision_tree), when one was built for games of at most as
+                many guesses, instead of choosing guesses and filtering candidates
+            filter_executor (Optional[FilterExecutor]):
+                Where get_feedback filters large candidate sets (see
+                distle_filter_executor), e.g., on all cores; if None, chosen as
+                per auto_parallel
+            parallel_threshold (int):
+                The fewest candidates handed to the filter_executor
+            use_prefix_sweep (bool):
+                Whether the first, whole-dictionary filter sweeps the dictionary's
+                trie (see distle_prefix_sweep) for the words at the right distance,
+                rather than computing the distance of every word of the right length,
+                when that distance is at most PREFIX_SWEEP_MAX_DIST and no BK-tree
+                (see use_bk_tree) handles it
+            auto_parallel (bool):
+                Without a filter_executor, whether large candidate sets of a
+                FrozenDictionary are filtered by its shared_filter_executor, on all
+                cores where there are several, rather than serially; off by default,
+                as that starts a process pool living until exit
+        '''
+        if metric not in SCORING_METRICS:
+            raise ValueError("[X] Metric must be one of " + str(SCORING_METRICS) + ", but was " + str(metric))
+        self.metric: str = metric
+        self.guess_sample: int = guess_sample
+        self.secret_sample: int = secret_sample
+        self.use_bk_tree: bool = use_bk_tree
+        self.feedback_cache: Optional[FeedbackCache] = feedback_cache
+        self.time_budget: Optional[float] = time_budget
+        self.use_distance_matrix: bool = use_distance_matrix
+        self.matrix_threshold: int = matrix_threshold
+        self.use_decision_tree: bool = use_decision_tree
+        self.filter_executor: Optional[FilterExecutor] = filter_executor
+        self.parallel_threshold: int = parallel_threshold
+        self.use_prefix_sweep: bool = use_prefix_sweep
+        self.auto_parallel: bool = auto_parallel
+        # Candidates of the games played over a FrozenDictionary, reset every game
+        self.candidate_set: Optional[CandidateSet] = None
+    
+    def start_new_game(self, dictionary: AbstractSet[str], max_guesses: int) -> None:
         '''
         Called at the start of every new game of Distle, and parameterized by
         the dictionary composing all possible words that can be used as guesses,
@@ -18,21 +120,47 @@ class DistlePlayer:
         game, e.g., by saving a copy of the dictionary, etc.
         
         Parameters:
-            dictionary (set[str]):
+            dictionary (AbstractSet[str]):
                 The dictionary of words from which the correct answer AND any
-                possible guesses must be drawn
+                possible guesses must be drawn; typically a FrozenDictionary
+                shared between games, so it is never mutated nor copied
             max_guesses (int):
                 The maximum number of guesses that are available to the agent
                 in this game of Distle
         '''
         # [!] TODO
-        self.dictionary: set[str] = dictionary
+        self.dictionary: AbstractSet[str] = dictionary
         self.max_guesses: int = max_guesses
         self.guesses_made: int = 0
-        self.possible_words: set[str] = dictionary
+        # The candidates still alive: over a FrozenDictionary, a CandidateSet kept
+        # from game to game and reset here; otherwise the shared dictionary itself
+        # until the first feedback, then a set of only the survivors
+        self.possible_words: AbstractSet[str] = dictionary
+        if isinstance(dictionary, FrozenDictionary):
+            if self.candidate_set is None or self.candidate_set.dictionary is not dictionary:
+                self.candidate_set = CandidateSet(dictionary)
+            self.candidate_set.reset()
+            self.possible_words = self.candidate_set
+        words_hash: str = dictionary_hash(dictionary)
+        self.opening_book: Optional[OpeningBook] = find_opening_book(words_hash)
+        self.bk_tree: Optional[BKTree] = find_bk_tree(words_hash) if self.use_bk_tree else None
+        self.prefix_sweep: Optional[PrefixSweep] = None
+        if self.use_prefix_sweep and isinstance(dictionary, FrozenDictionary):
+            self.prefix_sweep = dictionary_sweep(dictionary)
+        self.last_feedback: Optional[Feedback] = None
+        self.length_index: LengthIndex = dictionary.length_index if isinstance(dictionary, FrozenDictionary) else LengthIndex(dictionary)
+        self.distance_matrix: Optional[DistanceMatrix] = find_dictionary_matrix(dictionary) if self.use_distance_matrix else None
+        # Rows of the distance matrix holding the possible words; all if None
+        self.matrix_rows: Optional[np.ndarray] = None
+        tree = find_decision_tree(dictionary) if self.use_decision_tree else None
+        self.decision_tree: Optional[DecisionTree] = tree if tree is not None and tree.max_guesses <= max_guesses else None
+        # Current node of the decision tree, None once off it (or without one),
+        # and the feedback followed down to it, replayed if the game leaves it
+        self.tree_node: Optional[int] = None if self.decision_tree is None else 0
+        self.tree_history: list[tuple[str, int, list[str]]] = []
         return
     
-    def make_guess(self) -> str:
+    def make_guess(self, time_budget: Optional[float] = None) -> str:
         '''
         Requests a new guess to be made by the agent in the current game of Distle.
         Uses only the DistlePlayer's attributes that had been originally initialized
@@ -41,16 +169,50 @@ class DistlePlayer:
         [!] You will never call this method yourself, it will be called for you by
         the DistleGame that is running.
         
+        Under a time budget, guesses degrade in tiers rather than run late: the
+        opening book's guesses and the last two candidates cost nothing, otherwise
+        choose_guess refines its choice until the deadline, and a random candidate
+        is guessed if not even one guess could be scored in time.
+        
+        Parameters:
+            time_budget (Optional[float]):
+                Seconds this guess may take; the player's time_budget if None
+        
         Returns:
             str:
                 The next guessed word from this DistlePlayer
         '''
         # [!] TODO
         
-        if self.guesses_made == 0:
-            return random.choice(list(self.dictionary))
+        budget = self.time_budget if time_budget is None else time_budget
+        deadline = None if budget is None else time.perf_counter() + budget
+        self.guesses_made += 1
+        if self.decision_tree is not None and self.tree_node is not None:
+            return self.decision_tree.guess(self.tree_node)
+        if self.opening_book is not None:
+            if self.guesses_made == 1:
+                return self.opening_book.first_guess
+            if self.guesses_made == 2 and self.last_feedback is not None:
+                book_guess = self.opening_book.second_guess(self.last_feedback)
+                if book_guess is not None and book_guess in self.possible_words:
+                    return book_guess
+        candidates: Sequence[str]
+        random_candidate: Optional[Callable[[], str]] = None
+        if isinstance(self.possible_words, CandidateSet):
+            random_candidate = self.possible_words.sample
+            # Out of time already: a random candidate, without listing them all
+            if deadline is not None and time.perf_counter() >= deadline and len(self.possible_words) > 2:
+                return random_candidate()
+            candidates = self.possible_words.words()
         else:
-            return random.choice(list(self.possible_words))
+            candidates = self.possible_words.words if isinstance(self.possible_words, FrozenDictionary) else list(self.possible_words)
+        guess_pool: Optional[list[str]] = None
+        if self.distance_matrix is not None and len(candidates) > 2 and (deadline is None or time.perf_counter() < deadline):
+            rows = np.arange(len(self.distance_matrix)) if self.matrix_rows is None else self.matrix_rows
+            guess_pool = self.distance_matrix.shortlist(rows, self.guess_sample, self.metric, MATRIX_SHORTLIST_SAMPLE)
+        return choose_guess(candidates, guess_pool, metric = self.metric, guess_sample = self.guess_sample,
+                            secret_sample = self.secret_sample, cache = self.feedback_cache, deadline = deadline,
+                            random_candidate = random_candidate)
     
     def get_feedback(self, guess: str, edit_dist: int, transforms: list[str]) -> None:
         '''
@@ -75,43 +237,250 @@ class DistlePlayer:
         '''
         # [!] TODO
 
-        words_to_remove: set[str] = set()
-        word_ed: int
-        word_trans: list[str]
-        d: int = 0
-        i: int = 0
-        matches: bool = False
-        
-        for t in transforms:
-            if t == 'D':
-                d += 1
-            if t == 'I':
-                i += 1
-            if d == i:
-                matches = True
-        if 'D' in transforms and 'I' not in transforms or 'I' in transforms and 'D' not in transforms:
-            for word in self.possible_words:
-                if 'D' in transforms and len(word) >= len(guess):
-                    words_to_remove.add(word)
-                elif 'I' in transforms and len(word) <= len(guess):
-                    words_to_remove.add(word)
-            self.possible_words -= words_to_remove
-        elif 'D' not in transforms and 'I' not in transforms and not matches:
-            for word in self.possible_words:
-                if len(word) != len(guess):
-                    words_to_remove.add(word)
-            self.possible_words -= words_to_remove
-
-
-        for word in self.possible_words:
-            word_ed = edit_distance(guess, word)
-            
-            if edit_dist == word_ed:
-                word_trans = get_transformation_list(guess, word)
-                if transforms != word_trans:
-                    words_to_remove.add(word)
+        # Checked once here, as checking can leave the tree (see _on_tree)
+        if self._on_tree(edit_dist, transforms):
+            self.apply_feedback(guess, edit_dist, transforms, [], on_tree = True)
+            return
+        at_distance = self._at_exact_distance(guess, edit_dist)
+        if isinstance(self.possible_words, CandidateSet):
+            # Candidates are narrowed by position, without looking any word up
+            positions = self.feedback_positions(guess, edit_dist, transforms, on_tree = False)
+            dictionary_words = self.possible_words.dictionary.words
+            candidates: Sequence[str] = [dictionary_words[position] for position in positions.tolist()]
+            executor = self._executor_for(len(candidates))
+            matches: np.ndarray
+            if executor is not None:
+                matches = executor.filter_mask(guess, edit_dist, transforms, candidates, at_distance, positions)
             else:
-                words_to_remove.add(word)
-        self.possible_words -= words_to_remove
-
+                matches = filter_mask(guess, edit_dist, transforms, candidates, at_distance)
+            self.apply_feedback(guess, edit_dist, transforms, (), on_tree = False, positions = positions[matches])
+            return
+        candidates = self.feedback_candidates(guess, edit_dist, transforms, on_tree = False)
+        parallel_executor = self._executor_for(len(candidates))
+        survivors: list[str]
+        if parallel_executor is not None:
+            survivors = parallel_executor.filter(guess, edit_dist, transforms, candidates, at_distance)
+        else:
+            survivors = filter_candidates(guess, edit_dist, transforms, candidates, at_distance)
+        self.apply_feedback(guess, edit_dist, transforms, survivors, on_tree = False)
         return
+    
+    def _executor_for(self, n_candidates: int) -> Optional[FilterExecutor]:
+        '''
+        Returns the executor filtering the given number of candidates: the player's
+        own or its dictionary's shared one (as per auto_parallel) for at least
+        parallel_threshold of them, and None, i.e., serially, for fewer.
+        
+        Parameters:
+            n_candidates (int):
+                The number of candidates to filter
+        
+        Returns:
+            Optional[FilterExecutor]:
+                The executor, or None to filter in this thread
+        '''
+        if n_candidates < self.parallel_threshold:
+            return None
+        if self.filter_executor is None and self.auto_parallel and isinstance(self.dictionary, FrozenDictionary):
+            return shared_filter_executor(self.dictionary)
+        return self.filter_executor
+    
+    def feedback_candidates(self, guess: str, edit_dist: int, transforms: list[str], on_tree: Optional[bool] = None) -> list[str]:
+        '''
+        First phase of get_feedback: returns the possible words that must have their
+        edit distance from the guess checked against the feedback. Only the length
+        buckets consistent with the feedback are visited at all.
+        
+        Parameters:
+            guess (str):
+                The last, incorrect guess made by this DistlePlayer
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+            on_tree (Optional[bool]):
+                Whether the feedback leads to a node of the decision tree, if the
+                caller already checked (see _on_tree); checked here if None
+        
+        Returns:
+            list[str]:
+                The words whose edit distance from the guess must be computed; none
+                while following the decision tree
+        '''
+        if on_tree is None:
+            on_tree = self._on_tree(edit_dist, transforms)
+        if on_tree:
+            return []
+        if isinstance(self.possible_words, CandidateSet):
+            dictionary_words = self.possible_words.dictionary.words
+            return [dictionary_words[position] for position in self.feedback_positions(guess, edit_dist, transforms, on_tree = False).tolist()]
+        if self.distance_matrix is not None:
+            rows = self.distance_matrix.at_distance(guess, edit_dist, self.matrix_rows)
+            if rows is not None:
+                return [self.distance_matrix.words[row] for row in rows]
+        secret_len: int = feedback_length(len(guess), transforms)
+        if self.bk_tree is not None and edit_dist <= BK_TREE_MAX_DIST and self._all_possible():
+            return [word for word in self.bk_tree.words_at_distance(guess, edit_dist) if len(word) == secret_len]
+        return self.length_index.candidates(len(guess), edit_dist, transforms)
+    
+    def feedback_positions(self, guess: str, edit_dist: int, transforms: list[str], on_tree: Optional[bool] = None) -> np.ndarray:
+        '''
+        Returns the positions in the dictionary of the words of feedback_candidates,
+        for a player whose possible words are a CandidateSet.
+        
+        Parameters:
+            guess (str):
+                The last, incorrect guess made by this DistlePlayer
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+            on_tree (Optional[bool]):
+                Whether the feedback leads to a node of the decision tree, if the
+                caller already checked (see _on_tree); checked here if None
+        
+        Returns:
+            np.ndarray:
+                The positions of the words whose edit distance from the guess must
+                be computed, in increasing order; none while following the decision tree
+        '''
+        candidate_set = self.possible_words
+        if not isinstance(candidate_set, CandidateSet):
+            raise ValueError("[X] Positions need the possible words to be a CandidateSet")
+        if on_tree is None:
+            on_tree = self._on_tree(edit_dist, transforms)
+        if on_tree:
+            return np.zeros(0, dtype = np.int64)
+        dictionary = candidate_set.dictionary
+        if self.distance_matrix is not None:
+            rows = self.distance_matrix.at_distance(guess, edit_dist, self.matrix_rows)
+            if rows is not None:
+                if self.distance_matrix.words is dictionary.words:
+                    return rows
+                # A matrix over few survivors, whose rows are looked up
+                matrix_words = self.distance_matrix.words
+                return np.array(sorted(dictionary.index_of[matrix_words[row]] for row in rows.tolist()), dtype = np.int64)
+        secret_len: int = feedback_length(len(guess), transforms)
+        # A BK-tree is only loaded when asked for, so it takes precedence over the
+        # prefix sweep (on by default) for the distances it handles
+        if self.bk_tree is not None and edit_dist <= BK_TREE_MAX_DIST and self._all_possible():
+            index_of = dictionary.index_of
+            return np.array(sorted(index_of[word] for word in self.bk_tree.words_at_distance(guess, edit_dist)
+                                   if len(word) == secret_len), dtype = np.int64)
+        if self.prefix_sweep is not None and edit_dist <= PREFIX_SWEEP_MAX_DIST and self._all_possible():
+            return self.prefix_sweep.positions_at_distance(guess, edit_dist, secret_len)
+        return candidate_set.candidate_positions(len(guess), edit_dist, transforms)
+    
+    def _all_possible(self) -> bool:
+        '''
+        Returns whether every word of the dictionary is still possible, i.e., no
+        feedback has narrowed the candidates down yet this game.
+        
+        Returns:
+            bool:
+                Whether the possible words are the whole dictionary
+        '''
+        if isinstance(self.possible_words, CandidateSet):
+            return self.possible_words.is_full()
+        return self.possible_words is self.dictionary
+    
+    def _at_exact_distance(self, guess: str, edit_dist: int) -> bool:
+        '''
+        Returns whether feedback_candidates only returns words at exactly the given
+        edit distance from the guess, i.e., when they come from the distance
+        matrix, the BK-tree or the prefix sweep rather than a length bucket.
+        
+        Parameters:
+            guess (str):
+                The last, incorrect guess made by this DistlePlayer
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+        
+        Returns:
+            bool:
+                Whether the candidates' distances need no checking
+        '''
+        if self.distance_matrix is not None and self.distance_matrix.index(guess) is not None:
+            return True
+        if self.bk_tree is not None and edit_dist <= BK_TREE_MAX_DIST and self._all_possible():
+            return True
+        return self.prefix_sweep is not None and edit_dist <= PREFIX_SWEEP_MAX_DIST and self._all_possible()
+    
+    def _on_tree(self, edit_dist: int, transforms: list[str]) -> bool:
+        '''
+        Returns whether the decision tree, if followed, has a node for the given
+        feedback on the current node's guess. If it does not (the secret is not
+        one the tree was built for), the tree is left for good, and the feedback
+        followed so far replayed through get_feedback to narrow the possible words.
+        
+        Parameters:
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+        
+        Returns:
+            bool:
+                Whether the feedback leads to a node of the tree
+        '''
+        if self.decision_tree is None or self.tree_node is None:
+            return False
+        if self.decision_tree.child(self.tree_node, (edit_dist, encode_transforms(transforms))) is not None:
+            return True
+        history, self.tree_node = self.tree_history, None
+        for followed in history:
+            self.get_feedback(*followed)
+        return False
+    
+    def apply_feedback(self, guess: str, edit_dist: int, transforms: list[str], survivors: Iterable[str],
+                       on_tree: Optional[bool] = None, positions: Optional[np.ndarray] = None) -> None:
+        '''
+        Last phase of get_feedback: narrows the possible words down to the given
+        survivors, i.e., the words of feedback_candidates that produce the same
+        feedback. Split from get_feedback so that the checking in between can be
+        done elsewhere, e.g., batched across games (see distle_lockstep).
+        
+        Parameters:
+            guess (str):
+                The last, incorrect guess made by this DistlePlayer
+            edit_dist (int):
+                The edit distance between the guess and the secret word
+            transforms (list[str]):
+                The top-down transforms turning the guess into the secret word
+            survivors (Iterable[str]):
+                The words still possible given the feedback; ignored while following
+                the decision tree
+            on_tree (Optional[bool]):
+                Whether the feedback leads to a node of the decision tree, if the
+                caller already checked (see _on_tree); checked here if None
+            positions (Optional[np.ndarray]):
+                The positions of the survivors in the dictionary, narrowing a
+                CandidateSet directly; survivors are ignored if given
+        '''
+        target: Feedback = (edit_dist, encode_transforms(transforms))
+        self.last_feedback = target
+        if on_tree is None:
+            on_tree = self._on_tree(edit_dist, transforms)
+        if on_tree:
+            assert self.decision_tree is not None and self.tree_node is not None
+            self.tree_node = self.decision_tree.child(self.tree_node, target)
+            self.tree_history.append((guess, edit_dist, transforms))
+            return
+        if isinstance(self.possible_words, CandidateSet):
+            if positions is not None:
+                self.possible_words.intersect(positions)
+            else:
+                self.possible_words.keep(survivors)
+        else:
+            self.possible_words = set(survivors)
+            self.length_index = LengthIndex(self.possible_words)
+        if self.use_distance_matrix:
+            if self.distance_matrix is None and len(self.possible_words) <= self.matrix_threshold:
+                self.distance_matrix = DistanceMatrix.of_words(sorted(self.possible_words))
+            if self.distance_matrix is None:
+                return
+            if isinstance(self.possible_words, CandidateSet) and self.distance_matrix.words is self.possible_words.dictionary.words:
+                self.matrix_rows = self.possible_words.survivors()
+            else:
+                rows = [self.distance_matrix.index(word) for word in self.possible_words]
+                self.matrix_rows = np.array(sorted(row for row in rows if row is not None), dtype=np.int64)
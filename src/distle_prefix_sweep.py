@@ -0,0 +1,289 @@
+from distle_dictionary import FrozenDictionary, dictionary_hash
+from typing import *
+import numpy as np
+import os
+'''
+Shared-prefix edit distance sweep over a dictionary's trie. Sorted neighbours
+share long prefixes (e.g., aah, aahed, aahing), and the rows of the OSA table of
+a guess against a word only depend on the word's prefix so far, so each row is
+computed once per trie node and shared by every word below it: the DP work scales
+with the number of nodes of the trie rather than with the words' total characters
+(~43k against ~145k for dictionary6).
+
+The trie is swept level by level, each level's rows computed for all of its
+nodes at once with NumPy, from their parents' (and, for transpositions, their
+grandparents') rows. Every row also bounds the distance of all the words below
+its node, so nodes too far from the guess are dropped along with their subtrees.
+'''
+
+# Distance assigned to words beyond a sweep's max_dist (or pruned, or excluded by
+# length), as any value above max_dist is
+_FAR: int = np.iinfo(np.int32).max // 2
+
+class PrefixSweep:
+    '''
+    Trie of sorted words flattened into per-level node arrays, for sweeping the
+    OSA distances of a guess against all of them at once (see module docstring).
+    '''
+
+    def __init__(self, words: Sequence[str]) -> None:
+        '''
+        Constructs a new PrefixSweep over the given words.
+
+        Parameters:
+            words (Sequence[str]):
+                The words to sweep; must be sorted
+        '''
+        self.words: Sequence[str] = words
+        # Per level d (nodes of depth d + 1): each node's character, the position
+        # of its parent in the level above, and the length of its longest word
+        self.level_chars: list[np.ndarray] = []
+        self.level_parents: list[np.ndarray] = []
+        self.level_max_lengths: list[np.ndarray] = []
+        # Per word: the level and position of the node it ends at; and per level,
+        # the words ending there
+        self.end_levels: np.ndarray = np.zeros(len(words), dtype = np.int64)
+        self.end_positions: np.ndarray = np.zeros(len(words), dtype = np.int64)
+        self.level_ends: list[np.ndarray] = []
+
+        chars: list[list[int]] = []
+        parents: list[list[int]] = []
+        max_lengths: list[list[int]] = []
+        previous = ""
+        for index, word in enumerate(words):
+            shared = len(os.path.commonprefix([previous, word]))
+            for depth in range(len(word)):
+                if depth >= len(chars):
+                    chars.append([])
+                    parents.append([])
+                    max_lengths.append([])
+                if depth < shared:
+                    max_lengths[depth][-1] = max(max_lengths[depth][-1], len(word))
+                    continue
+                chars[depth].append(ord(word[depth]))
+                parents[depth].append(len(chars[depth - 1]) - 1 if depth > 0 else 0)
+                max_lengths[depth].append(len(word))
+            # The empty word ends at the root, level -1
+            self.end_levels[index] = len(word) - 1
+            self.end_positions[index] = len(chars[len(word) - 1]) - 1 if len(word) > 0 else 0
+            previous = word
+        for level in range(len(chars)):
+            self.level_chars.append(np.array(chars[level], dtype = np.int32))
+            self.level_parents.append(np.array(parents[level], dtype = np.int64))
+            self.level_max_lengths.append(np.array(max_lengths[level], dtype = np.int64))
+            self.level_ends.append(np.flatnonzero(self.end_levels == level))
+
+    def __len__(self) -> int:
+        '''
+        Returns the number of swept words.
+
+        Returns:
+            int:
+                The number of words
+        '''
+        return len(self.words)
+
+    def n_nodes(self) -> int:
+        '''
+        Returns the number of nodes of the trie, i.e., of rows a full sweep computes.
+
+        Returns:
+            int:
+                The number of nodes, the root excluded
+        '''
+        return sum(len(chars) for chars in self.level_chars)
+
+    def distances(self, guess: str, max_dist: int, length: Optional[int] = None) -> np.ndarray:
+        '''
+        Returns the OSA edit distance between the guess and every swept word, as
+        far as max_dist: words further away are only known to be, and so get some
+        larger distance.
+
+        Parameters:
+            guess (str):
+                The word to measure distances from
+            max_dist (int):
+                The largest distance computed exactly
+            length (Optional[int]):
+                If given, words of any other length get a larger distance too,
+                and are pruned as such
+
+        Returns:
+            np.ndarray:
+                The distance of each word, aligned with words
+        '''
+        guess_len = len(guess)
+        guess_codes = np.array([ord(char) for char in guess], dtype = np.int32)
+        cols = np.arange(guess_len + 1)
+
+        result = np.full(len(self.words), _FAR, dtype = np.int64)
+        if len(self.words) == 0:
+            return result
+        # Rows and bounds of the previous two levels' live nodes, addressed through
+        # per-level maps from node position to row (-1 if pruned)
+        root_row = cols[None, :]
+        level_rows: list[np.ndarray] = [root_row]
+        level_maps: list[np.ndarray] = [np.zeros(1, dtype = np.int64)]
+        longest = np.array([max(len(word) for word in self.words)])
+        level_bounds: list[np.ndarray] = [self._lower_bounds(root_row, 0, guess_len, longest, length)]
+        if level_bounds[0][0] > max_dist:
+            return result
+        result[self.end_levels < 0] = guess_len if length is None or length == 0 else _FAR
+
+        for level, chars in enumerate(self.level_chars):
+            depth = level + 1
+            if length is not None and depth > length:
+                break
+            parents = self.level_parents[level]
+            parent_rows = level_maps[-1][parents]
+            live = np.flatnonzero(parent_rows >= 0)
+            if len(live) == 0:
+                break
+            node_map = np.full(len(chars), -1, dtype = np.int64)
+            above = level_rows[-1][parent_rows[live]]
+            node_chars = chars[live]
+
+            best = np.empty_like(above)
+            best[:, 0] = depth
+            best[:, 1:] = np.minimum(above[:, 1:] + 1, above[:, :-1] + (node_chars[:, None] != guess_codes[None, :]))
+            if level > 0 and guess_len > 1:
+                grand_positions = self.level_parents[level - 1][parents[live]]
+                parent_chars = self.level_chars[level - 1][parents[live]]
+                # The node's and its parent's characters, swapped, match the guess'
+                swapped = (node_chars[:, None] == guess_codes[None, :-1]) & (parent_chars[:, None] == guess_codes[None, 1:])
+                grand_rows = level_maps[-2][grand_positions]
+                grand = level_rows[-2][np.maximum(grand_rows, 0)]
+                swapped &= (grand_rows >= 0)[:, None]
+                best[:, 2:] = np.where(swapped, np.minimum(best[:, 2:], grand[:, :-2] + 1), best[:, 2:])
+            # Insertions chain along the row: row[j] = min(best[j], row[j - 1] + 1)
+            rows = np.minimum.accumulate(best - cols, axis = 1) + cols
+
+            # A transposition can also skip this level, from the one above it
+            bounds = np.minimum(self._lower_bounds(rows, depth, guess_len, self.level_max_lengths[level][live], length),
+                                level_bounds[-1][level_maps[-1][parents[live]]] + 1)
+            keep = bounds <= max_dist
+            node_map[live[keep]] = np.arange(int(keep.sum()))
+            level_rows = [level_rows[-1], rows[keep]]
+            level_maps = [level_maps[-1], node_map]
+            level_bounds = [level_bounds[-1], bounds[keep]]
+
+            ending = self.level_ends[level]
+            if len(ending) > 0:
+                ending_rows = node_map[self.end_positions[ending]]
+                found = ending_rows >= 0
+                if length is not None:
+                    found &= depth == length
+                result[ending[found]] = level_rows[-1][ending_rows[found], guess_len]
+        result[result > max_dist] = _FAR
+        return result
+
+    def _lower_bounds(self, rows: np.ndarray, depth: int, guess_len: int, max_lengths: np.ndarray,
+                      length: Optional[int]) -> np.ndarray:
+        '''
+        Returns lower bounds on the distance between the guess and every word below
+        each of the given rows' nodes: whichever cell of the row a word's alignment
+        goes through, the rest of the word and of the guess still differ in length
+        by at least as many edits.
+
+        Parameters:
+            rows (np.ndarray):
+                The (nodes, guess_len + 1) rows of the nodes
+            depth (int):
+                The depth of the nodes
+            guess_len (int):
+                The length of the guess
+            max_lengths (np.ndarray):
+                The length of the longest word below each node
+            length (Optional[int]):
+                The only length of the words of interest, if any
+
+        Returns:
+            np.ndarray:
+                The bound of each node
+        '''
+        rests = guess_len - np.arange(guess_len + 1)
+        if length is not None:
+            # The word's rest is exactly length - depth characters long
+            gaps = np.abs(rests - (length - depth))[None, :]
+        else:
+            # The word's rest is between 0 and its longest word's rest long
+            high = (max_lengths - depth)[:, None]
+            gaps = np.maximum(rests[None, :] - high, 0)
+        bounds: np.ndarray = (rows + gaps).min(axis = 1)
+        return bounds
+
+    def within(self, guess: str, max_dist: int, length: Optional[int] = None) -> list[tuple[str, int]]:
+        '''
+        Returns the swept words within the given OSA edit distance of the guess.
+
+        Parameters:
+            guess (str):
+                The word to measure distances from
+            max_dist (int):
+                The largest distance of the words requested
+            length (Optional[int]):
+                The only length of the words requested, if any
+
+        Returns:
+            list[tuple[str, int]]:
+                The (word, distance) of every word within max_dist, in order
+        '''
+        distances = self.distances(guess, max_dist, length)
+        return [(self.words[index], int(distances[index])) for index in np.flatnonzero(distances <= max_dist).tolist()]
+
+    def positions_at_distance(self, guess: str, edit_dist: int, length: Optional[int] = None) -> np.ndarray:
+        '''
+        Returns the positions of the swept words at exactly the given OSA edit
+        distance from the guess.
+
+        Parameters:
+            guess (str):
+                The word to measure distances from
+            edit_dist (int):
+                The distance of the words requested
+            length (Optional[int]):
+                The only length of the words requested, if any
+
+        Returns:
+            np.ndarray:
+                The positions of the words at that distance, in increasing order
+        '''
+        return np.flatnonzero(self.distances(guess, edit_dist, length) == edit_dist)
+
+    def at_distance(self, guess: str, edit_dist: int, length: Optional[int] = None) -> list[str]:
+        '''
+        Returns the swept words at exactly the given OSA edit distance from the guess.
+
+        Parameters:
+            guess (str):
+                The word to measure distances from
+            edit_dist (int):
+                The distance of the words requested
+            length (Optional[int]):
+                The only length of the words requested, if any
+
+        Returns:
+            list[str]:
+                The words at that distance, in order
+        '''
+        return [self.words[index] for index in self.positions_at_distance(guess, edit_dist, length).tolist()]
+
+_sweeps_by_hash: dict[str, PrefixSweep] = {}
+
+def dictionary_sweep(dictionary: FrozenDictionary) -> PrefixSweep:
+    '''
+    Returns the PrefixSweep over the given dictionary's words, built once per
+    process and dictionary.
+
+    Parameters:
+        dictionary (FrozenDictionary):
+            The dictionary to sweep
+
+    Returns:
+        PrefixSweep:
+            The dictionary's shared sweep
+    '''
+    words_hash = dictionary_hash(dictionary)
+    if words_hash not in _sweeps_by_hash:
+        _sweeps_by_hash[words_hash] = PrefixSweep(dictionary.words)
+    return _sweeps_by_hash[words_hash]
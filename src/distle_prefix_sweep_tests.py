@@ -0,0 +1,39 @@
+import unittest
+import pytest
+from distle_prefix_sweep import *
+from distle_dictionary import load_dictionary
+from distle_player import DistlePlayer
+from edit_dist_utils import edit_distance, feedback_signature
+
+class DistlePrefixSweepTests(unittest.TestCase):
+    """
+    Unit tests for validating the shared-prefix distance sweep against edit_distance.
+    """
+    
+    WORDS: list[str] = sorted(["aah", "aahed", "aahing", "aahs", "abhor", "ah", "ha", "hah", "stone", "stones", "tsone",
+                               "atone", "ton", "tone", "", "stoned", "abhorrent"])
+    
+    def test_sweep_distances_t0(self) -> None:
+        sweep = PrefixSweep(self.WORDS)
+        self.assertLess(sweep.n_nodes(), sum(len(word) for word in self.WORDS))
+        for guess in ["aah", "stone", "ahh", "x", "", "stoens", "abhorrence"]:
+            for max_dist in range(0, 8):
+                expected = [(word, edit_distance(guess, word)) for word in self.WORDS if edit_distance(guess, word) <= max_dist]
+                self.assertEqual(expected, sweep.within(guess, max_dist), (guess, max_dist))
+                for length in (0, 3, 5):
+                    self.assertEqual([word for word, distance in expected if distance == max_dist and len(word) == length],
+                                     sweep.at_distance(guess, max_dist, length), (guess, max_dist, length))
+    
+    def test_sweep_player_t0(self) -> None:
+        dictionary = load_dictionary("../dat/dictionary6.txt")
+        swept, scanned = DistlePlayer(use_prefix_sweep = True), DistlePlayer(use_prefix_sweep = False)
+        for guess, secret in [("stone", "atone"), ("stone", "tones"), ("stone", "notes"), ("grouch", "crouch"), ("grouch", "grouts"), ("stone", "grouch")]:
+            edit_dist, encoded = feedback_signature(guess, secret)
+            for player in (swept, scanned):
+                player.start_new_game(dictionary, 10)
+                player.get_feedback(guess, edit_dist, list(encoded))
+            self.assertIn(secret, swept.possible_words)
+            self.assertEqual(scanned.possible_words, swept.possible_words)
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,361 @@
+from typing import *
+import cProfile
+import functools
+import io
+import os
+import pstats
+import time
+import tracemalloc
+'''
+Profilers for runs of the game show (see distle_game_show.py), for finding out
+which functions the time goes to, and which lines the memory is allocated at:
+    - CPU: the games run under cProfile, whose stats are dumped in pstats format
+      (for snakeviz, gprof2dot, or pstats itself) and as collapsed stacks (for
+      flamegraph.pl, speedscope, or inferno)
+    - Memory: tracemalloc snapshots are taken around every call of the player's
+      start_new_game, make_guess and get_feedback, and the allocations each call
+      leaves behind are attributed to the lines that made them
+Both end with a top-N summary, printed by the game show.
+'''
+
+# Player methods MemoryProfiler measures
+PROFILED_METHODS: tuple[str, ...] = ("start_new_game", "make_guess", "get_feedback")
+
+# Frames of each allocation's traceback MemoryProfiler keeps; only the innermost
+# is used to group allocation sites, but the rest helps when inspecting snapshots
+TRACEMALLOC_FRAMES: int = 8
+
+# Share of a function's calls below which collapsed_stacks stops descending into
+# its callees, as such stacks amount to less than a microsecond anyway
+MIN_STACK_SHARE: float = 1e-6
+
+def _frame_name(func: tuple[str, int, str]) -> str:
+    '''
+    Returns the name of a function in a collapsed stack, without its directory nor
+    the separators of the format.
+
+    Parameters:
+        func (tuple[str, int, str]):
+            The function's (file, line, name), as keyed in pstats
+
+    Returns:
+        str:
+            The function's name, e.g., distle_player.py:120(make_guess)
+    '''
+    file, line, name = func
+    # Builtins have no file, but are named as {built-in method ...}
+    full_name = name if file == "~" else os.path.basename(file) + ":" + str(line) + "(" + name + ")"
+    return full_name.replace(";", ":").replace(" ", "_")
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    '''
+    Returns the self time of every call stack of the given profile, in collapsed
+    (flamegraph) form. cProfile only records callers one level up, so stacks are
+    rebuilt from the profile's roots down, each function's time being split among
+    the stacks calling it in proportion to the cumulative time of its calls from
+    each; recursive calls are folded into their outermost frame.
+
+    Parameters:
+        stats (pstats.Stats):
+            The profile
+
+    Returns:
+        dict[str, int]:
+            The self time, in microseconds, of each stack of semicolon-separated
+            frames, outermost first; stacks of no measurable time are left out
+    '''
+    # (call count, recursive call count, self time, cumulative time, callers), where
+    # callers maps each caller to the same first four of the calls it made
+    entries: dict[Any, Any] = stats.stats  # type: ignore[attr-defined]
+    callees: dict[Any, list[Any]] = {func: [] for func in entries}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            if caller in callees:
+                callees[caller].append(func)
+    roots = [func for func, entry in entries.items() if not any(caller in entries for caller in entry[4])]
+
+    stacks: dict[str, float] = {}
+    def descend(func: Any, stack: list[Any], names: str, share: float) -> None:
+        self_time = entries[func][2] * share
+        if self_time > 0:
+            stacks[names] = stacks.get(names, 0.0) + self_time
+        stack.append(func)
+        for callee in callees[func]:
+            if callee in stack:
+                continue
+            callee_time = entries[callee][3]
+            edge_time = entries[callee][4][func][3]
+            callee_share = share * (edge_time / callee_time if callee_time > 0 else 0.0)
+            if callee_share >= MIN_STACK_SHARE:
+                descend(callee, stack, names + ";" + _frame_name(callee), callee_share)
+        stack.pop()
+
+    for root in roots:
+        descend(root, [], _frame_name(root), 1.0)
+    return {names: round(seconds * 1e6) for names, seconds in stacks.items() if round(seconds * 1e6) > 0}
+
+class CpuProfiler:
+    '''
+    Profiles the CPU time of the code run within its context with cProfile.
+    '''
+
+    def __init__(self) -> None:
+        '''
+        Constructs a new CpuProfiler, not yet profiling.
+        '''
+        self.profile: cProfile.Profile = cProfile.Profile()
+
+    def __enter__(self) -> "CpuProfiler":
+        '''
+        Starts profiling.
+
+        Returns:
+            CpuProfiler:
+                This profiler
+        '''
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        '''
+        Stops profiling.
+        '''
+        self.profile.disable()
+
+    def stats(self) -> pstats.Stats:
+        '''
+        Returns the stats of everything profiled so far.
+
+        Returns:
+            pstats.Stats:
+                The profile's stats
+        '''
+        return pstats.Stats(self.profile, stream = io.StringIO())
+
+    def save(self, prefix: str) -> list[str]:
+        '''
+        Writes the profile to prefix.pstats and its collapsed stacks to
+        prefix.folded, one "frame;frame;frame microseconds" line per stack.
+
+        Parameters:
+            prefix (str):
+                Path of the files, without extension
+
+        Returns:
+            list[str]:
+                The paths written
+        '''
+        stats_path, folded_path = prefix + ".pstats", prefix + ".folded"
+        self.stats().dump_stats(stats_path)
+        with open(folded_path, "w") as file:
+            for names, micros in sorted(collapsed_stacks(self.stats()).items()):
+                file.write(names + " " + str(micros) + "\n")
+        return [stats_path, folded_path]
+
+    def summary(self, top_n: int) -> str:
+        '''
+        Returns the top_n functions taking the most time of their own, and the
+        top_n taking the most including their callees.
+
+        Parameters:
+            top_n (int):
+                The number of functions of each list
+
+        Returns:
+            str:
+                The summary, as printed by pstats
+        '''
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profile, stream = stream).strip_dirs()
+        stream.write("[!] Hottest functions by own time:\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(top_n)
+        stream.write("[!] Hottest functions by cumulative time:\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+        return stream.getvalue()
+
+class PhaseMemory(NamedTuple):
+    '''
+    Memory measurements of all the calls of one profiled player method, in bytes.
+    '''
+    calls: int
+    seconds: float
+    net_size: int
+    peak_size: int
+
+class MemoryProfiler:
+    '''
+    Profiles the allocations of a player's PROFILED_METHODS with tracemalloc,
+    snapshotting the traced memory around each call. Snapshots are slow, so
+    profiled games are much slower than usual, but they only measure the
+    player's calls, not the game around them.
+    '''
+
+    def __init__(self, frames: int = TRACEMALLOC_FRAMES) -> None:
+        '''
+        Constructs a new MemoryProfiler, not yet tracing.
+
+        Parameters:
+            frames (int):
+                The number of frames kept of each allocation's traceback
+        '''
+        self.frames: int = frames
+        # Per method: calls, seconds, net size and peak size, and per method and
+        # allocation site (file:line): net size and count left behind
+        self.phases: dict[str, PhaseMemory] = {}
+        self.sites: dict[tuple[str, str], tuple[int, int]] = {}
+        self._was_tracing: bool = False
+        # Number of measured calls under way, as calls the player makes to its own
+        # profiled methods are part of the outer call's measurements
+        self._depth: int = 0
+
+    def __enter__(self) -> "MemoryProfiler":
+        '''
+        Starts tracing allocations, if not already traced.
+
+        Returns:
+            MemoryProfiler:
+                This profiler
+        '''
+        self._was_tracing = tracemalloc.is_tracing()
+        if not self._was_tracing:
+            tracemalloc.start(self.frames)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        '''
+        Stops tracing allocations, unless they were traced before entering.
+        '''
+        if not self._was_tracing:
+            tracemalloc.stop()
+
+    def wrap(self, player: Any) -> Any:
+        '''
+        Makes every call of the given player's PROFILED_METHODS measured, by
+        shadowing them with measuring wrappers on the instance.
+
+        Parameters:
+            player (Any):
+                The player to profile, e.g., a DistlePlayer
+
+        Returns:
+            Any:
+                The same player
+        '''
+        for name in PROFILED_METHODS:
+            setattr(player, name, self._measured(name, getattr(player, name)))
+        return player
+
+    def _measured(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        '''
+        Returns a wrapper of the given bound method measuring every call of it.
+
+        Parameters:
+            name (str):
+                The method's name, under which it is reported
+            method (Callable[..., Any]):
+                The method to measure
+
+        Returns:
+            Callable[..., Any]:
+                The measuring wrapper
+        '''
+        @functools.wraps(method)
+        def measured(*args: Any, **kwargs: Any) -> Any:
+            if self._depth > 0 or not tracemalloc.is_tracing():
+                return method(*args, **kwargs)
+            self._depth += 1
+            before = self._snapshot()
+            tracemalloc.reset_peak()
+            start_size = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start
+                self._depth -= 1
+                end_size, peak = tracemalloc.get_traced_memory()
+                self._record(name, seconds, end_size - start_size, peak - start_size, self._snapshot().compare_to(before, "lineno"))
+        return measured
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        '''
+        Returns a snapshot of the traced memory, without tracemalloc's own and the
+        import machinery's allocations.
+
+        Returns:
+            tracemalloc.Snapshot:
+                The filtered snapshot
+        '''
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    def _record(self, name: str, seconds: float, net_size: int, peak_size: int, diffs: list[tracemalloc.StatisticDiff]) -> None:
+        '''
+        Adds the measurements of one call to the totals.
+
+        Parameters:
+            name (str):
+                The method called
+            seconds (float):
+                The duration of the call, snapshots excluded
+            net_size (int):
+                The traced memory it left allocated
+            peak_size (int):
+                The most traced memory it had allocated at once
+            diffs (list[tracemalloc.StatisticDiff]):
+                The snapshots' differences, by allocation line
+        '''
+        phase = self.phases.get(name, PhaseMemory(0, 0.0, 0, 0))
+        self.phases[name] = PhaseMemory(phase.calls + 1, phase.seconds + seconds, phase.net_size + net_size,
+                                        max(phase.peak_size, peak_size))
+        for diff in diffs:
+            if diff.size_diff == 0 and diff.count_diff == 0:
+                continue
+            frame = diff.traceback[0]
+            key = (name, frame.filename + ":" + str(frame.lineno))
+            size, count = self.sites.get(key, (0, 0))
+            self.sites[key] = (size + diff.size_diff, count + diff.count_diff)
+
+    def top_sites(self, top_n: int) -> list[tuple[str, str, int, int]]:
+        '''
+        Returns the top_n allocation sites leaving the most memory behind across
+        the profiled calls.
+
+        Parameters:
+            top_n (int):
+                The number of sites
+
+        Returns:
+            list[tuple[str, str, int, int]]:
+                The (method, file:line, net size, net count) of each site, largest first
+        '''
+        ranked = sorted(self.sites.items(), key = lambda item: abs(item[1][0]), reverse = True)
+        return [(name, site, size, count) for (name, site), (size, count) in ranked[:top_n]]
+
+    def summary(self, top_n: int) -> str:
+        '''
+        Returns the memory of each profiled method, and the top_n allocation sites.
+
+        Parameters:
+            top_n (int):
+                The number of sites
+
+        Returns:
+            str:
+                The summary, one line per method and site
+        '''
+        lines = ["[!] Memory by player method (KiB):",
+                 "  {:<16}{:>8}{:>12}{:>12}{:>12}".format("method", "calls", "seconds", "net", "peak")]
+        for name in PROFILED_METHODS:
+            if name in self.phases:
+                phase = self.phases[name]
+                lines.append("  {:<16}{:>8}{:>12.3f}{:>12.1f}{:>12.1f}".format(name, phase.calls, phase.seconds,
+                                                                             phase.net_size / 1024, phase.peak_size / 1024))
+        lines.append("[!] Top allocation sites by net size (KiB):")
+        for name, site, size, count in self.top_sites(top_n):
+            lines.append("  {:>10.1f} KiB {:>8} blocks  {:<16}{}".format(size / 1024, count, name, site))
+        return "\n".join(lines)
@@ -0,0 +1,37 @@
+import unittest
+import pytest
+import os
+import tempfile
+from distle_game import *
+from distle_profiling import *
+
+class DistleProfilingTests(unittest.TestCase):
+    """
+    Unit tests for validating the CPU and memory profilers of the game show.
+    """
+    
+    def test_cpu_profiler_t0(self) -> None:
+        game = DistleGame("../dat/testing.txt", False, DistlePlayer())
+        with CpuProfiler() as profiler:
+            self.assertTrue(game.new_game(10, "strobe"))
+        stacks = collapsed_stacks(profiler.stats())
+        self.assertTrue(any("(make_guess);" in names for names in stacks))
+        self.assertTrue(all(micros > 0 and not " " in names for names, micros in stacks.items()))
+        self.assertIn("new_game", profiler.summary(5))
+        with tempfile.TemporaryDirectory() as directory:
+            paths = profiler.save(os.path.join(directory, "profile"))
+            self.assertTrue(all(os.path.exists(path) for path in paths))
+        
+    def test_memory_profiler_t0(self) -> None:
+        profiler = MemoryProfiler()
+        game = DistleGame("../dat/testing.txt", False, profiler.wrap(DistlePlayer()))
+        with profiler:
+            self.assertTrue(game.new_game(10, "stone"))
+        self.assertEqual(set(PROFILED_METHODS), set(profiler.phases))
+        self.assertEqual(1, profiler.phases["start_new_game"].calls)
+        self.assertGreaterEqual(profiler.phases["make_guess"].calls, 1)
+        self.assertLessEqual(len(profiler.top_sites(3)), 3)
+        self.assertIn("get_feedback", profiler.summary(3))
+        
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+from distle_game import *
+from distle_prefix_sweep import dictionary_sweep
+import multiprocessing
+import multiprocessing.pool
+'''
+Reusable, persistent process-pool runner for Distle game shows. The dictionary,
+its indexes and the player's lookup tables are loaded once in the parent and
+shared with every worker: copy-on-write through fork where available, and
+otherwise through the page cache when the dictionary is compiled (see
+distle_dictionary.compile_dictionary), since every process memory-maps the same
+file. Each task then only carries the index of a secret word, and results stream
+back as games complete.
+'''
+
+# The game each worker process plays its rounds with, created once per worker
+_worker_game: Optional["DistleGame"] = None
+_worker_max_guesses: int = 0
+
+def _init_worker(dictionary_path: str, player_factory: Callable[[], "DistlePlayer"], max_guesses: int) -> None:
+    '''
+    Process-pool initializer creating the worker's DistleGame. With fork, the
+    dictionary the parent already loaded is reused rather than read again.
+
+    Parameters:
+        dictionary_path (str):
+            Path to the game show's dictionary
+        player_factory (Callable[[], DistlePlayer]):
+            Creates the worker's player
+        max_guesses (int):
+            The maximum number of guesses per game
+    '''
+    global _worker_game, _worker_max_guesses
+    _worker_game = DistleGame(dictionary_path, False, player_factory())
+    _worker_max_guesses = max_guesses
+
+def _play_round(task: tuple[int, int]) -> tuple[int, bool]:
+    '''
+    Plays one round of the game show in a worker.
+
+    Parameters:
+        task (tuple[int, int]):
+            The (round number, index of the secret word in the dictionary)
+
+    Returns:
+        tuple[int, bool]:
+            The round number and whether the player won it
+    '''
+    round_number, rand_ind = task
+    assert _worker_game is not None
+    return round_number, _worker_game.new_game(_worker_max_guesses, rand_ind = rand_ind)
+
+class GameShowRunner:
+    '''
+    Runs rounds of Distle against a fixed dictionary on a pool of worker processes
+    that persists across calls to run, so that workers (and their loaded state)
+    are reused from one batch of rounds to the next. Use as a context manager, or
+    call close when done.
+    '''
+
+    def __init__(self, dictionary_path: str, player_factory: Callable[[], "DistlePlayer"] = DistlePlayer,
+                 max_guesses: int = 10, n_workers: int = 1) -> None:
+        '''
+        Constructs a new GameShowRunner, starting its worker processes.
+
+        Parameters:
+            dictionary_path (str):
+                Path to the dictionary, of either format, relative to the src directory
+            player_factory (Callable[[], DistlePlayer]):
+                Creates each worker's player; must be picklable if fork is unavailable
+            max_guesses (int):
+                The maximum number of guesses per game
+            n_workers (int):
+                The number of worker processes; 1 plays every round in this process
+        '''
+        self.max_guesses: int = max_guesses
+        self.n_workers: int = n_workers
+        player = player_factory()
+        self.game: DistleGame = DistleGame(dictionary_path, False, player)
+        self.warm_up(player)
+        self._pool: Optional[multiprocessing.pool.Pool] = None
+        if n_workers > 1:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            self._pool = context.Pool(n_workers, _init_worker, (dictionary_path, player_factory, max_guesses))
+
+    def warm_up(self, player: DistlePlayer) -> None:
+        '''
+        Builds the dictionary's lazily computed state in this process, before any
+        worker is forked, so that workers share it copy-on-write rather than each
+        building its own.
+
+        Parameters:
+            player (DistlePlayer):
+                A player as the workers' are, whose per-dictionary tables are built too
+        '''
+        dictionary = self.game.dictionary
+        dictionary.warm()
+        if player.use_prefix_sweep:
+            # Fills the per-process sweep cache, which the workers' players then look up
+            dictionary_sweep(dictionary)
+
+    def get_dictionary_size(self) -> int:
+        '''
+        Getter for the number of words in the runner's dictionary.
+
+        Returns:
+            int:
+                The number of words in the dictionary
+        '''
+        return self.game.get_dictionary_size()
+
+    def run(self, rand_inds: Iterable[int]) -> Iterator[tuple[int, bool]]:
+        '''
+        Plays one round per given secret word index, yielding each round's result
+        as soon as it completes, in completion order.
+
+        Parameters:
+            rand_inds (Iterable[int]):
+                The index of the secret word of each round
+
+        Returns:
+            Iterator[tuple[int, bool]]:
+                The round number (position in rand_inds) and whether the player won
+        '''
+        tasks = enumerate(rand_inds)
+        if self._pool is None:
+            for round_number, rand_ind in tasks:
+                yield round_number, self.game.new_game(self.max_guesses, rand_ind = rand_ind)
+        else:
+            yield from self._pool.imap_unordered(_play_round, tasks)
+
+    def close(self) -> None:
+        '''
+        Shuts down the runner's worker processes.
+        '''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self) -> "GameShowRunner":
+        '''
+        Returns this runner, for use as a context manager.
+
+        Returns:
+            GameShowRunner:
+                This runner
+        '''
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        '''
+        Closes this runner on leaving its context.
+        '''
+        self.close()
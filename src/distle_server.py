@@ -0,0 +1,293 @@
+from distle_dictionary import FrozenDictionary, load_dictionary
+from edit_dist_utils import *
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import multiprocessing
+import os
+import random
+'''
+Asyncio server hosting many concurrent Distle sessions, for human and bot
+clients alike, over a TCP or Unix socket. Dictionaries are loaded once and
+shared by every session, and the feedback of guesses (the CPU-heavy part) is
+computed in an executor so that no client ever stalls the event loop.
+
+Protocol: each request and response is one JSON object on its own line.
+    {"op": "new", "dictionary": "dictionary6", "max_guesses": 10}
+        => {"ok": true, "session": 1, "dictionary_size": 10000, "max_guesses": 10}
+    {"op": "guess", "session": 1, "guess": "stone"}
+        => {"ok": true, "valid": true, "won": false, "over": false, "guesses": 1,
+            "distance": 2, "transforms": ["R", "I"]}
+    {"op": "close", "session": 1}
+        => {"ok": true}
+"dictionary" defaults to the server's first, and the secret is revealed as "word"
+once a game is lost. Invalid requests get {"ok": false, "error": "..."}, and a
+client's sessions end when it disconnects.
+
+Usage:
+    python distle_server.py ../dat/dictionary6.txt [more dictionaries] [--port 7130 | --unix path]
+'''
+
+# Default TCP port of the server
+DEFAULT_PORT: int = 7130
+
+# The maximum number of guesses of a session that does not ask for another
+DEFAULT_MAX_GUESSES: int = 10
+
+class DistleSession:
+    '''
+    One game of Distle hosted by a DistleServer, following the rules of
+    DistleGame: a guess not in the dictionary loses the turn, and the game is
+    lost once max_guesses guesses are made without guessing the secret.
+    '''
+
+    def __init__(self, dictionary: FrozenDictionary, word: str, max_guesses: int) -> None:
+        '''
+        Constructs a new DistleSession.
+
+        Parameters:
+            dictionary (FrozenDictionary):
+                The dictionary the secret and the guesses are drawn from
+            word (str):
+                The secret word
+            max_guesses (int):
+                The maximum number of guesses
+        '''
+        self.dictionary: FrozenDictionary = dictionary
+        self.word: str = word
+        self.max_guesses: int = max_guesses
+        self.guesses: int = 0
+        self.won: bool = False
+
+    def is_over(self) -> bool:
+        '''
+        Returns whether the game has ended, won or lost.
+
+        Returns:
+            bool:
+                Whether no more guesses are accepted
+        '''
+        return self.won or self.guesses >= self.max_guesses
+
+    def report(self, valid: bool, feedback: Optional[Feedback]) -> dict[str, Any]:
+        '''
+        Records a guess, given its feedback, and returns the response to it.
+
+        Parameters:
+            valid (bool):
+                Whether the guess was in the dictionary
+            feedback (Optional[Feedback]):
+                The guess's feedback_signature against the secret, if valid
+
+        Returns:
+            dict[str, Any]:
+                The response to the guess
+        '''
+        self.guesses += 1
+        response: dict[str, Any] = {"ok": True, "valid": valid, "won": False}
+        if feedback is not None:
+            distance, encoded = feedback
+            self.won = distance == 0
+            response.update(won = self.won, distance = distance, transforms = list(encoded))
+        response.update(over = self.is_over(), guesses = self.guesses)
+        if self.is_over() and not self.won:
+            response["word"] = self.word
+        return response
+
+class DistleServer:
+    '''
+    Hosts DistleSessions over line-delimited JSON (see module docstring).
+    '''
+
+    def __init__(self, dictionary_paths: Sequence[str], executor: Optional[concurrent.futures.Executor] = None) -> None:
+        '''
+        Constructs a new DistleServer, loading its dictionaries.
+
+        Parameters:
+            dictionary_paths (Sequence[str]):
+                Paths of the dictionaries to host, of either format, each known to
+                clients by its file name without extension; the first is the default
+            executor (Optional[concurrent.futures.Executor]):
+                Where feedback is computed; the event loop's default executor if None
+        '''
+        if len(dictionary_paths) == 0:
+            raise ValueError("[X] Server needs at least one dictionary")
+        self.dictionaries: dict[str, FrozenDictionary] = {}
+        for path in dictionary_paths:
+            name = os.path.splitext(os.path.basename(path))[0]
+            self.dictionaries[name] = load_dictionary(path)
+            # Warmed up once here so that sessions never build its state themselves
+            self.dictionaries[name].warm()
+        self.default_dictionary: str = next(iter(self.dictionaries))
+        self.executor: Optional[concurrent.futures.Executor] = executor
+        self.sessions: dict[int, DistleSession] = {}
+        self._session_ids: Iterator[int] = itertools.count(1)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, unix_path: Optional[str] = None) -> asyncio.Server:
+        '''
+        Starts accepting clients on the given TCP address or Unix socket.
+
+        Parameters:
+            host (str):
+                Interface to listen on, for TCP
+            port (int):
+                Port to listen on, for TCP; 0 picks a free one
+            unix_path (Optional[str]):
+                Path of a Unix socket to listen on instead of TCP
+
+        Returns:
+            asyncio.Server:
+                The listening server, to be closed when done
+        '''
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_client, unix_path)
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        '''
+        Serves one client's requests, one line at a time, until it disconnects,
+        then ends its remaining sessions.
+
+        Parameters:
+            reader (asyncio.StreamReader):
+                The client's requests
+            writer (asyncio.StreamWriter):
+                Where the responses are written
+        '''
+        owned: set[int] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_request(line, owned)
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # Disconnected, or sent a line past the stream limit
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def handle_request(self, line: bytes, owned: set[int]) -> dict[str, Any]:
+        '''
+        Returns the response to one request line of a client.
+
+        Parameters:
+            line (bytes):
+                The JSON request
+            owned (set[int]):
+                The ids of the client's sessions, which only it may use
+
+        Returns:
+            dict[str, Any]:
+                The JSON response
+        '''
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("[X] Request must be a JSON object")
+            op = request.get("op")
+            if op == "new":
+                return self.new_session(request, owned)
+            session_id = request.get("session")
+            if not isinstance(session_id, int) or isinstance(session_id, bool) or not session_id in owned:
+                raise ValueError("[X] No such session: " + str(session_id))
+            if op == "guess":
+                return await self.guess(self.sessions[session_id], request.get("guess"))
+            if op == "close":
+                owned.discard(session_id)
+                self.sessions.pop(session_id, None)
+                return {"ok": True}
+            raise ValueError("[X] Unknown op: " + str(op))
+        except ValueError as error:
+            return {"ok": False, "error": str(error)}
+
+    def new_session(self, request: dict[str, Any], owned: set[int]) -> dict[str, Any]:
+        '''
+        Starts a session as asked by a "new" request, with a random secret.
+
+        Parameters:
+            request (dict[str, Any]):
+                The request, with optional "dictionary" and "max_guesses"
+            owned (set[int]):
+                The ids of the client's sessions, which the new one joins
+
+        Returns:
+            dict[str, Any]:
+                The response, holding the new session's id
+        '''
+        name = request.get("dictionary", self.default_dictionary)
+        if not name in self.dictionaries:
+            raise ValueError("[X] Dictionary must be one of " + str(sorted(self.dictionaries)) + ", but was " + str(name))
+        max_guesses = request.get("max_guesses", DEFAULT_MAX_GUESSES)
+        if not isinstance(max_guesses, int) or isinstance(max_guesses, bool) or max_guesses < 1:
+            raise ValueError("[X] Max guesses must be a positive int, but was " + str(max_guesses))
+        dictionary = self.dictionaries[name]
+        session_id = next(self._session_ids)
+        self.sessions[session_id] = DistleSession(dictionary, random.choice(dictionary.words), max_guesses)
+        owned.add(session_id)
+        return {"ok": True, "session": session_id, "dictionary_size": len(dictionary), "max_guesses": max_guesses}
+
+    async def guess(self, session: DistleSession, guess: Any) -> dict[str, Any]:
+        '''
+        Plays a guess in the given session, computing its feedback in the executor.
+
+        Parameters:
+            session (DistleSession):
+                The session guessed in
+            guess (Any):
+                The guess, which must be a str
+
+        Returns:
+            dict[str, Any]:
+                The response to the guess
+        '''
+        if not isinstance(guess, str):
+            raise ValueError("[X] Guess must be a str, but was " + str(guess))
+        if session.is_over():
+            raise ValueError("[X] Session is over")
+        if not guess in session.dictionary:
+            return session.report(False, None)
+        feedback = await asyncio.get_running_loop().run_in_executor(self.executor, feedback_signature, guess, session.word)
+        return session.report(True, feedback)
+
+async def _serve_forever(server: DistleServer, host: str, port: int, unix_path: Optional[str]) -> None:
+    '''
+    Runs the given server until interrupted.
+
+    Parameters:
+        server (DistleServer):
+            The server to run
+        host, port, unix_path:
+            Where to listen; see DistleServer.serve
+    '''
+    listener = await server.serve(host, port, unix_path)
+    print("[!] Serving Distle on " + (unix_path if unix_path is not None else host + ":" + str(port)))
+    async with listener:
+        await listener.serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Hosts concurrent Distle sessions over line-delimited JSON")
+    parser.add_argument("dictionaries", nargs = "+", help = "dictionary files to host")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = DEFAULT_PORT)
+    parser.add_argument("--unix", help = "path of a Unix socket to listen on instead of TCP")
+    parser.add_argument("--workers", type = int, default = 0, help = "feedback worker processes; threads if 0")
+    args = parser.parse_args()
+
+    pool: Optional[concurrent.futures.Executor] = None
+    if args.workers > 0:
+        methods = multiprocessing.get_all_start_methods()
+        pool = concurrent.futures.ProcessPoolExecutor(args.workers, multiprocessing.get_context("fork" if "fork" in methods else None))
+    try:
+        asyncio.run(_serve_forever(DistleServer(args.dictionaries, pool), args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if pool is not None:
+            pool.shutdown()
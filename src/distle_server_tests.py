@@ -0,0 +1,100 @@
+import unittest
+import pytest
+import asyncio
+import json
+import os
+import tempfile
+from distle_load_generator import *
+from distle_server import *
+
+async def _exchange(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, request: Any) -> dict[str, Any]:
+    writer.write((json.dumps(request) + "\n").encode())
+    await writer.drain()
+    response: dict[str, Any] = json.loads(await reader.readline())
+    return response
+
+class DistleServerTests(unittest.TestCase):
+    """
+    Unit tests for validating the asyncio Distle session server and its load generator.
+    """
+    
+    def test_server_session_t0(self) -> None:
+        async def play() -> None:
+            server = DistleServer(["../dat/testing.txt"])
+            listener = await server.serve(port = 0)
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            created = await _exchange(reader, writer, {"op": "new", "max_guesses": 3})
+            self.assertEqual({"ok": True, "session": created["session"], "dictionary_size": 6, "max_guesses": 3}, created)
+            session = server.sessions[created["session"]]
+            wrong = "stone" if session.word != "stone" else "shone"
+            
+            response = await _exchange(reader, writer, {"op": "guess", "session": created["session"], "guess": "zzz"})
+            self.assertEqual({"ok": True, "valid": False, "won": False, "over": False, "guesses": 1}, response)
+            response = await _exchange(reader, writer, {"op": "guess", "session": created["session"], "guess": wrong})
+            distance, encoded = feedback_signature(wrong, session.word)
+            self.assertEqual({"ok": True, "valid": True, "won": False, "over": False, "guesses": 2,
+                              "distance": distance, "transforms": list(encoded)}, response)
+            response = await _exchange(reader, writer, {"op": "guess", "session": created["session"], "guess": session.word})
+            self.assertTrue(response["won"] and response["over"])
+            response = await _exchange(reader, writer, {"op": "guess", "session": created["session"], "guess": session.word})
+            self.assertFalse(response["ok"])
+            
+            self.assertEqual({"ok": True}, await _exchange(reader, writer, {"op": "close", "session": created["session"]}))
+            self.assertEqual({}, server.sessions)
+            writer.close()
+            listener.close()
+            await listener.wait_closed()
+        asyncio.run(play())
+        
+    def test_server_errors_t0(self) -> None:
+        async def play() -> None:
+            server = DistleServer(["../dat/testing.txt"])
+            listener = await server.serve(port = 0)
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            for request in ([1, 2], {"op": "new", "dictionary": "missing"}, {"op": "new", "max_guesses": 0},
+                            {"op": "new", "max_guesses": True}, {"op": "guess", "session": [1], "guess": "stone"},
+                            {"op": "guess", "session": 1, "guess": "stone"}, {"op": "dance"}):
+                self.assertFalse((await _exchange(reader, writer, request))["ok"])
+            writer.write(b"not json\n")
+            await writer.drain()
+            self.assertFalse(json.loads(await reader.readline())["ok"])
+            
+            # A client's sessions end when it disconnects
+            created = await _exchange(reader, writer, {"op": "new"})
+            self.assertEqual(1, len(server.sessions))
+            # Session ids must be ints, not bools equal to one
+            self.assertEqual(1, created["session"])
+            self.assertFalse((await _exchange(reader, writer, {"op": "close", "session": True}))["ok"])
+            self.assertEqual(1, len(server.sessions))
+            writer.close()
+            await writer.wait_closed()
+            for _ in range(100):
+                if not server.sessions:
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual({}, server.sessions)
+            listener.close()
+            await listener.wait_closed()
+        asyncio.run(play())
+        
+    def test_load_generator_t0(self) -> None:
+        async def play() -> dict[str, float]:
+            with tempfile.TemporaryDirectory() as directory:
+                unix_path = os.path.join(directory, "distle.sock")
+                listener = await DistleServer(["../dat/testing.txt"]).serve(unix_path = unix_path)
+                report = await generate_load("../dat/testing.txt", 8, 3, "player", unix_path = unix_path)
+                listener.close()
+                await listener.wait_closed()
+                return report
+        report = asyncio.run(play())
+        self.assertEqual(24, report["games"])
+        self.assertEqual(24, report["wins"])
+        self.assertGreater(report["requests"], 2 * 24)
+        # The player bots' thinking is reported apart from the requests' latencies
+        self.assertGreater(report["think_p99_ms"], 0)
+        self.assertLessEqual(report["think_p50_ms"], report["think_p99_ms"])
+        with pytest.raises(ValueError):
+            asyncio.run(generate_load("../dat/testing.txt", 1, 1, "oracle"))
+        
+if __name__ == '__main__':
+    unittest.main()
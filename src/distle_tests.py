@@ -2,8 +2,8 @@ import unittest
 import pytest
 import random
 from distle_game import *
+from distle_runner import GameShowRunner
 import multiprocessing
-from joblib import Parallel, delayed # type: ignore
 
 # The number of rounds each dictionary will be run on, choosing a random word each time
 # Grading Default: 100
@@ -40,7 +40,9 @@ def run_game_show(dict_path: str) -> list[bool]:
     and using the provided dictionary.
     
     [!] Employs parallel processing to run as many games in parallel as there are
-    cores on your computer. Set N_CORES to 1 for easier debugging.
+    cores on your computer, on a GameShowRunner whose workers share the dictionary
+    and only receive the index of each round's secret. Set N_CORES to 1 for easier
+    debugging.
     
     Parameters:
         dict_path (str):
@@ -50,29 +52,13 @@ def run_game_show(dict_path: str) -> list[bool]:
         list[bool]:
             The list of games won specified as booleans (True = won, False = lost)
     '''
-    game = DistleGame(dict_path, False, DistlePlayer())
-    word_count = game.get_dictionary_size()
-    rng = random.Random(SEED)
-    rand_inds = [rng.randint(0, word_count-1) for _ in range(GAMESHOW_ROUNDS)]
-    sim_results: list[bool] = Parallel(n_jobs=N_CORES, verbose=1)(delayed(run_game_show_round)(game, rand_inds[i]) for i in range(GAMESHOW_ROUNDS))
+    with GameShowRunner(dict_path, DistlePlayer, MAX_GUESSES, N_CORES) as runner:
+        word_count = runner.get_dictionary_size()
+        rng = random.Random(SEED)
+        rand_inds = [rng.randint(0, word_count-1) for _ in range(GAMESHOW_ROUNDS)]
+        sim_results: list[bool] = [won for _, won in runner.run(rand_inds)]
     return sim_results
 
-def run_game_show_round(game: "DistleGame", rand_ind: int) -> bool:
-    '''
-    Runs a single round of the DistleGame; simple but used for parallel processing.
-    
-    Parameters:
-        game (DistleGame):
-            The game being run
-        rand_ind (int):
-            The index of the random word to be chosen for this game
-            
-    Returns:
-        bool:
-            Whether or not the player won this game
-    '''
-    return game.new_game(MAX_GUESSES, rand_ind = rand_ind)
-
 class DistleTests(unittest.TestCase):
     """
     Unit tests for validating the DistlePlayer functionality. Notes:
@@ -100,6 +86,22 @@ class DistleTests(unittest.TestCase):
         print("[!] " + self._testMethodName + " Tests: " + str(wins) + " / " + str(GAMESHOW_ROUNDS))
         return float(wins) / GAMESHOW_ROUNDS
     
+    def test_game_show_runner_t0(self) -> None:
+        rand_inds = [0, 1, 2, 3, 4, 5]
+        with GameShowRunner("../dat/testing.txt", DistlePlayer, MAX_GUESSES, 2) as runner:
+            self.assertEqual(6, runner.get_dictionary_size())
+            results = sorted(runner.run(rand_inds))
+        self.assertEqual(list(range(len(rand_inds))), [round_number for round_number, _ in results])
+        self.assertTrue(all(won for _, won in results))
+        
+    def test_distle_player_time_budget_t0(self) -> None:
+        # Even without any time to score guesses, the player still plays on
+        game = DistleGame("../dat/dictionary6.txt", False, DistlePlayer(time_budget = 0.0))
+        self.assertIsInstance(game.new_game(MAX_GUESSES, rand_ind = 0), bool)
+        player = DistlePlayer()
+        player.start_new_game(game.dictionary, MAX_GUESSES)
+        self.assertIn(player.make_guess(time_budget = 0.0), game.dictionary)
+        
     @pytest.mark.timeout(DISTLE_GAME_TIMEOUT)
     def test_distle_player_dict_6(self) -> None:
         sim_results = run_game_show("../dat/dictionary6.txt")
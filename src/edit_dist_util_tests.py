@@ -1,5 +1,6 @@
 import unittest
 import pytest
+import random
 from edit_dist_utils import *
 
 class EditDistUtilTests(unittest.TestCase):
@@ -47,6 +48,44 @@ class EditDistUtilTests(unittest.TestCase):
     def test_edit_dist_t7(self) -> None:
         self.assertEqual(4, edit_distance("aaaabcde", "aaaedbca"))
         
+    # Bit-Parallel Edit Distance Tests
+    # -------------------------------------------------
+    
+    def test_bit_parallel_edit_dist_t0(self) -> None:
+        self.assertEqual(0, bit_parallel_edit_distance("", ""))
+        self.assertEqual(2, bit_parallel_edit_distance("", "aa"))
+        self.assertEqual(2, bit_parallel_edit_distance("aa", ""))
+        self.assertEqual(1, bit_parallel_edit_distance("bar", "bra"))
+        self.assertEqual(5, bit_parallel_edit_distance("parisss", "parsimony"))
+        self.assertEqual(3, bit_parallel_edit_distance("wxyyxw", "wyxxyx"))
+        self.assertEqual(4, bit_parallel_edit_distance("aaaabcde", "aaaedbca"))
+        
+    def test_bit_parallel_edit_dist_t1(self) -> None:
+        # Reused masks and exhaustive agreement with the table version
+        pairs = [(s0, s1) for s0 in ["", "ab", "abc", "cab", "abba", "hack"] for s1 in ["", "ba", "acb", "fkc", "baab", "kcah"]]
+        for s0, s1 in pairs:
+            masks = get_match_masks(s0)
+            self.assertEqual(edit_distance(s0, s1), bit_parallel_edit_distance(s0, s1, masks))
+        
+    def test_bit_parallel_edit_dist_t2(self) -> None:
+        # Patterns longer than a machine word use the fallback
+        s0 = "ab" * 40
+        s1 = "ba" * 40
+        self.assertEqual(edit_distance(s0, s1), bit_parallel_edit_distance(s0, s1))
+        
+    # Batched Edit Distance Tests
+    # -------------------------------------------------
+    
+    def test_edit_distances_t0(self) -> None:
+        self.assertEqual([], edit_distances("abc", []).tolist())
+        self.assertEqual([0, 1, 1, 2], edit_distances("", ["", "a", "b", "ab"]).tolist())
+        self.assertEqual([3, 0, 1, 1], edit_distances("bar", ["", "bar", "bra", "bart"]).tolist())
+        
+    def test_edit_distances_t1(self) -> None:
+        guess = "aaaabcde"
+        candidates = ["aaaedbca", "parisss", "parsimony", "wxyyxw", "wyxxyx", "abcde", "edbca", "a", ""]
+        self.assertEqual([edit_distance(guess, c) for c in candidates], edit_distances(guess, candidates).tolist())
+        
     # Transform List Tests
     # -------------------------------------------------
     
@@ -121,5 +160,141 @@ class EditDistUtilTests(unittest.TestCase):
         self.assertEqual(["R", "R", "T"], get_transformation_list(s0, s1))
         self.assertEqual(["R", "R", "T"], get_transformation_list(s1, s0))
         
+    # Feedback Signature Tests
+    # -------------------------------------------------
+    
+    def test_feedback_signature_t0(self) -> None:
+        self.assertEqual((0, ""), feedback_signature("", ""))
+        self.assertEqual((0, ""), feedback_signature("abc", "abc"))
+        self.assertEqual((3, "TRD"), feedback_signature("hack", "fkc"))
+        self.assertEqual((3, "TRI"), feedback_signature("fkc", "hack"))
+        
+    def test_feedback_signature_t1(self) -> None:
+        for s0, s1 in [("astound", "distant"), ("axbczy", "abxyzc"), ("parisss", "parsimony")]:
+            expected = (edit_distance(s0, s1), encode_transforms(get_transformation_list(s0, s1)))
+            self.assertEqual(expected, feedback_signature(s0, s1))
+        
+    # Iterative Transformation Backtrace Tests
+    # -------------------------------------------------
+    
+    def test_transform_list_iterative_t0(self) -> None:
+        pairs = [("", ""), ("a", ""), ("abc", "bac"), ("hack", "fkc"), ("fkc", "hack"), ("astound", "distant"),
+                 ("distant", "astound"), ("housemaid", "heartsick"), ("axbczy", "abxyzc"), ("aaaabcde", "aaaedbca")]
+        for s0, s1 in pairs:
+            table = get_edit_dist_table(s0, s1)
+            self.assertEqual(get_transformation_list_with_table(s0, s1, table), get_transformation_list_iterative(s0, s1, table))
+        
+    def test_transform_list_iterative_t1(self) -> None:
+        # Long enough to exceed the recursion limit of the recursive backtrace
+        s0 = "a" * 3000
+        s1 = ""
+        self.assertEqual(["D"] * 3000, get_transformation_list_iterative(s0, s1, get_edit_dist_table(s0, s1)))
+        self.assertEqual(["I"] * 3000, get_transformation_list_iterative(s1, s0, get_edit_dist_table(s1, s0)))
+        
+    def test_transforms_match_t0(self) -> None:
+        table = get_edit_dist_table("hack", "fkc")
+        self.assertTrue(transforms_match("hack", "fkc", table, ["T", "R", "D"]))
+        self.assertFalse(transforms_match("hack", "fkc", table, ["T", "R"]))
+        self.assertFalse(transforms_match("hack", "fkc", table, ["T", "R", "D", "D"]))
+        self.assertFalse(transforms_match("hack", "fkc", table, ["R", "R", "D"]))
+        
+    def test_matches_feedback_t0(self) -> None:
+        self.assertTrue(matches_feedback("astound", "distant", 5, ["R", "R", "D", "R", "I"]))
+        self.assertFalse(matches_feedback("astound", "distant", 4, ["R", "R", "D", "R", "I"]))
+        self.assertFalse(matches_feedback("astound", "distant", 5, ["R", "R", "I", "R", "D"]))
+        
+    def test_edit_distance_linear_t0(self) -> None:
+        pairs = [("", ""), ("a", ""), ("", "abc"), ("abc", "bac"), ("hack", "fkc"), ("astound", "distant"),
+                 ("housemaid", "heartsick"), ("axbczy", "abxyzc"), ("aaaabcde", "aaaedbca")]
+        for s0, s1 in pairs:
+            self.assertEqual(edit_distance(s0, s1), edit_distance_linear(s0, s1))
+            self.assertEqual(edit_distance(s1, s0), edit_distance_linear(s1, s0))
+        
+    def test_transform_list_linear_t0(self) -> None:
+        pairs = [("", ""), ("a", ""), ("", "abc"), ("abc", "bac"), ("hack", "fkc"), ("fkc", "hack"), ("astound", "distant"),
+                 ("distant", "astound"), ("housemaid", "heartsick"), ("axbczy", "abxyzc"), ("aaaabcde", "aaaedbca")]
+        for block_rows in (1, 2, 3, LINEAR_BLOCK_ROWS):
+            with pytest.MonkeyPatch.context() as patch:
+                patch.setattr("edit_dist_utils.LINEAR_BLOCK_ROWS", block_rows)
+                for s0, s1 in pairs:
+                    self.assertEqual(get_transformation_list(s0, s1), get_transformation_list_linear(s0, s1))
+        
+    def test_transform_list_linear_t1(self) -> None:
+        rng = random.Random(14)
+        with pytest.MonkeyPatch.context() as patch:
+            patch.setattr("edit_dist_utils.LINEAR_BLOCK_ROWS", 2)
+            for _ in range(300):
+                s0 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 20)))
+                s1 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 20)))
+                self.assertEqual(get_transformation_list(s0, s1), get_transformation_list_linear(s0, s1))
+        
+    def test_transform_list_linear_t2(self) -> None:
+        s0 = "ab" * 2000
+        s1 = "ba" * 2000
+        self.assertEqual(2, edit_distance_linear(s0, s1))
+        self.assertEqual(["I", "D"], get_transformation_list_linear(s0, s1))
+        self.assertEqual(["D"] * 4000, get_transformation_list_linear(s0, ""))
+        
+    def test_feedback_cache_t0(self) -> None:
+        cache = FeedbackCache(max_entries = 2)
+        self.assertEqual(feedback_signature("hack", "fkc"), cache.feedback("hack", "fkc"))
+        self.assertEqual(feedback_signature("hack", "fkc"), cache.feedback("hack", "fkc"))
+        cache.feedback("abc", "bac")
+        cache.feedback("hack", "fkc")
+        # ("abc", "bac") is now the least recently used, so is evicted first
+        cache.feedback("astound", "distant")
+        cache.feedback("hack", "fkc")
+        self.assertEqual({"hits": 3, "misses": 3, "evictions": 1, "entries": 2, "bytes": cache.size_bytes}, cache.stats())
+        cache.feedback("abc", "bac")
+        self.assertEqual(4, cache.misses)
+        self.assertAlmostEqual(3 / 7, cache.hit_rate())
+        
+    def test_feedback_cache_t1(self) -> None:
+        cache = FeedbackCache(max_entries = None, max_bytes = 1000)
+        for i in range(20):
+            cache.feedback("word" + str(i), "secret")
+        self.assertLessEqual(cache.size_bytes, 1000)
+        self.assertEqual(20, len(cache) + cache.evictions)
+        cache.clear()
+        self.assertEqual({"hits": 0, "misses": 0, "evictions": 0, "entries": 0, "bytes": 0}, cache.stats())
+        with pytest.raises(ValueError):
+            FeedbackCache(max_entries = -1)
+        
+    def test_edit_distance_pairs_t0(self) -> None:
+        guesses = ["", "a", "hack", "fkc", "astound", "housemaid", "axbczy", "abc"]
+        words = ["abc", "", "fkc", "hack", "distant", "heartsick", "abxyzc", "bac"]
+        self.assertEqual([edit_distance(g, w) for g, w in zip(guesses, words)], edit_distance_pairs(guesses, words).tolist())
+        self.assertEqual([], edit_distance_pairs([], []).tolist())
+        with pytest.raises(ValueError):
+            edit_distance_pairs(["abc"], [])
+        
+    def test_feedback_matches_t0(self) -> None:
+        rng = random.Random(16)
+        guesses = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 7))) for _ in range(400)]
+        words = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 7))) for _ in range(400)]
+        # Half the pairs get their own feedback, the others some other pair's
+        feedback = [feedback_signature(g, w if i % 2 == 0 else rng.choice(words)) for i, (g, w) in enumerate(zip(guesses, words))]
+        expected = [matches_feedback(g, w, dist, list(encoded)) for g, w, (dist, encoded) in zip(guesses, words, feedback)]
+        found = feedback_matches(guesses, words, [dist for dist, _ in feedback], [encoded for _, encoded in feedback])
+        self.assertEqual(expected, found.tolist())
+        self.assertTrue(all(found[::2]))
+        
+    def test_edit_distance_within_t0(self) -> None:
+        self.assertEqual(3, edit_distance_within("hack", "fkc", 3))
+        self.assertIsNone(edit_distance_within("hack", "fkc", 2))
+        self.assertEqual(0, edit_distance_within("abc", "abc", 0))
+        self.assertIsNone(edit_distance_within("abc", "abcdef", 2))
+        self.assertEqual(1, edit_distance_within("prefix-ab-suffix", "prefix-ba-suffix", 1))
+        self.assertIsNone(edit_distance_within("abc", "abd", -1))
+        
+    def test_edit_distance_within_t1(self) -> None:
+        rng = random.Random(18)
+        for _ in range(500):
+            s0 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            s1 = "".join(rng.choice("abc") for _ in range(rng.randint(0, 8)))
+            k = rng.randint(0, 6)
+            distance = edit_distance(s0, s1)
+            self.assertEqual(distance if distance <= k else None, edit_distance_within(s0, s1, k))
+        
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
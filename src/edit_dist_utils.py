@@ -1,4 +1,8 @@
 from typing import *
+from collections import OrderedDict
+import numpy as np
+import sys
+import threading
 '''
 Variety of functions related to computing the edit distance between
 strings and, importantly, which WILL be used by the DistleGame to
@@ -190,6 +194,1022 @@ def get_transformation_list_with_table(s0: str, s1: str, table: list[list[int]])
     do_stuff(c, r, final_list)
     return final_list
 
+# Iterative Transformation Backtrace
+# -------------------------------------------------
+
+def get_transformation_list_iterative(s0: str, s1: str, table: list[list[int]]) -> list[str]:
+    '''
+    Returns exactly the same transformation list as get_transformation_list_with_table
+    (including its tie-breaking: replacements, then transpositions, then insertions,
+    then deletions), but walks the already-solved memoization table with a loop
+    rather than recursion, so it neither allocates per step nor hits Python's
+    recursion limit on long strings.
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+        table (list[list[int]]):
+            The solved get_edit_dist_table(s0, s1)
+    
+    Returns:
+        list[str]:
+            The sequence of top-down manipulations required to turn s0 into s1
+    '''
+    transforms = _backtrace(s0, s1, table, None)
+    assert transforms is not None
+    return transforms
+
+def transforms_match(s0: str, s1: str, table: list[list[int]], target: Sequence[str]) -> bool:
+    '''
+    Returns whether get_transformation_list_with_table(s0, s1, table) == target,
+    stopping the backtrace as soon as the transforms produced so far stop being a
+    prefix of the target, so most mismatches are rejected within a few steps.
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+        table (list[list[int]]):
+            The solved get_edit_dist_table(s0, s1)
+        target (Sequence[str]):
+            The top-down transforms to compare against
+    
+    Returns:
+        bool:
+            Whether the transforms from s0 to s1 are exactly the target
+    '''
+    return _backtrace(s0, s1, table, target) is not None
+
+def matches_feedback(guess: str, secret: str, edit_dist: int, transforms: Sequence[str]) -> bool:
+    '''
+    Returns whether the DistleGame would give the guess the given feedback if the
+    secret were the given word, building the memoization table only once and
+    stopping the backtrace at the first transform differing from the feedback's.
+    
+    Parameters:
+        guess (str):
+            The guessed word
+        secret (str):
+            The candidate secret word
+        edit_dist (int):
+            The edit distance in the feedback
+        transforms (Sequence[str]):
+            The top-down transforms in the feedback
+    
+    Returns:
+        bool:
+            Whether the guess against the secret produces exactly that feedback
+    '''
+    table = get_edit_dist_table(guess, secret)
+    return table[len(guess)][len(secret)] == edit_dist and _backtrace(guess, secret, table, transforms) is not None
+
+def _backtrace(s0: str, s1: str, table: list[list[int]], target: Optional[Sequence[str]]) -> Optional[list[str]]:
+    '''
+    Walks the whole memoization table from its bottom-right cell (see _walk).
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+        table (list[list[int]]):
+            The solved get_edit_dist_table(s0, s1)
+        target (Optional[Sequence[str]]):
+            If given, the transforms expected, abandoning the walk at the first
+            manipulation that deviates from them
+    
+    Returns:
+        Optional[list[str]]:
+            The top-down transforms, or None if they deviated from the target
+    '''
+    transforms: list[str] = []
+    if _walk(s0, s1, table, [len(s0), len(s1)], -1, transforms, target) is None:
+        return None
+    if target is not None and len(transforms) != len(target):
+        return None
+    return transforms
+
+def _walk(s0: str, s1: str, table: Union[list[list[int]], "_RowWindow"], position: list[int], stop_row: int,
+          transforms: list[str], target: Optional[Sequence[str]]) -> Optional[bool]:
+    '''
+    Walks the memoization table from the given position until reaching a cell of 0,
+    each step moving to the neighboring cell with the minimal value, ties broken in
+    the order R, T, I, D, and recording the step's manipulation unless the cell's
+    value carried over unchanged (i.e., characters matched).
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+        table (Union[list[list[int]], _RowWindow]):
+            The solved table, or a window onto the rows of it around the walk
+        position (list[int]):
+            The [row, col] to start from; updated to where the walk stopped
+        stop_row (int):
+            The walk pauses upon reaching this row or above, before taking a step
+        transforms (list[str]):
+            The manipulations recorded so far, appended to in top-down order
+        target (Optional[Sequence[str]]):
+            If given, the transforms expected, abandoning the walk at the first
+            manipulation that deviates from them
+    
+    Returns:
+        Optional[bool]:
+            True if a cell of 0 was reached, False if paused at stop_row, and
+            None if the transforms deviated from the target
+    '''
+    row, col = position
+    unreachable = len(s0) + len(s1) + 1
+    while table[row][col] != 0:
+        if row <= stop_row:
+            position[0], position[1] = row, col
+            return False
+        current = table[row][col]
+        insertion = table[row][col-1] if col > 0 else unreachable
+        deletion = table[row-1][col] if row > 0 else unreachable
+        replacement = table[row-1][col-1] if row > 0 and col > 0 else unreachable
+        transposition = unreachable
+        if row >= 2 and col >= 2 and s0[row-1] == s1[col-2] and s0[row-2] == s1[col-1]:
+            transposition = table[row-2][col-2]
+        
+        if replacement <= transposition and replacement <= insertion and replacement <= deletion:
+            step, previous, row, col = "R", replacement, row - 1, col - 1
+        elif transposition <= insertion and transposition <= deletion:
+            step, previous, row, col = "T", transposition, row - 2, col - 2
+        elif insertion <= deletion:
+            step, previous, col = "I", insertion, col - 1
+        else:
+            step, previous, row = "D", deletion, row - 1
+        
+        if previous != current:
+            if target is not None and (len(transforms) >= len(target) or target[len(transforms)] != step):
+                return None
+            transforms.append(step)
+    position[0], position[1] = row, col
+    return True
+
+# Linear-Memory Edit Distance
+# -------------------------------------------------
+
+# Number of rows below which the divide-and-conquer backtrace of
+# get_transformation_list_linear stops splitting and keeps every row
+LINEAR_BLOCK_ROWS: int = 64
+
+def _next_osa_row(prev2: np.ndarray, prev1: np.ndarray, row: int, s0: str, col_codes: np.ndarray) -> np.ndarray:
+    '''
+    Computes one row of the memoization table of get_edit_dist_table(s0, s1) from
+    the two rows above it, vectorized across columns: every cell's replacement,
+    deletion and transposition options only depend on the rows above, and the
+    remaining chain of insertions along the row, row[c] = min(row[c], row[c-1] + 1),
+    is a running minimum of row[c] - c, shifted back by c.
+    
+    Parameters:
+        prev2 (np.ndarray):
+            Row row - 2 of the table (ignored for rows below 2)
+        prev1 (np.ndarray):
+            Row row - 1 of the table
+        row (int):
+            Index of the row to compute, at least 1
+        s0 (str):
+            The string along the table's rows
+        col_codes (np.ndarray):
+            Character codes of the string along the table's columns
+    
+    Returns:
+        np.ndarray:
+            Row row of the table
+    '''
+    char = ord(s0[row-1])
+    best = np.empty_like(prev1)
+    best[0] = row
+    best[1:] = np.minimum(prev1[:-1] + (col_codes != char), prev1[1:] + 1)
+    if row >= 2 and len(col_codes) >= 2:
+        transposable = (col_codes[:-1] == char) & (col_codes[1:] == ord(s0[row-2]))
+        best[2:] = np.where(transposable, np.minimum(best[2:], prev2[:-2] + 1), best[2:])
+    offsets = np.arange(len(best), dtype = best.dtype)
+    return np.minimum.accumulate(best - offsets) + offsets
+
+def edit_distance_linear(s0: str, s1: str) -> int:
+    '''
+    Returns edit_distance(s0, s1), but computed keeping only the three most recent
+    rows of the memoization table (the current one and the two that transpositions
+    and other manipulations reach back to), each computed in vectorized fashion,
+    so memory stays linear in the shorter string's length.
+    
+    Parameters:
+        s0, s1 (str):
+            The strings to compute the edit distance between
+    
+    Returns:
+        int:
+            The minimal number of string manipulations
+    '''
+    if s0 == s1: return 0
+    if len(s1) > len(s0):
+        s0, s1 = s1, s0
+    col_codes = np.array([ord(char) for char in s1], dtype = np.int64)
+    prev2 = prev1 = np.arange(len(s1) + 1, dtype = np.int64)
+    for row in range(1, len(s0) + 1):
+        prev2, prev1 = prev1, _next_osa_row(prev2, prev1, row, s0, col_codes)
+    return int(prev1[len(s1)])
+
+class _RowWindow:
+    '''
+    Window onto consecutive rows of a memoization table, indexed by absolute row
+    like the full table would be.
+    '''
+    
+    def __init__(self, first_row: int, rows: list[list[int]]) -> None:
+        '''
+        Constructs a new _RowWindow.
+        
+        Parameters:
+            first_row (int):
+                The absolute index of the first of the rows
+            rows (list[list[int]]):
+                Consecutive rows of the table
+        '''
+        self.first_row: int = first_row
+        self.rows: list[list[int]] = rows
+    
+    def __getitem__(self, row: int) -> list[int]:
+        '''
+        Returns the table's row of the given absolute index.
+        
+        Parameters:
+            row (int):
+                The index of the row, within the window
+        
+        Returns:
+            list[int]:
+                The row
+        '''
+        return self.rows[row - self.first_row]
+
+def get_transformation_list_linear(s0: str, s1: str) -> list[str]:
+    '''
+    Returns exactly the same transformation list as get_transformation_list(s0, s1),
+    but without ever holding the whole memoization table: the rows are split in
+    half recursively, with the bottom half (where the top-down backtrace starts)
+    traced before the top half, each half recomputing its rows from the pair of
+    rows saved at its top. Only those pairs along the current recursion path, plus
+    one block of at most LINEAR_BLOCK_ROWS rows, are held at a time, i.e.,
+    O(len(s1) * (LINEAR_BLOCK_ROWS + log(len(s0)))) memory, at the cost of
+    recomputing each row O(log(len(s0))) times.
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+    
+    Returns:
+        list[str]:
+            The sequence of top-down manipulations required to turn s0 into s1
+    '''
+    col_codes = np.array([ord(char) for char in s1], dtype = np.int64)
+    above_first = np.full(len(s1) + 1, len(s0) + len(s1) + 1, dtype = np.int64)
+    first = np.arange(len(s1) + 1, dtype = np.int64)
+    transforms: list[str] = []
+    _trace_block(s0, s1, col_codes, 0, above_first, first, len(s0), [len(s0), len(s1)], transforms)
+    return transforms
+
+def _trace_block(s0: str, s1: str, col_codes: np.ndarray, top: int, above_top_row: np.ndarray, top_row: np.ndarray,
+                 bottom: int, position: list[int], transforms: list[str]) -> bool:
+    '''
+    Continues the backtrace of get_transformation_list_linear through the rows
+    top..bottom of the table, given the rows top - 1 and top, until it leaves the
+    block upward or finishes.
+    
+    Parameters:
+        s0, s1 (str):
+            Start and destination strings for the transformation
+        col_codes (np.ndarray):
+            Character codes of s1
+        top (int):
+            Index of the block's first row
+        above_top_row (np.ndarray):
+            Row top - 1 of the table (unused if top is 0)
+        top_row (np.ndarray):
+            Row top of the table
+        bottom (int):
+            Index of the block's last row
+        position (list[int]):
+            The [row, col] the backtrace is at, with row <= bottom; updated as it moves
+        transforms (list[str]):
+            The manipulations recorded so far, appended to in top-down order
+    
+    Returns:
+        bool:
+            Whether the backtrace finished
+    '''
+    if bottom - top <= LINEAR_BLOCK_ROWS:
+        rows = [above_top_row, top_row]
+        for row in range(top + 1, bottom + 1):
+            rows.append(_next_osa_row(rows[-2], rows[-1], row, s0, col_codes))
+        window = _RowWindow(top - 1, [row_values.tolist() for row_values in rows])
+        return bool(_walk(s0, s1, window, position, top if top > 0 else -1, transforms, None))
+    
+    middle = (top + bottom) // 2
+    above_middle, middle_row = above_top_row, top_row
+    for row in range(top + 1, middle + 1):
+        above_middle, middle_row = middle_row, _next_osa_row(above_middle, middle_row, row, s0, col_codes)
+    if position[0] > middle and _trace_block(s0, s1, col_codes, middle, above_middle, middle_row, bottom, position, transforms):
+        return True
+    del above_middle, middle_row
+    return _trace_block(s0, s1, col_codes, top, above_top_row, top_row, middle, position, transforms)
+
+# Full Damerau-Levenshtein Distance
+# -------------------------------------------------
+
+def damerau_levenshtein_distance(s0: str, s1: str) -> int:
+    '''
+    Returns the unrestricted Damerau-Levenshtein distance between two strings,
+    which, unlike edit_distance (the restricted, OSA variant), allows further edits
+    between transposed characters and so satisfies the triangle inequality. It
+    never exceeds edit_distance(s0, s1), nor is it ever less than half of it.
+    
+    Parameters:
+        s0, s1 (str):
+            The strings to compute the distance between
+    
+    Returns:
+        int:
+            The minimal number of string manipulations, unrestricted
+    '''
+    unreachable = len(s0) + len(s1)
+    # Table is offset by one row and column of unreachable sentinels
+    table = [[unreachable] * (len(s1) + 2) for _ in range(len(s0) + 2)]
+    for row in range(len(s0) + 1):
+        table[row + 1][1] = row
+    for col in range(len(s1) + 1):
+        table[1][col + 1] = col
+    
+    last_row_of: dict[str, int] = {}
+    for row in range(1, len(s0) + 1):
+        last_match_col = 0
+        for col in range(1, len(s1) + 1):
+            swap_row = last_row_of.get(s1[col-1], 0)
+            swap_col = last_match_col
+            cost = 1
+            if s0[row-1] == s1[col-1]:
+                cost = 0
+                last_match_col = col
+            table[row + 1][col + 1] = min(table[row][col] + cost,
+                                          table[row + 1][col] + 1,
+                                          table[row][col + 1] + 1,
+                                          table[swap_row][swap_col] + (row - swap_row - 1) + 1 + (col - swap_col - 1))
+        last_row_of[s0[row-1]] = row
+    return table[len(s0) + 1][len(s1) + 1]
+
+# Feedback Signatures
+# -------------------------------------------------
+
+# Hashable summary of the feedback a guess receives: the edit distance together
+# with the top-down transforms joined into a single str, e.g., (3, "TRD")
+Feedback = tuple[int, str]
+
+def encode_transforms(transforms: list[str]) -> str:
+    '''
+    Returns the compact, hashable encoding of a transformation list used by
+    feedback signatures, e.g., ["T", "R", "D"] => "TRD".
+    
+    Parameters:
+        transforms (list[str]):
+            The top-down transforms, as returned by get_transformation_list
+    
+    Returns:
+        str:
+            The transforms joined into a single str
+    '''
+    return "".join(transforms)
+
+def feedback_signature(guess: str, secret: str) -> Feedback:
+    '''
+    Returns the feedback the DistleGame would give for the guess against the
+    secret, i.e., (edit_distance(guess, secret), get_transformation_list(guess, secret))
+    with the transforms encoded by encode_transforms, but building the memoization
+    table only once for both.
+    
+    Parameters:
+        guess (str):
+            The guessed word
+        secret (str):
+            The word the guess is compared against
+    
+    Returns:
+        Feedback:
+            The (distance, encoded transforms) pair, usable as a dict key
+    '''
+    if guess == secret:
+        return (0, "")
+    table = get_edit_dist_table(guess, secret)
+    return (table[len(guess)][len(secret)], encode_transforms(get_transformation_list_iterative(guess, secret, table)))
+
+# Feedback Cache
+# -------------------------------------------------
+
+# Default bound on the number of (guess, secret) pairs a FeedbackCache holds
+DEFAULT_FEEDBACK_CACHE_ENTRIES: int = 100000
+
+# Estimated bytes of bookkeeping per FeedbackCache entry beyond its strs: the
+# key and value tuples, the distance int and the OrderedDict's links
+_CACHE_ENTRY_OVERHEAD: int = 200
+
+class FeedbackCache:
+    '''
+    Bounded, least-recently-used memo of feedback_signature results keyed by the
+    (guess, secret) pair, so that feedback computed once (e.g., by a DistlePlayer
+    scoring guesses) is not recomputed (e.g., by the DistleGame for the same pair).
+    All operations are guarded by a lock, so one cache can be shared by every
+    game and player of a process, across threads.
+    '''
+    
+    def __init__(self, max_entries: Optional[int] = DEFAULT_FEEDBACK_CACHE_ENTRIES, max_bytes: Optional[int] = None) -> None:
+        '''
+        Constructs a new, empty FeedbackCache.
+        
+        Parameters:
+            max_entries (Optional[int]):
+                The most pairs held before the least recently used are evicted;
+                unbounded if None
+            max_bytes (Optional[int]):
+                The most (estimated) bytes held before the least recently used
+                pairs are evicted; unbounded if None
+        '''
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("[X] Cache size bound must be non-negative, but was " + str(max_entries))
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("[X] Cache byte bound must be non-negative, but was " + str(max_bytes))
+        self.max_entries: Optional[int] = max_entries
+        self.max_bytes: Optional[int] = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.size_bytes: int = 0
+        self._entries: OrderedDict[tuple[str, str], Feedback] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        '''
+        Returns the number of pairs currently held.
+        
+        Returns:
+            int:
+                The number of cached pairs
+        '''
+        return len(self._entries)
+    
+    def feedback(self, guess: str, secret: str) -> Feedback:
+        '''
+        Returns feedback_signature(guess, secret), computing it only if the pair is
+        not already cached, then marking the pair as most recently used.
+        
+        Parameters:
+            guess (str):
+                The guessed word
+            secret (str):
+                The word the guess is compared against
+        
+        Returns:
+            Feedback:
+                The (distance, encoded transforms) pair
+        '''
+        key = (guess, secret)
+        with self._lock:
+            found = self._entries.get(key)
+            if found is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return found
+            self.misses += 1
+        # Computed outside of the lock, so that threads only contend on bookkeeping
+        result = feedback_signature(guess, secret)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = result
+                self.size_bytes += _entry_bytes(guess, secret, result)
+                self._evict()
+        return result
+    
+    def _evict(self) -> None:
+        '''
+        Drops least recently used pairs until within both bounds; the lock must
+        be held.
+        '''
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                                 or (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+            (guess, secret), result = self._entries.popitem(last = False)
+            self.size_bytes -= _entry_bytes(guess, secret, result)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        '''
+        Drops every cached pair and resets the statistics.
+        '''
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.size_bytes = 0
+    
+    def hit_rate(self) -> float:
+        '''
+        Returns the fraction of lookups answered from the cache.
+        
+        Returns:
+            float:
+                hits / (hits + misses), or 0 before any lookup
+        '''
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+    
+    def stats(self) -> dict[str, int]:
+        '''
+        Returns a snapshot of the cache's statistics.
+        
+        Returns:
+            dict[str, int]:
+                The cache's hits, misses, evictions, entries and (estimated) bytes
+        '''
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "entries": len(self._entries), "bytes": self.size_bytes}
+
+def _entry_bytes(guess: str, secret: str, result: Feedback) -> int:
+    '''
+    Returns the estimated memory held by one FeedbackCache entry.
+    
+    Parameters:
+        guess, secret (str):
+            The entry's key
+        result (Feedback):
+            The entry's value
+    
+    Returns:
+        int:
+            The estimated size of the entry in bytes
+    '''
+    return sys.getsizeof(guess) + sys.getsizeof(secret) + sys.getsizeof(result[1]) + _CACHE_ENTRY_OVERHEAD
+
+# Cache for the DistleGames and DistlePlayers of a process to share, when given
+# to them (their memoization is off by default, since players that sample the
+# guesses they score rarely see the same pair twice)
+shared_feedback_cache: FeedbackCache = FeedbackCache()
+
+# Bit-Parallel Edit Distance
+# -------------------------------------------------
+
+# Number of bits in a machine word; patterns longer than this fall back to the
+# table-based edit_distance rather than growing arbitrarily large Python ints
+WORD_BITS: int = 64
+
+def get_match_masks(pattern: str) -> dict[str, int]:
+    '''
+    Returns the per-character match bitmasks of the given pattern, as used by
+    bit_parallel_edit_distance: bit i of the mask for some character is set iff
+    pattern[i] is that character. Computing these once per guess and reusing them
+    for every candidate avoids redoing this work per comparison.
+    
+    Parameters:
+        pattern (str):
+            The string (typically the guess) to compute the match masks of
+    
+    Returns:
+        dict[str, int]:
+            Map from each character in the pattern to its match bitmask
+    '''
+    masks: dict[str, int] = {}
+    for index, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << index)
+    return masks
+
+def bit_parallel_edit_distance(pattern: str, text: str, masks: Optional[dict[str, int]] = None) -> int:
+    '''
+    Returns the same (restricted Damerau, a.k.a. Optimal String Alignment) edit
+    distance as edit_distance(pattern, text), but computed with Hyyro's extension of
+    Myers' bit-vector algorithm: each column of the memoization table is encoded as
+    vertical +1 / -1 delta bitvectors and advanced with a handful of word operations
+    per character of the text, rather than cell by cell.
+    
+    Patterns longer than WORD_BITS fall back to the table-based edit_distance.
+    
+    Parameters:
+        pattern (str):
+            The string along the bitvectors, typically the fixed guess
+        text (str):
+            The string scanned character by character, typically a candidate word
+        masks (Optional[dict[str, int]]):
+            The pattern's precomputed get_match_masks; computed here if None
+    
+    Returns:
+        int:
+            The minimal number of string manipulations
+    '''
+    pattern_len = len(pattern)
+    if pattern_len == 0:
+        return len(text)
+    if pattern_len > WORD_BITS:
+        return edit_distance(pattern, text)
+    if masks is None:
+        masks = get_match_masks(pattern)
+    
+    full = (1 << pattern_len) - 1
+    last_bit = 1 << (pattern_len - 1)
+    vert_pos, vert_neg, diag_zero, prev_match = full, 0, 0, 0
+    score = pattern_len
+    for char in text:
+        match = masks.get(char, 0)
+        transposed = (((~diag_zero) & match) << 1) & prev_match
+        diag_zero = ((((match & vert_pos) + vert_pos) ^ vert_pos) | match | vert_neg | transposed) & full
+        horiz_pos = vert_neg | (~(diag_zero | vert_pos) & full)
+        horiz_neg = diag_zero & vert_pos
+        if horiz_pos & last_bit:
+            score += 1
+        elif horiz_neg & last_bit:
+            score -= 1
+        horiz_pos = ((horiz_pos << 1) | 1) & full
+        horiz_neg = (horiz_neg << 1) & full
+        vert_pos = horiz_neg | (~(diag_zero | horiz_pos) & full)
+        vert_neg = diag_zero & horiz_pos
+        prev_match = match
+    return score
+
+# Threshold-Bounded Edit Distance
+# -------------------------------------------------
+
+def edit_distance_within(s0: str, s1: str, k: int) -> Optional[int]:
+    '''
+    Returns edit_distance(s0, s1) if it is at most k, and None otherwise, doing
+    as little work as that question allows (Ukkonen's cut-off):
+        - Strings whose lengths differ by more than k are rejected outright
+        - Common prefixes and suffixes are trimmed, as they never cost anything
+        - Only the diagonal band of cells within k of the main diagonal is filled,
+          since cells farther out hold more than k
+        - The fill stops as soon as two consecutive rows hold nothing within k,
+          since no later row can then get back down to k (a transposition only
+          reaches back two rows, at a cost of 1)
+    
+    Parameters:
+        s0, s1 (str):
+            The strings to compute the edit distance between
+        k (int):
+            The largest distance of interest
+    
+    Returns:
+        Optional[int]:
+            The edit distance, or None if it exceeds k
+    '''
+    if k < 0 or abs(len(s0) - len(s1)) > k:
+        return None
+    start, end0, end1 = 0, len(s0), len(s1)
+    while start < end0 and start < end1 and s0[start] == s1[start]:
+        start += 1
+    while end0 > start and end1 > start and s0[end0 - 1] == s1[end1 - 1]:
+        end0 -= 1
+        end1 -= 1
+    s0, s1 = s0[start:end0], s1[start:end1]
+    if len(s0) > len(s1):
+        s0, s1 = s1, s0
+    if len(s0) == 0:
+        return len(s1)
+    
+    # Cells outside the band, or holding more than k, are all capped at k + 1
+    over = k + 1
+    n_cols = len(s1)
+    prev2: list[int] = []
+    prev1 = [min(col, over) for col in range(n_cols + 1)]
+    prev_min = 0
+    last_char = ""
+    for row in range(1, len(s0) + 1):
+        current = [over] * (n_cols + 1)
+        first_col, last_col = max(1, row - k), min(n_cols, row + k)
+        if first_col == 1:
+            current[0] = min(row, over)
+        char = s0[row - 1]
+        row_min = left = current[first_col - 1]
+        for col in range(first_col, last_col + 1):
+            col_char = s1[col - 1]
+            best = prev1[col - 1] if char == col_char else prev1[col - 1] + 1
+            if prev1[col] < best:
+                best = prev1[col] + 1
+            if left < best:
+                best = left + 1
+            if col_char == last_char and col >= 2 and char == s1[col - 2] and prev2[col - 2] < best:
+                best = prev2[col - 2] + 1
+            if best > over:
+                best = over
+            current[col] = left = best
+            if best < row_min:
+                row_min = best
+        if row_min > k and prev_min > k:
+            return None
+        prev2, prev1, prev_min, last_char = prev1, current, row_min, char
+    return prev1[n_cols] if prev1[n_cols] <= k else None
+
+# Batched Edit Distance
+# -------------------------------------------------
+
+# Stand-in for an unreachable table cell; small enough that INF + 1 fits in int16
+_BATCH_INF: int = 10000
+
+# Most pairs edit_distance_pairs sweeps at once; larger sweeps' diagonals fall
+# out of cache and run slower per pair
+PAIR_BATCH_CHUNK: int = 4096
+
+def pack_words(words: Sequence[str], width: int) -> np.ndarray:
+    '''
+    Packs the given words into a 2D matrix of int32 character codes, one word
+    per row, with each row right-padded by 0s to the given width.
+    
+    Parameters:
+        words (Sequence[str]):
+            The words to pack, none longer than width
+        width (int):
+            The number of columns in the packed matrix
+    
+    Returns:
+        np.ndarray:
+            The (len(words), width) matrix of character codes
+    '''
+    if width == 0:
+        return np.zeros((len(words), 0), dtype=np.int32)
+    return np.array(words, dtype="<U" + str(width)).view(np.uint32).reshape(len(words), width).astype(np.int32)
+
+def edit_distances(guess: str, candidates: Sequence[str]) -> np.ndarray:
+    '''
+    Returns the edit distance between the guess and every one of the candidates,
+    i.e., the same values as [edit_distance(guess, c) for c in candidates], but
+    computed for all candidates at once: the candidates are grouped by length,
+    packed into padded integer matrices, and the OSA recurrence is swept one
+    anti-diagonal of the memoization table at a time, with every cell of a
+    diagonal (for every candidate in the group) computed by a few NumPy operations.
+    
+    Parameters:
+        guess (str):
+            The fixed string along the rows of each memoization table
+        candidates (Sequence[str]):
+            The strings along the columns, one table per candidate
+    
+    Returns:
+        np.ndarray:
+            int array of distances, aligned with the order of candidates
+    '''
+    result = np.zeros(len(candidates), dtype=np.int32)
+    if len(candidates) == 0:
+        return result
+    
+    by_length: dict[int, list[int]] = {}
+    for index, word in enumerate(candidates):
+        by_length.setdefault(len(word), []).append(index)
+    
+    # Guess codes are 1-indexed by row with a sentinel in front that never matches
+    guess_codes = np.array([-1] + [ord(char) for char in guess], dtype=np.int32)
+    for length, indices in by_length.items():
+        words = [candidates[index] for index in indices]
+        # Likewise, candidate codes are 1-indexed by column behind a sentinel column
+        word_codes = np.zeros((len(words), length + 1), dtype=np.int32)
+        word_codes[:, 1:] = pack_words(words, length)
+        result[indices] = _sweep_anti_diagonals(guess_codes[np.newaxis, :], word_codes)
+    return result
+
+def edit_distance_pairs(guesses: Sequence[str], words: Sequence[str]) -> np.ndarray:
+    '''
+    Returns the edit distance of every (guesses[i], words[i]) pair, i.e., the same
+    values as [edit_distance(g, w) for g, w in zip(guesses, words)], computed like
+    edit_distances but with a different guess for every word: pairs are grouped by
+    the word's length only, with shorter guesses padded, since cell (r, c) of a
+    memoization table never depends on the rows below r, so each pair's distance
+    can be read off its own guess's row of the padded table.
+    
+    Parameters:
+        guesses (Sequence[str]):
+            The strings along the rows of each memoization table
+        words (Sequence[str]):
+            The strings along the columns, as many as there are guesses
+    
+    Returns:
+        np.ndarray:
+            int array of distances, aligned with the order of the pairs
+    '''
+    if len(guesses) != len(words):
+        raise ValueError("[X] Every guess must be paired with a word, but got " + str(len(guesses)) + " guesses and " + str(len(words)) + " words")
+    result = np.zeros(len(words), dtype=np.int32)
+    
+    by_length: dict[int, list[int]] = {}
+    for index, word in enumerate(words):
+        by_length.setdefault(len(word), []).append(index)
+    
+    for length, group in by_length.items():
+        for start in range(0, len(group), PAIR_BATCH_CHUNK):
+            indices = group[start:start + PAIR_BATCH_CHUNK]
+            result[indices] = _sweep_pairs([guesses[index] for index in indices], [words[index] for index in indices], length)
+    return result
+
+def _sweep_pairs(guesses: list[str], words: list[str], length: int) -> np.ndarray:
+    '''
+    Packs pairs of guesses and equal-length words for _sweep_anti_diagonals, with
+    the guesses padded to the longest, and returns their edit distances.
+    
+    Parameters:
+        guesses (list[str]):
+            The strings along the rows of each memoization table
+        words (list[str]):
+            The strings along the columns, all of the given length
+        length (int):
+            The length of every word
+    
+    Returns:
+        np.ndarray:
+            int array of distances, aligned with the order of the pairs
+    '''
+    width = max(len(guess) for guess in guesses)
+    guess_codes = np.full((len(guesses), width + 1), -1, dtype=np.int32)
+    guess_codes[:, 1:] = pack_words(guesses, width)
+    word_codes = np.zeros((len(words), length + 1), dtype=np.int32)
+    word_codes[:, 1:] = pack_words(words, length)
+    guess_lengths = np.array([len(guess) for guess in guesses], dtype=np.int64)
+    return _sweep_anti_diagonals(guess_codes, word_codes, guess_lengths)
+
+def feedback_matches(guesses: Sequence[str], words: Sequence[str], distances: Sequence[int],
+                     transforms: Sequence[str]) -> np.ndarray:
+    '''
+    Returns, for every pair i, matches_feedback(guesses[i], words[i], distances[i],
+    transforms[i]) with the transforms encoded by encode_transforms, but computed
+    for all pairs at once: pairs are grouped by the word's length as in
+    edit_distance_pairs, every group's memoization tables are filled one row at a
+    time for all pairs together, and the top-down backtraces are then walked in
+    lockstep, one step of every pair's walk per few NumPy operations.
+    
+    Parameters:
+        guesses (Sequence[str]):
+            The guessed words
+        words (Sequence[str]):
+            The candidate secret words, as many as there are guesses
+        distances (Sequence[int]):
+            The edit distance in each pair's feedback
+        transforms (Sequence[str]):
+            The encoded top-down transforms in each pair's feedback
+    
+    Returns:
+        np.ndarray:
+            bool array of whether each pair produces exactly its feedback
+    '''
+    if not len(guesses) == len(words) == len(distances) == len(transforms):
+        raise ValueError("[X] Every guess must be paired with a word and its feedback")
+    result = np.zeros(len(words), dtype=bool)
+    
+    by_length: dict[int, list[int]] = {}
+    for index, word in enumerate(words):
+        by_length.setdefault(len(word), []).append(index)
+    
+    for length, group in by_length.items():
+        for start in range(0, len(group), PAIR_BATCH_CHUNK):
+            indices = group[start:start + PAIR_BATCH_CHUNK]
+            result[indices] = _match_pairs([guesses[index] for index in indices], [words[index] for index in indices], length,
+                                           np.array([distances[index] for index in indices], dtype=np.int32),
+                                           [transforms[index] for index in indices])
+    return result
+
+def _match_pairs(guesses: list[str], words: list[str], length: int, distances: np.ndarray, transforms: list[str]) -> np.ndarray:
+    '''
+    Checks pairs of guesses and equal-length words against their feedback for
+    feedback_matches. Each step of the walks picks the neighbor _walk would, ties
+    broken in the order R, T, I, D, and a walk stops as soon as a recorded
+    manipulation deviates from its feedback's.
+    
+    Parameters:
+        guesses (list[str]):
+            The guessed words, along the rows of each memoization table
+        words (list[str]):
+            The candidate secret words, all of the given length
+        length (int):
+            The length of every word
+        distances (np.ndarray):
+            The edit distance in each pair's feedback
+        transforms (list[str]):
+            The encoded top-down transforms in each pair's feedback
+    
+    Returns:
+        np.ndarray:
+            bool array of whether each pair produces exactly its feedback
+    '''
+    n_pairs, width = len(guesses), max(len(guess) for guess in guesses)
+    guess_codes = np.full((n_pairs, width + 1), -1, dtype=np.int32)
+    guess_codes[:, 1:] = pack_words(guesses, width)
+    word_codes = np.zeros((n_pairs, length + 1), dtype=np.int32)
+    word_codes[:, 1:] = pack_words(words, length)
+    
+    # Tables of every pair, rows past a guess's length being unused padding; each
+    # row's chain of insertions is a running minimum, as in _next_osa_row
+    cols = np.arange(length + 1, dtype=np.int32)
+    tables = np.empty((n_pairs, width + 1, length + 1), dtype=np.int32)
+    tables[:, 0, :] = cols
+    for fill_row in range(1, width + 1):
+        best = np.empty((n_pairs, length + 1), dtype=np.int32)
+        best[:, 0] = fill_row
+        mismatch = word_codes[:, 1:] != guess_codes[:, fill_row:fill_row + 1]
+        best[:, 1:] = np.minimum(tables[:, fill_row - 1, :-1] + mismatch, tables[:, fill_row - 1, 1:] + 1)
+        if fill_row >= 2 and length >= 2:
+            transposable = (word_codes[:, 1:-1] == guess_codes[:, fill_row:fill_row + 1]) & (word_codes[:, 2:] == guess_codes[:, fill_row - 1:fill_row])
+            best[:, 2:] = np.where(transposable, np.minimum(best[:, 2:], tables[:, fill_row - 2, :-2] + 1), best[:, 2:])
+        tables[:, fill_row, :] = np.minimum.accumulate(best - cols, axis=1) + cols
+    
+    # Feedback transforms as codes, padded with a 0 that never matches a step
+    t_width = max(len(encoded) for encoded in transforms)
+    targets = np.zeros((n_pairs, t_width + 1), dtype=np.int32)
+    targets[:, :t_width] = pack_words(transforms, t_width)
+    target_lengths = np.array([len(encoded) for encoded in transforms], dtype=np.int64)
+    
+    rows = np.array([len(guess) for guess in guesses], dtype=np.int64)
+    cols_at = np.full(n_pairs, length, dtype=np.int64)
+    steps = np.zeros(n_pairs, dtype=np.int64)
+    matched = np.zeros(n_pairs, dtype=bool)
+    alive = np.flatnonzero(tables[np.arange(n_pairs), rows, cols_at] == distances)
+    unreachable = width + length + 1
+    step_codes = np.array([ord("R"), ord("T"), ord("I"), ord("D")], dtype=np.int32)
+    row_moves, col_moves = np.array([1, 2, 0, 1]), np.array([1, 2, 1, 0])
+    
+    while len(alive) > 0:
+        row, col = rows[alive], cols_at[alive]
+        current = tables[alive, row, col]
+        done = current == 0
+        matched[alive[done]] = steps[alive[done]] == target_lengths[alive[done]]
+        alive, row, col, current = alive[~done], row[~done], col[~done], current[~done]
+        
+        up, left = np.maximum(row - 1, 0), np.maximum(col - 1, 0)
+        insertion = np.where(col > 0, tables[alive, row, left], unreachable)
+        deletion = np.where(row > 0, tables[alive, up, col], unreachable)
+        replacement = np.where((row > 0) & (col > 0), tables[alive, up, left], unreachable)
+        transposable = ((row >= 2) & (col >= 2) & (guess_codes[alive, row] == word_codes[alive, left])
+                        & (guess_codes[alive, up] == word_codes[alive, col]))
+        transposition = np.where(transposable, tables[alive, np.maximum(row - 2, 0), np.maximum(col - 2, 0)], unreachable)
+        
+        is_r = (replacement <= transposition) & (replacement <= insertion) & (replacement <= deletion)
+        is_t = ~is_r & (transposition <= insertion) & (transposition <= deletion)
+        is_i = ~is_r & ~is_t & (insertion <= deletion)
+        choice = np.select([is_r, is_t, is_i], [0, 1, 2], 3)
+        previous = np.choose(choice, [replacement, transposition, insertion, deletion])
+        
+        changed = previous != current
+        deviates = changed & (targets[alive, steps[alive]] != step_codes[choice])
+        steps[alive] += changed
+        rows[alive] -= row_moves[choice]
+        cols_at[alive] -= col_moves[choice]
+        alive = alive[~deviates]
+    return matched
+
+def _sweep_anti_diagonals(guess_codes: np.ndarray, word_codes: np.ndarray, guess_lengths: Optional[np.ndarray] = None) -> np.ndarray:
+    '''
+    Computes the OSA edit distance between guesses and a group of equal-length
+    words by filling their memoization tables one anti-diagonal (cells with the
+    same row + col) at a time. Each diagonal is stored as an (n_words, rows + 1)
+    array indexed by row; cell (r, c) depends only on diagonals d-1 (insertion,
+    deletion), d-2 (replacement) and d-4 (transposition), so only the last four
+    diagonals are ever kept.
+    
+    Parameters:
+        guess_codes (np.ndarray):
+            Sentinel-prefixed character codes of the guesses (the table's rows),
+            either one row shared by every word or one row per word
+        word_codes (np.ndarray):
+            Sentinel-prefixed character codes of the words (the table's columns)
+        guess_lengths (Optional[np.ndarray]):
+            The length of each word's guess, if shorter than the rows of
+            guess_codes; the last row of each table is read if None
+    
+    Returns:
+        np.ndarray:
+            Cell (guess length, word length) of each word's table
+    '''
+    n_words, n_cols = word_codes.shape[0], word_codes.shape[1] - 1
+    n_rows = guess_codes.shape[1] - 1
+    if guess_lengths is not None:
+        result = np.zeros(n_words, dtype=np.int32)
+        ends = guess_lengths + n_cols
+    history = [np.full((n_words, n_rows + 1), _BATCH_INF, dtype=np.int16) for _ in range(4)]
+    
+    for diag in range(n_rows + n_cols + 1):
+        current = np.full((n_words, n_rows + 1), _BATCH_INF, dtype=np.int16)
+        if diag <= n_cols:
+            current[:, 0] = diag
+        if diag <= n_rows:
+            current[:, diag] = diag
+        
+        first_row, last_row = max(1, diag - n_cols), min(n_rows, diag - 1)
+        if first_row <= last_row:
+            rows = np.arange(first_row, last_row + 1)
+            cols = diag - rows
+            prev1, prev2, prev4 = history[-1], history[-2], history[-4]
+            col_chars = word_codes[:, cols]
+            row_chars = guess_codes[:, rows]
+            mismatch = (col_chars != row_chars).astype(np.int16)
+            best = np.minimum(prev1[:, rows] + 1, prev1[:, rows - 1] + 1)
+            np.minimum(best, prev2[:, rows - 1] + mismatch, out=best)
+            transposable = (word_codes[:, cols - 1] == row_chars) & (col_chars == guess_codes[:, rows - 1])
+            np.minimum(best, np.where(transposable, prev4[:, rows - 2] + 1, _BATCH_INF), out=best)
+            current[:, first_row:last_row + 1] = best
+        
+        history = history[1:] + [current]
+        if guess_lengths is not None:
+            done = np.flatnonzero(ends == diag)
+            result[done] = current[done, guess_lengths[done]]
+    if guess_lengths is not None:
+        return result
+    return history[-1][:, n_rows].astype(np.int32)
+
 # ===================================================
 # >>> [SC] Summary
 # Excellent submission that has a ton to like and was